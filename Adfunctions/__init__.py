@@ -0,0 +1,62 @@
+'''
+Addfunction is a package that contains list of functions that are used in creating Advert list given
+particular conditions the list will continue to grow based on the requirements given for the Ads list
+
+The functions live in four submodules, imported only when one of their names is first used, so that
+'import Adfunctions' (and CLI or cron invocations that end up not needing pandas or openpyxl) stays fast:
+
+- Adfunctions.io: reading exports and writing CSV files (get_data, write_csv, save_df_to_csv, ...)
+- Adfunctions.filters: row filters (filter_usa_states, filter_by_target_industries, address_validity, ...)
+- Adfunctions.enrich: derived columns (enrich_phone_numbers, enrich_email, split_columns_by_separator, ...)
+- Adfunctions.export: list creators and writers (liveramp_adlist_creator, email_list_creator, merge_csv_files, ...)
+
+'from Adfunctions import *' and 'Adfunctions.<name>' keep working as with the former single module.
+
+'''
+#>>>>>>>>>>>>> Import required Packages >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+from importlib import import_module
+
+# Names provided by each submodule
+_SUBMODULE_NAMES = {
+    'io': (
+        'OUTPUT_DIRECTORY', 'CSV_COMPRESSION_EXTENSIONS', 'LIVERAMP_EMAIL_COLUMNS', 'LIVERAMP_PHONE_COLUMNS',
+        'OUTPUT_EMAIL_COLUMNS', 'OUTPUT_PHONE_COLUMNS', 'get_data', 'count_duplicates', 'list_files_in_folder',
+        'write_csv', 'save_df_to_csv', '_string_inference', '_as_strings', '_read_for_schemas',
+    ),
+    'filters': (
+        'filter_by_sic_codes', 'SIC_CODE_SEPARATOR', 'sic_target_industry_mask', 'sic_target_industry_filter',
+        'filter_by_seniority', 'filter_by_valid_business_email', 'sort_and_filter_jobs', 'filter_valid_personal_emails',
+        'US_STATE_ABBREVIATIONS', 'ZIP3_STATE_RANGES', 'ZIP3_STATE', 'ZIP_CODE_PATTERN', 'filter_usa_states',
+        'ADDRESS_FIELDS', 'PO_BOX_PATTERN', 'ADDRESS_RULE', 'address_validity', 'filter_and_label_valid_addresses',
+        'filter_by_valid_business_personal_email', 'filter_by_target_industries', 'drop_rows_with_hyphen',
+        '_sic_code_mask', '_label_valid_addresses', '_resolve_business_emails', '_industry_mask',
+    ),
+    'enrich': (
+        'enrich_phone_numbers', 'coalesce_phone_numbers', 'MISSING_PHONE_VALUES', 'enrich_email',
+        'split_columns_by_separator', 'LIVERAMP_PHONE_SOURCE_COLUMNS', 'LIVERAMP_EMAIL_SOURCE_COLUMNS',
+        'liveramp_enrichment_stages', 'Stage', 'run_stages',
+    ),
+    'export': (
+        'df_to_excel_openpyxl', 'merge_csv_files', 'liveramp_formatter', 'liveramp_adlist_creator',
+        'email_list_creator', 'build_lists_from_raw', '_list_base', '_list_frame_from_base',
+    ),
+}
+
+_SUBMODULE_OF = {name: submodule for submodule, names in _SUBMODULE_NAMES.items() for name in names}
+
+__all__ = [name for name in _SUBMODULE_OF if not name.startswith('_')]
+
+
+def __getattr__(name):
+    # Import the submodule providing 'name' on first use and cache the name on the package
+    submodule = _SUBMODULE_OF.get(name)
+    if submodule is None:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+    value = getattr(import_module(f".{submodule}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULE_OF))
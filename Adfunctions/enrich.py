@@ -0,0 +1,320 @@
+'''
+Adfunctions.enrich adds the derived columns of the lists: the preferred phone number, the resolved
+business email, split programmatic emails and the LiveRamp enrichment stages.
+
+'''
+#>>>>>>>>>>>>> Import required Packages >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+import numpy as np
+import pandas as pd
+
+from canonical import DEFAULT_COUNTRY_CODE, canonical_phones
+from csv_index import CsvRowIndex
+from metrics import instrument_stage
+from stage_scheduler import Stage, run_stages
+
+from .filters import ADDRESS_FIELDS, _label_valid_addresses, _resolve_business_emails, filter_by_target_industries, filter_usa_states
+from .io import _as_strings, get_data
+
+#>>>>>>>>>> - Create Function enrich_phone_numbers- >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+@instrument_stage()
+def enrich_phone_numbers(df):
+    """
+    Enriches phone numbers in a DataFrame by consolidating two phone number columns ('MOBILE_PHONE' and 'DIRECT_NUMBER').
+    It replaces '-' with NaN, then creates a new 'ENRICHED_PHONE_NUMBER' column filled with the most complete data 
+    available between the two columns, and drops rows where no valid phone number is available.
+
+    Parameters:
+    df (pd.DataFrame): The DataFrame with phone number columns.
+
+    Returns:
+    pd.DataFrame: A new DataFrame with an 'ENRICHED_PHONE_NUMBER' column, with rows containing NaNs in this column dropped.
+
+    Raises:
+    ValueError: If the required phone number columns are not present in the DataFrame.
+
+    Use Case:
+    Suppose you have a DataFrame 'df' with two columns 'MOBILE_PHONE' and 'DIRECT_NUMBER', each containing phone numbers.
+    Some entries may have missing or invalid numbers represented by '-'. To create a new column 'ENRICHED_PHONE_NUMBER' that
+    contains the most reliable phone number available (either mobile or direct), and to remove rows without any valid phone 
+    number, use the function as follows:
+    >>> df = pd.read_csv('your_file.csv')
+    >>> enriched_df = enrich_phone_numbers(df)
+    """
+    phone_columns = ["MOBILE_PHONE", "DIRECT_NUMBER"]
+
+    # Check if the required columns are present
+    if not set(phone_columns).issubset(df.columns):
+        raise ValueError(f"DataFrame must contain the columns {phone_columns}")
+
+    # Take the number from the column with the fewest missing values, falling back to the other one
+    enriched = coalesce_phone_numbers(df, phone_columns, output_columns=["ENRICHED_PHONE_NUMBER"],
+                                      rank_by_na_rate=True, dedupe=False)["ENRICHED_PHONE_NUMBER"]
+
+    # Keep the rows with a phone number only, copying just those, with '-' replaced by NaN in the phone columns
+    keep = enriched.notna().to_numpy()
+    kept = df[keep]
+    return kept.assign(**{column: kept[column].replace('-', np.nan) for column in phone_columns},
+                       ENRICHED_PHONE_NUMBER=enriched[keep])
+
+
+#>>>>>>>>>>>>>>>> Coalesce phone columns function> - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+# Phone values that count as missing, besides NaN
+MISSING_PHONE_VALUES = ['-', '']
+
+
+def _phone_dedupe_keys(series, country_code):
+    # int64 key per value: the canonical digits, or a negative hash of the raw text for values that are not
+    # phone numbers, so that those are only equal to the same raw text. Computed once per distinct value
+    codes, uniques = pd.factorize(series)
+    uniques = pd.Series(uniques, dtype=object)
+    unique_keys = pd.to_numeric(canonical_phones(uniques, country_code=country_code), errors="coerce")
+    unique_keys = unique_keys.fillna(0).to_numpy(dtype=np.int64)
+    raw = unique_keys == 0
+    if raw.any():
+        hashes = pd.util.hash_array(uniques[raw].astype(str).to_numpy(dtype=object), categorize=False)
+        unique_keys[raw] = -(hashes >> np.uint64(1)).astype(np.int64) - 1
+    return np.where(codes >= 0, unique_keys[codes], 0)
+
+
+def coalesce_phone_numbers(df, phone_columns, output_columns=("PhoneNumber1", "PhoneNumber2"), rank_by_na_rate=False,
+                           normalize=False, dedupe=True, skip_missing_columns=False, country_code=DEFAULT_COUNTRY_CODE):
+    """
+    Picks, for every row, the first phone numbers available across any number of phone columns: the first
+    output column gets the first present number, the second output column the next one, and so on.
+
+    The choice is made in one vectorized pass over rows x candidates matrices of presence flags and phone
+    keys, and each output column is then gathered from the candidate columns without converting them to
+    Python objects, so the cost grows linearly with rows and columns and the frame itself is never copied.
+
+    Parameters:
+    df (pd.DataFrame): The DataFrame with phone number columns.
+    phone_columns (list of str): Candidate columns, in order of preference (e.g. 'MOBILE_PHONE',
+                                 'DIRECT_NUMBER', 'PERSONAL_PHONE', 'COMPANY_PHONE').
+    output_columns (list of str): Names of the output columns, one per number kept per row.
+    rank_by_na_rate (bool): If True, the candidates are tried from the one with the fewest missing values
+                            to the one with the most (ties keep the given order) instead of in the given order.
+    normalize (bool): If True, the numbers are output as canonical digits (see canonical.canonical_phones)
+                      and values that are not phone numbers count as missing.
+    dedupe (bool): If True, a number equal (on canonical digits) to one already picked for the row is skipped.
+    skip_missing_columns (bool): If True, candidates the frame does not have are ignored, so that one list of
+                                 candidates serves exports of different vendors.
+    country_code (str): Country code of 10 digit national numbers, used by 'normalize' and 'dedupe'.
+
+    Returns:
+    pd.DataFrame: The output columns, aligned with 'df', NaN where a row has no further number.
+
+    Raises:
+    ValueError: If a candidate column is missing (and 'skip_missing_columns' is False) or none is present.
+
+    Use Case:
+    >>> phones = coalesce_phone_numbers(df, ['MOBILE_PHONE', 'DIRECT_NUMBER', 'PERSONAL_PHONE', 'COMPANY_PHONE'],
+    ...                                 output_columns=['PhoneNumber1', 'PhoneNumber2', 'PhoneNumber3'],
+    ...                                 normalize=True, skip_missing_columns=True)
+    >>> df = df.join(phones)
+    """
+    missing = [column for column in phone_columns if column not in df.columns]
+    if missing and not skip_missing_columns:
+        raise ValueError(f"DataFrame must contain the columns {missing}")
+    columns = [column for column in phone_columns if column in df.columns]
+    if not columns:
+        raise ValueError(f"DataFrame has none of the phone columns {list(phone_columns)}")
+
+    series_list, present, keys = [], [], []
+    for column in columns:
+        series = df[column]
+        if dedupe:
+            keys.append(_phone_dedupe_keys(series, country_code))
+        if normalize:
+            series = canonical_phones(series, country_code=country_code)
+        series_list.append(series)
+        present.append((series.notna() & ~series.isin(MISSING_PHONE_VALUES)).to_numpy(dtype=bool))
+
+    order = np.arange(len(columns))
+    if rank_by_na_rate:
+        order = np.argsort([-column_present.sum() for column_present in present], kind="stable")
+
+    # Rows x candidates matrices of flags and keys only, candidates in the order they are tried; the values
+    # themselves stay in their (Arrow) columns until they are gathered
+    series_list = [series_list[j] for j in order]
+    present = np.column_stack([present[j] for j in order])
+    usable = present.copy()
+    if dedupe:
+        keys = np.column_stack([keys[j] for j in order])
+        for j in range(1, len(columns)):
+            for i in range(j):
+                usable[:, j] &= ~(present[:, i] & (keys[:, i] == keys[:, j]))
+
+    # The k-th output column takes the candidate where the running count of usable numbers reaches k
+    rank = np.cumsum(usable, axis=1, dtype=np.int32)
+
+    outputs = {}
+    for slot, output_column in enumerate(output_columns, start=1):
+        hit = usable & (rank == slot)
+        chosen = series_list[0].where(hit[:, 0])
+        for j in range(1, len(columns)):
+            chosen = chosen.mask(hit[:, j], series_list[j])
+        outputs[output_column] = chosen
+
+    return pd.DataFrame(outputs, index=df.index)
+
+#>>>>>>>>>>>>>>>> Enrich email function> - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+@instrument_stage()
+def enrich_email(df, validation_column="BUSINESS_EMAIL_VALIDATION_STATUS", 
+                                            business_email_column="BUSINESS_EMAIL", 
+                                            personal_email_column="PERSONAL_EMAIL",
+                                            programmatic_email_column="PROGRAMMATIC_BUSINESS_EMAILS"):
+    """
+    Modifies a DataFrame to create a new column 'Valid_Business_Email'. This column contains
+    the business email if it's validated as 'Valid' in the specified validation column. Otherwise,
+    it uses the personal email. If neither business nor personal email is available, it selects 
+    the first email from the 'PROGRAMMATIC_BUSINESS_EMAILS' column.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to modify.
+        validation_column (str): The name of the column containing email validation status.
+        business_email_column (str): The name of the column containing business email addresses.
+        personal_email_column (str): The name of the column containing personal email addresses.
+        programmatic_email_column (str): The name of the column containing a list of programmatic emails.
+
+    Returns:
+        pd.DataFrame: A modified DataFrame with an additional column 'Valid_Business_Email'.
+    """
+
+    df_processed = df.copy()
+
+    business_emails = df_processed[business_email_column]
+    personal_emails = _as_strings(df_processed[personal_email_column])
+    programmatic_emails = _as_strings(df_processed[programmatic_email_column])
+
+    def present(values):
+        return (values.notna() & values.ne('') & values.ne('-')).to_numpy(dtype=bool, na_value=False)
+
+    use_business = (
+        _as_strings(df_processed[validation_column]).str.lower().eq("valid").to_numpy(dtype=bool, na_value=False)
+        & business_emails.ne('-').to_numpy(dtype=bool, na_value=True)
+    )
+
+    # Business email when validated, otherwise the first personal email, otherwise the first programmatic
+    # email (both are comma-separated), computed column-wise from the last choice to the first
+    valid_emails = programmatic_emails.str.split(',', n=1).str[0].where(present(programmatic_emails))
+    valid_emails = personal_emails.str.split(',', n=1).str[0].where(present(personal_emails), valid_emails)
+    valid_emails = business_emails.where(use_business, valid_emails)
+
+    df_processed['Valid_Business_Email'] = valid_emails.array
+
+    return df_processed
+
+#>>>>>>>>>> - Slit columns by separator function -  >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+
+@instrument_stage()
+def split_columns_by_separator(df, columns, separator=",", keep_non_missing_only=True, drop_duplicates=True):
+    """
+    Splits the values in specified columns of a DataFrame separated by a given separator into distinct columns.
+    String columns (Arrow backed or object) are split as they are, other columns are first converted to strings. Optionally keeps only those split columns that do not have any missing values and drops duplicated columns.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to modify.
+        columns (list of str or str): The names of the columns to split. Can be a single column name or a list of names.
+        separator (str): The separator used to split the column values.
+        keep_non_missing_only (bool): If True, only keeps split columns without missing values.
+        drop_duplicates (bool): If True, drops duplicated columns after the split.
+
+    Returns:
+        pd.DataFrame: A DataFrame with the original columns and the new split columns, optionally filtered for non-missing values and without duplicates.
+
+    Use Case Example:
+        # Create a sample DataFrame
+        data = {'Name': ['Alice', 'Bob', 'Charlie'],
+                'Interests': ['Reading,Writing', 'Painting', 'Hiking,Cycling,Swimming']}
+        sample_df = pd.DataFrame(data)
+
+        # Split the 'Interests' column
+        updated_df = split_columns_by_separator(sample_df, 'Interests', separator=',')
+
+        The resulting 'updated_df' will have the original 'Name' and 'Interests' columns,
+        as well as additional columns 'Interests_1', 'Interests_2', etc., each containing a split value from the 'Interests' column.
+    """
+    if isinstance(columns, str):
+        columns = [columns]
+
+    for column in columns:
+        if column not in df.columns:
+            raise ValueError(f"Column '{column}' not found in DataFrame")
+
+        # Split the column, keeping its string dtype
+        split_columns = _as_strings(df[column]).str.split(separator, expand=True)
+
+        # Create new column names based on the number of splits
+        new_columns = [f"{column}_{i+1}" for i in range(split_columns.shape[1])]
+        split_columns.columns = new_columns
+
+        # Optionally filter out columns with missing values
+        if keep_non_missing_only:
+            split_columns = split_columns.dropna(axis=1)
+
+        # Optionally drop duplicated columns, comparing columns directly instead of transposing to objects
+        if drop_duplicates:
+            unique_columns = []
+            for new_column in split_columns.columns:
+                if not any(split_columns[new_column].equals(split_columns[kept]) for kept in unique_columns):
+                    unique_columns.append(new_column)
+            split_columns = split_columns[unique_columns]
+
+        # Concatenate with the original DataFrame
+        df = pd.concat([df, split_columns], axis=1)
+
+    return df
+
+#>>>>>>>>>>>>> liveramp enrichment stages >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+
+LIVERAMP_PHONE_SOURCE_COLUMNS = ["MOBILE_PHONE", "DIRECT_NUMBER"]
+LIVERAMP_EMAIL_SOURCE_COLUMNS = ["BUSINESS_EMAIL_VALIDATION_STATUS", "BUSINESS_EMAIL", "PERSONAL_EMAIL"]
+
+
+def liveramp_enrichment_stages(address_cache=None):
+    """
+    Returns the address validation, phone availability and email resolution stages of a LiveRamp list.
+    Each stage only reads its own columns, so the stage scheduler can run them concurrently.
+
+    The phone stage only keeps rows with a phone number: which of the two phone columns is preferred
+    depends on the final rows, so enrich_phone_numbers still runs on the joined result.
+
+    Args:
+        address_cache (AddressValidationCache, optional): Persistent cache of address validation results.
+
+    Returns:
+        list of Stage: The stages, to be run with run_stages.
+    """
+    def addresses(df):
+        return _label_valid_addresses(df, address_cache)
+
+    def phones(df):
+        return {'HAS_PHONE_NUMBER': df[LIVERAMP_PHONE_SOURCE_COLUMNS].replace('-', np.nan).notna().any(axis=1).to_numpy()}
+
+    def emails(df):
+        return {'Valid_Business_Email': _resolve_business_emails(*(df[column] for column in LIVERAMP_EMAIL_SOURCE_COLUMNS))}
+
+    return [
+        Stage('addresses', addresses, inputs=ADDRESS_FIELDS, outputs=['VALID_ADDRESS', 'ADDRESS_USED', 'HAS_VALID_ADDRESS'], keep='HAS_VALID_ADDRESS'),
+        Stage('phones', phones, inputs=LIVERAMP_PHONE_SOURCE_COLUMNS, outputs=['HAS_PHONE_NUMBER'], keep='HAS_PHONE_NUMBER'),
+        Stage('emails', emails, inputs=LIVERAMP_EMAIL_SOURCE_COLUMNS, outputs=['Valid_Business_Email']),
+    ]
+
+def _enrich_for_liveramp(df, target_industries, address_cache=None, parallel=False):
+    # Row-wise stages of a LiveRamp list: industries, USA states, then addresses, phones and emails
+    df_industries = filter_by_target_industries(df, target_industries)
+    state_df = filter_usa_states(df_industries)
+    return run_stages(state_df, liveramp_enrichment_stages(address_cache), parallel=parallel)
+
+
+def _enriched_chunks(file_path, target_industries, chunk_rows, address_cache=None, parallel=False, checkpoints=None,
+                     usecols=None):
+    # Run the row-wise stages chunk by chunk, skipping the chunks committed by an interrupted run.
+    # Chunks are read as text, so every chunk has the same column types whatever values it holds.
+    index = CsvRowIndex.load_or_build(file_path)
+    parts = []
+    for number, byte_range in enumerate(index.row_chunks(chunk_rows)):
+        compute = lambda: _enrich_for_liveramp(get_data(file_path, byte_range=byte_range, dtype=str, usecols=usecols),
+                                               target_industries, address_cache, parallel)
+        parts.append(compute() if checkpoints is None else checkpoints.chunk(number, compute))
+    return pd.concat(parts, ignore_index=True)
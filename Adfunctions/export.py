@@ -0,0 +1,586 @@
+'''
+Adfunctions.export formats and saves the lists: the LiveRamp and email list creators, the single-parse
+multi-list builder, CSV merging and Excel workbooks.
+
+'''
+#>>>>>>>>>>>>> Import required Packages >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+import glob
+import os
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from canonical import DEFAULT_COUNTRY_CODE, hash_identifier_columns, identifier_keys
+from checkpoint import DEFAULT_CHECKPOINT_DIRECTORY, RunCheckpoints
+from fuzzy_dedup import DEFAULT_THRESHOLD, drop_fuzzy_duplicates
+from metrics import instrument_stage
+from schema import projection
+from stage_scheduler import run_stages
+
+from .enrich import (_enrich_for_liveramp, _enriched_chunks, _phone_dedupe_keys, enrich_email, enrich_phone_numbers,
+                     liveramp_enrichment_stages, split_columns_by_separator)
+from .filters import _industry_mask, drop_rows_with_hyphen, filter_by_target_industries, filter_usa_states
+from .io import (CSV_COMPRESSION_EXTENSIONS, LIVERAMP_EMAIL_COLUMNS, LIVERAMP_PHONE_COLUMNS, _read_for_schemas, save_df_to_csv,
+                 write_csv)
+
+#>>>>>>>>>>create - function df_to_excel_openpyxl - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+def df_to_excel_openpyxl(dfs, file_path, sheet_names=None):
+    """
+    Combines multiple pandas DataFrames into a single Excel file with different sheets. 
+    Each sheet name includes the name provided in 'sheet_names' and the number of rows in the DataFrame.
+
+    Parameters:
+    dfs (list of pd.DataFrame): List of DataFrames to write to Excel.
+    file_path (str): Path to save the Excel file.
+    sheet_names (list of str, optional): Names for the sheets. If not provided, defaults to 'Sheet_n' format.
+
+    Returns:
+    None
+
+    Raises:
+    ValueError: If the length of 'sheet_names' does not match the length of 'dfs'.
+    Exception: For other issues that may arise during the Excel file creation.
+
+    Use Case:
+    To combine multiple DataFrames into a single Excel workbook with each DataFrame in a different sheet, use:
+    >>> dfs = [df1, df2, df3]
+    >>> df_to_excel_openpyxl(dfs, 'combined.xlsx', ['Data1', 'Data2', 'Data3'])
+    """
+    if sheet_names and len(dfs) != len(sheet_names):
+        raise ValueError("Length of 'sheet_names' must match the number of DataFrames in 'dfs'")
+
+    # openpyxl is only needed here, so it is imported on first use
+    from openpyxl import Workbook
+
+    wb = Workbook()
+
+    # Remove the default sheet created by Workbook
+    if wb.active:
+        wb.remove(wb.active)
+
+    for i, df in enumerate(dfs):
+        if sheet_names:
+            sheet_title = f"{sheet_names[i]}_{len(df)}"
+        else:
+            sheet_title = f"Sheet_{i+1}_{len(df)}"
+
+        # Ensure sheet name is within Excel's limit
+        sheet_title = sheet_title[:31]
+
+        ws = wb.create_sheet(sheet_title)
+        ws.append(df.columns.tolist())
+        for row in df.values:
+            ws.append(row.tolist())
+
+    try:
+        wb.save(file_path)
+    except Exception as e:
+        raise Exception(f"An error occurred while saving the file: {e}")
+
+#>>>>>>>>>> - merge csv files -  >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+
+@instrument_stage()
+def merge_csv_files(folder_path, output_file, columns_to_check=None, canonical_keys=True, engine="pandas", compression=None,
+                    fuzzy=False, fuzzy_threshold=DEFAULT_THRESHOLD):
+    """
+    Merges all CSV files in a specified folder into a single CSV file, checks for and drops duplicates 
+    in specified columns, and then saves the merged file to an output folder.
+
+    Args:
+        folder_path (str): The path to the folder containing CSV files.
+        output_file (str): The file path for the output merged CSV file.
+        columns_to_check (list of str, optional): The columns to check for duplicates.
+        canonical_keys (bool): If True, email and phone columns are compared on their canonical keys,
+                               so '(555) 123-4567' and '5551234567' count as duplicates.
+        engine (str): CSV writer engine, 'pandas' or 'pyarrow'. See write_csv.
+        compression (str, optional): None, 'gzip' or 'zstd' for the merged file.
+        fuzzy (bool): If True, near-duplicate contacts (same person with slightly different names or
+                      addresses) are also dropped, see fuzzy_dedup.find_fuzzy_duplicates.
+        fuzzy_threshold (float): Minimum name and address similarity of near-duplicates.
+
+    Raises:
+        FileNotFoundError: If the specified folder does not exist.
+        ValueError: If no CSV files are found in the folder.
+
+    Use Case:
+    To merge all CSV files from the folder 'data/csv_files', drop duplicates based on 'Email' and 'UserID' columns,
+    and save the result to 'data/merged_output.csv', use:
+    >>> merge_csv_files('data/csv_files', 'data/merged_output.csv', ['Email', 'UserID'])
+    """
+    if not os.path.exists(folder_path):
+        raise FileNotFoundError(f"Folder '{folder_path}' not found.")
+
+    csv_files = sorted(
+        file for extension in CSV_COMPRESSION_EXTENSIONS.values()
+        for file in glob.glob(os.path.join(folder_path, f'*.csv{extension}'))
+    )
+
+    if not csv_files:
+        raise ValueError(f"No CSV files found in '{folder_path}'.")
+
+    duplicates_removed = False  # Flag to track if any duplicates were removed
+
+    try:
+        data_frames = [pd.read_csv(file) for file in csv_files]
+        merged_data = pd.concat(data_frames, ignore_index=True, sort=False)
+
+        if isinstance(columns_to_check, str):
+            columns_to_check = [columns_to_check]
+
+        if columns_to_check:
+            if canonical_keys:
+                duplicated = identifier_keys(merged_data, columns_to_check).duplicated()
+            else:
+                duplicated = merged_data.duplicated(subset=columns_to_check)
+
+            if duplicated.any():
+                merged_data = merged_data[~duplicated]
+                duplicates_removed = True
+
+        if fuzzy:
+            num_rows = len(merged_data)
+            merged_data = drop_fuzzy_duplicates(merged_data, threshold=fuzzy_threshold)
+            if len(merged_data) < num_rows:
+                print(f"Removed {num_rows - len(merged_data)} near-duplicate contacts.")
+                duplicates_removed = True
+
+        output_dir = os.path.dirname(output_file)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+
+        output_file = write_csv(merged_data, output_file, engine=engine, compression=compression)
+        duplicates_msg = " and duplicates removed" if duplicates_removed else " with no duplicates"
+        print(f"Merged data saved to '{output_file}'{duplicates_msg}.")
+    except Exception as e:
+        raise Exception(f"An error occurred during processing: {e}")
+
+# >>>>>>>>>>>>>>>> - LiveRamp formatter function - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+
+@instrument_stage()
+def liveramp_formatter(df, hashed=False):
+    """
+    Formats a given DataFrame using a specific column mapping, adds an autogenerated unique 4-digit 'Client Customer ID' to each row, 
+    and checks if 'PhoneNumber1' and 'PhoneNumber2' are the same number once canonicalized. If they are, 'PhoneNumber2' is filled with NaN.
+    
+    This function is useful for preparing data for processes that require standardized column names and unique identifiers.
+    
+    Args:
+        df (pd.DataFrame): The DataFrame to format.
+        hashed (bool): If True, 'Email1'-'Email3' and 'PhoneNumber1'-'PhoneNumber2' are normalized and
+                       replaced by their SHA-256 digests, as accepted by LiveRamp for hashed uploads.
+
+    Returns:
+        pd.DataFrame: A formatted DataFrame with columns renamed and selected as per the mapping, an added 'Client Customer ID' column,
+                      and 'PhoneNumber2' set to NaN if it's the same as 'PhoneNumber1'.
+
+    Raises:
+        KeyError: If any of the specified columns in the mapping do not exist in the original DataFrame.
+
+    Use Case Example:
+        # Suppose we have a DataFrame 'data_df' with columns like 'FIRST_NAME', 'LAST_NAME', 'VALID_ADDRESS', etc.
+        # and 'ENRICHED_PHONE_NUMBER', 'MOBILE_PHONE' for phone numbers.
+        # We can use this function to format 'data_df' for further processing.
+
+        # Example DataFrame
+        data = {
+            'FIRST_NAME': ['Alice', 'Bob'],
+            'LAST_NAME': ['Smith', 'Johnson'],
+            'ENRICHED_PHONE_NUMBER': ['1234567890', '0987654321'],
+            'MOBILE_PHONE': ['1234567890', '1234567890'],
+            # ... other columns ...
+        }
+        sample_df = pd.DataFrame(data)
+
+        # Format the DataFrame
+        formatted_df = liveramp_formatter(sample_df)
+
+        # The 'formatted_df' will now have a 'Client Customer ID', renamed columns as per the mapping,
+        # and 'PhoneNumber2' will be NaN where it's the same as 'PhoneNumber1'.
+    """
+    column_mapping = {
+        'First Name': 'FIRST_NAME',
+        'Last Name': 'LAST_NAME',
+        'Street Address 1': 'VALID_ADDRESS',
+        'Street Address 2': 'PROFESSIONAL_ADDRESS',
+        'City': 'PERSONAL_CITY',
+        'State': 'PERSONAL_STATE',
+        'Zip Code': 'PERSONAL_ZIP',
+        'Zip Code Plus 4': 'PERSONAL_ZIP4',
+        'Email1': 'Valid_Business_Email',
+        'Email2': 'PROGRAMMATIC_BUSINESS_EMAILS_1',
+        'Email3': 'PROGRAMMATIC_BUSINESS_EMAILS_2', 
+        'PhoneNumber1': 'ENRICHED_PHONE_NUMBER',
+        'PhoneNumber2': 'MOBILE_PHONE'
+    }
+
+    # Contacts may have fewer than two programmatic emails, the missing Email2/Email3 are left empty
+    for optional_col in ('PROGRAMMATIC_BUSINESS_EMAILS_1', 'PROGRAMMATIC_BUSINESS_EMAILS_2'):
+        if optional_col not in df.columns:
+            df[optional_col] = np.nan
+
+    # Check if all specified columns in the mapping exist in the original DataFrame
+    for original_col in column_mapping.values():
+        if original_col not in df.columns:
+            raise KeyError(f"Column '{original_col}' not found in DataFrame")
+
+    # Generate a unique 4-digit ID for each row
+    df['Client Customer ID'] = [random.randint(1000, 9999) for _ in range(len(df))]
+
+    # Select and rename columns based on the mapping
+    formatted_df = df[['Client Customer ID'] + list(column_mapping.values())].rename(columns={v: k for k, v in column_mapping.items()})
+
+    # Check if PhoneNumber1 and PhoneNumber2 are the same number (compared on canonical keys, so that
+    # '(555) 123-4567' and '5551234567' match, while values that are not phone numbers only match the same
+    # text), if so, set PhoneNumber2 to NaN. A missing value (key 0) matches nothing
+    phone_1 = _phone_dedupe_keys(formatted_df['PhoneNumber1'], DEFAULT_COUNTRY_CODE)
+    phone_2 = _phone_dedupe_keys(formatted_df['PhoneNumber2'], DEFAULT_COUNTRY_CODE)
+    same_phone = (phone_1 == phone_2) & (phone_1 != 0)
+    formatted_df['PhoneNumber2'] = np.where(same_phone, np.nan, formatted_df['PhoneNumber2'])
+    
+    # Check if 'Street Address 1 and Street Address 2 are the same, if so, set PhoneNumber2 to NaN
+    same_address = formatted_df['Street Address 1'].eq(formatted_df['Street Address 2']).to_numpy(dtype=bool, na_value=False)
+    formatted_df['Street Address 2'] = np.where(same_address, np.nan, formatted_df['Street Address 2'])
+
+    # Replace emails and phone numbers by their SHA-256 digests for hashed uploads
+    if hashed:
+        formatted_df = hash_identifier_columns(formatted_df, LIVERAMP_EMAIL_COLUMNS, LIVERAMP_PHONE_COLUMNS)
+
+    return formatted_df
+
+#>>>>>>>>>>>>> liveramp adlist creator function >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+
+@instrument_stage()
+def liveramp_adlist_creator(file_path: str, target_industries: list, adlist_name: str, suppression=None, hashed=False, data=None,
+                            address_cache=None, parallel=False, run_id=None, checkpoint_dir=None, chunk_rows=None,
+                            directory=None, engine="pandas", compression=None, **kwargs):
+    """
+    Processes an input data file to generate a formatted advertising list following specific criteria. 
+    The data is filtered by target industries and USA states, validated for addresses and phone numbers, 
+    and formatted in the Liveramp specified format.
+
+    Args:
+        file_path (str): Path to the input data file.
+        target_industries (list): List of target industries for filtering.
+        adlist_name (str): Name for the output advertising list file.
+        suppression (SuppressionList, optional): Suppression list used to drop opted-out emails and phone numbers.
+        hashed (bool): If True, the list is written with SHA-256 hashed emails and phone numbers.
+        data (pd.DataFrame, optional): Already parsed contents of 'file_path'. When given the file is not read again.
+        address_cache (AddressValidationCache, optional): Persistent cache of address validation results.
+        parallel (bool): If True, the address, phone and email stages run concurrently on threads. Off by default,
+                         the stages hold the GIL and threads do not make them faster (see stage_scheduler).
+        run_id (str, optional): If given, each stage result is checkpointed to Parquet under this run ID and
+                                a rerun with the same ID resumes after the last completed stage (see
+                                checkpoint.make_run_id). The checkpoints are deleted once the list is saved.
+        checkpoint_dir (str, optional): Scratch directory of the checkpoints. Defaults to '.adlist_checkpoints'.
+        chunk_rows (int, optional): If given, the file is read and filtered this many rows at a time (values
+                                    are kept as text, as written in the file). With a run_id, each chunk is
+                                    committed, so a rerun also resumes mid-file.
+        directory (str, optional): Output directory of the list. Defaults to OUTPUT_DIRECTORY.
+        engine (str): CSV writer engine, 'pandas' or 'pyarrow'. See write_csv.
+        compression (str, optional): None, 'gzip' or 'zstd' for the list file.
+        **kwargs: Additional arguments to pass to filtering and formatting functions.
+
+    Returns:
+        str: A message indicating the status of the file saving process.
+
+    Raises:
+        Exception: If any errors occur during the data processing steps.
+    
+    Use Case:
+    >>> primary_industries=['Advertising Services', 'Marketing','Book And Periodical Publishing', 'Entertainment Providers', 'Events Services','Broadcast Media Production And Distribution','Public Relations And Communications Services', 'Online Audio And Video Media', 'Printing Services','Newspaper Publishing', 'Newspapers']
+    >>> liveramp_adlist_creator(file_path="out_put file path", target_industries=primary_industries, output_file_name='name of list created')
+    """
+
+    checkpoints = RunCheckpoints(run_id, checkpoint_dir or DEFAULT_CHECKPOINT_DIRECTORY) if run_id else None
+
+    def checkpointed(stage_name, compute):
+        return compute() if checkpoints is None else checkpoints.stage(stage_name, compute)
+
+    def enriched():
+        # Read in chunks when asked, each chunk filtered and enriched on its own. Either way the header is
+        # checked first and only the columns of the LiveRamp schema are parsed
+        if chunk_rows and data is None:
+            return _enriched_chunks(file_path, target_industries, chunk_rows, address_cache, parallel, checkpoints,
+                                    usecols=projection(file_path, 'liveramp'))
+
+        # Load data from the file, unless it was already parsed by the caller
+        df = _read_for_schemas(file_path, data, 'liveramp')
+        return _enrich_for_liveramp(df, target_industries, address_cache, parallel)
+
+    def valid_numbers():
+        # Get valid phone numbers
+        return enrich_phone_numbers(checkpointed('enriched', enriched))
+
+    def program_emails():
+        # Split programmatic business emails into separate columns
+        return split_columns_by_separator(
+            checkpointed('valid_numbers', valid_numbers), 
+            'PROGRAMMATIC_BUSINESS_EMAILS', 
+            separator=',', 
+            keep_non_missing_only=True, 
+            drop_duplicates=True
+        )
+
+    try:
+        # Each stage resumes from its checkpoint when the run was interrupted after it
+        df_program_emails = checkpointed('program_emails', program_emails)
+    
+        # Format data in Liveramp format
+        formatted_df = liveramp_formatter(df_program_emails)
+
+        # Drop suppressed (opted-out) contacts
+        if suppression is not None:
+            formatted_df = suppression.filter_frame(
+                formatted_df,
+                email_columns=LIVERAMP_EMAIL_COLUMNS,
+                phone_columns=LIVERAMP_PHONE_COLUMNS
+            )
+    
+        # Save to file, hashing the identifiers after suppression has seen the plaintext
+        output_message = save_df_to_csv(formatted_df, adlist_name, hashed=hashed, directory=directory,
+                                        engine=engine, compression=compression)
+
+        # Keep the checkpoints of a list that could not be written, so a rerun only writes it again
+        if checkpoints is not None and output_message is None:
+            checkpoints.clear()
+
+        return output_message
+
+    except Exception as e:
+        # Handle any exceptions that occur during the process
+        if checkpoints is not None:
+            return (f"An error occurred: {str(e)} (rerun with run_id='{run_id}' to resume after stages "
+                    f"{checkpoints.completed_stages} and {len(checkpoints.committed_chunks)} input chunks)")
+        return f"An error occurred: {str(e)}"
+
+#>>>>>>>>> email list creator function- >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+
+@instrument_stage()
+def email_list_creator(file_path: str, target_industries: list, email_list_name: str, suppression=None, data=None,
+                       directory=None, engine="pandas", compression=None):
+    """
+    Creates an email list from a data file. The process includes loading data, filtering by target industries and USA states, 
+    enriching phone numbers, removing rows with missing email values, selecting specific columns, renaming them, 
+    and saving the processed data to a CSV file.
+
+    Args:
+        file_path (str): The path to the data file.
+        target_industries (list): List of industries to filter the data.
+        email_list_name (str): The name for the output CSV file.
+        suppression (SuppressionList, optional): Suppression list used to drop opted-out emails.
+        data (pd.DataFrame, optional): Already parsed contents of 'file_path'. When given the file is not read again.
+        directory (str, optional): Output directory of the list. Defaults to OUTPUT_DIRECTORY.
+        engine (str): CSV writer engine, 'pandas' or 'pyarrow'. See write_csv.
+        compression (str, optional): None, 'gzip' or 'zstd' for the list file.
+
+    Returns:
+        str: A message indicating the success or failure of the process.
+
+    Raises:
+        KeyError: If a required column is missing in the DataFrame.
+        Exception: For other errors that may occur.
+    
+    Use case:
+    >>> target_industries=["sales","media", "Printing"]
+    >>> file_path = "./data/df.csv"
+    >>> email_list_name = "email_list"
+    >>> email_list_creator(file_path, target_industries, email_list_name)
+    """
+    try:
+        # Load the columns of the email schema from the file, unless it was already parsed by the caller
+        df = _read_for_schemas(file_path, data, 'email')
+        
+        # Filter by target industries
+        df_industries = filter_by_target_industries(df, target_industries)
+
+        # Filter for USA states only
+        state_df = filter_usa_states(df_industries)
+        
+        # Enrich email with all email fields
+        valid_email = enrich_email(state_df.copy())
+          
+        # Get valid phone numbers
+        #valid_numbers = enrich_phone_numbers(valid_email.copy()) #====== not sure its included
+   
+        # Drop rows with missing email
+        clean_df = drop_rows_with_hyphen(valid_email, ["Valid_Business_Email"])
+        
+        # Select and rename specific columns
+        column_mapping = {
+            'First Name': 'FIRST_NAME',
+            'Last Name': 'LAST_NAME',
+            'Email': 'Valid_Business_Email',
+            #'Phone Number': 'ENRICHED_PHONE_NUMBER', #====== note sure if its included
+        }
+
+        # Check if all specified columns in the mapping exist in the original DataFrame
+        for original_col in column_mapping.values():
+            if original_col not in clean_df.columns:
+                raise KeyError(f"Column '{original_col}' not found in DataFrame")
+        
+        # Select and rename columns
+        final_df = clean_df[list(column_mapping.values())].rename(columns={v: k for k, v in column_mapping.items()})
+
+        # Drop suppressed (opted-out) emails
+        if suppression is not None:
+            final_df = suppression.filter_frame(final_df, email_columns=['Email'])
+
+        # Save to file
+        output_message = save_df_to_csv(final_df, email_list_name, directory=directory, engine=engine,
+                                        compression=compression)
+
+        return output_message
+
+    except Exception as e:
+        # Handle any exceptions that occur during the process
+        return f"An error occurred: {str(e)}"
+
+#>>>>>>>>> shared single-parse list fan-out function- >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+
+@instrument_stage()
+def build_lists_from_raw(file_path: str, list_specs: list, data=None, suppression=None, address_cache=None,
+                         directory=None, engine="pandas", compression=None):
+    """
+    Builds several lists from one raw export. The file is parsed once, the stages shared by all lists
+    (USA state filter, address validation, phone availability, email resolution) run once on the whole
+    file, and each list is then produced by applying only its industry mask and its formatter.
+
+    The rows and values of each list are the same as the ones produced by liveramp_adlist_creator or
+    email_list_creator for the same file and industries.
+
+    Args:
+        file_path (str): Path to the raw export.
+        list_specs (list of dict): One dict per list with the keys 'list_type' ('liveramp' or 'email'),
+                                   'target_industries', 'output' (the output file name) and optionally
+                                   'hashed' (LiveRamp lists only), 'directory', 'engine' and 'compression',
+                                   which override the arguments of the same name for that list.
+        data (pd.DataFrame, optional): Already parsed contents of 'file_path'. When given the file is not read again.
+        suppression (SuppressionList, optional): Suppression list applied to every list.
+        address_cache (AddressValidationCache, optional): Persistent cache of address validation results.
+        directory (str, optional): Output directory of the lists. Defaults to OUTPUT_DIRECTORY.
+        engine (str): CSV writer engine, 'pandas' or 'pyarrow'. See write_csv.
+        compression (str, optional): None, 'gzip' or 'zstd' for the list files.
+
+    Returns:
+        list of dict: One dict per list spec with 'output', 'message' and 'seconds' (time spent on that list only).
+
+    Raises:
+        ValueError: If a list spec has an unknown 'list_type'.
+
+    Use Case:
+    >>> specs = [
+    ...     {'list_type': 'liveramp', 'target_industries': ['Marketing'], 'output': 'marketing_liveramp_list'},
+    ...     {'list_type': 'liveramp', 'target_industries': ['Events Services'], 'output': 'events_liveramp_list'},
+    ...     {'list_type': 'email', 'target_industries': ['Marketing', 'Newspapers'], 'output': 'marketing_email_list'},
+    ... ]
+    >>> build_lists_from_raw('./raw_data/Adpromoter_FirstPriority.csv', specs)
+    """
+    for spec in list_specs:
+        if spec.get('list_type') not in ('liveramp', 'email'):
+            raise ValueError(f"Unknown list_type '{spec.get('list_type')}' for list '{spec.get('output')}'")
+
+    # Check the header, parse the columns of the requested list types once and run the stages every list needs
+    df = _read_for_schemas(file_path, data, *dict.fromkeys(spec['list_type'] for spec in list_specs))
+    state_df = filter_usa_states(df)
+
+    list_types = dict.fromkeys(spec['list_type'] for spec in list_specs)
+    bases = {list_type: _list_base(state_df, list_type, address_cache) for list_type in list_types}
+    industries = {
+        list_type: pd.factorize(base['PRIMARY_INDUSTRY'], use_na_sentinel=True)
+        for list_type, base in bases.items()
+    }
+
+    # Project each list from its shared base
+    results = []
+    for spec in list_specs:
+        start = time.perf_counter()
+        try:
+            base = bases[spec['list_type']]
+            codes, categories = industries[spec['list_type']]
+            list_df = base[_industry_mask(codes, pd.Index(categories), spec['target_industries'])]
+            output_options = {
+                'directory': spec.get('directory', directory),
+                'engine': spec.get('engine', engine),
+                'compression': spec.get('compression', compression),
+            }
+
+            if spec['list_type'] == 'liveramp':
+                message = _liveramp_list_from_base(list_df, spec['output'], suppression, spec.get('hashed', False), **output_options)
+            else:
+                message = _email_list_from_base(list_df, spec['output'], suppression, **output_options)
+        except Exception as e:
+            message = f"An error occurred: {str(e)}"
+
+        results.append({'output': spec['output'], 'message': message, 'seconds': time.perf_counter() - start})
+
+    return results
+
+
+def _list_base(state_df, list_type, address_cache=None):
+    # Rows of the USA state filtered export every list of 'list_type' is projected from
+    if list_type == 'liveramp':
+        # Rows with a valid address and at least one phone number, the per list enrichment chooses between them
+        return run_stages(state_df, liveramp_enrichment_stages(address_cache))
+    return drop_rows_with_hyphen(enrich_email(state_df.copy()), ["Valid_Business_Email"])
+
+
+def _list_frame_from_base(df, list_type, suppression=None):
+    # Formatted list of the base rows already filtered down to the list industries
+    if list_type == 'liveramp':
+        return _liveramp_frame_from_base(df, suppression)
+    return _email_frame_from_base(df, suppression)
+
+
+def _liveramp_list_from_base(df, adlist_name, suppression=None, hashed=False, directory=None, engine="pandas",
+                             compression=None):
+    return save_df_to_csv(_liveramp_frame_from_base(df, suppression), adlist_name, hashed=hashed, directory=directory,
+                          engine=engine, compression=compression)
+
+
+def _email_list_from_base(df, email_list_name, suppression=None, directory=None, engine="pandas", compression=None):
+    return save_df_to_csv(_email_frame_from_base(df, suppression), email_list_name, directory=directory,
+                          engine=engine, compression=compression)
+
+
+def _liveramp_frame_from_base(df, suppression=None):
+    # Per list tail of liveramp_adlist_creator, once rows are filtered down to the list industries
+    valid_numbers = enrich_phone_numbers(df)
+
+    df_program_emails = split_columns_by_separator(
+        valid_numbers,
+        'PROGRAMMATIC_BUSINESS_EMAILS',
+        separator=',',
+        keep_non_missing_only=True,
+        drop_duplicates=True
+    )
+
+    formatted_df = liveramp_formatter(df_program_emails)
+
+    if suppression is not None:
+        formatted_df = suppression.filter_frame(formatted_df, LIVERAMP_EMAIL_COLUMNS, LIVERAMP_PHONE_COLUMNS)
+
+    return formatted_df
+
+
+def _email_frame_from_base(df, suppression=None):
+    # Per list tail of email_list_creator, once rows are filtered down to the list industries
+    column_mapping = {
+        'First Name': 'FIRST_NAME',
+        'Last Name': 'LAST_NAME',
+        'Email': 'Valid_Business_Email',
+    }
+
+    for original_col in column_mapping.values():
+        if original_col not in df.columns:
+            raise KeyError(f"Column '{original_col}' not found in DataFrame")
+
+    final_df = df[list(column_mapping.values())].rename(columns={v: k for k, v in column_mapping.items()})
+
+    if suppression is not None:
+        final_df = suppression.filter_frame(final_df, email_columns=['Email'])
+
+    return final_df
+
+#>>>>>>>>>>>>>>>>>>>>>>>>>>>>> - ed-  >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
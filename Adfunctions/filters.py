@@ -0,0 +1,543 @@
+'''
+Adfunctions.filters holds the row filters of the lists: SIC codes and industries, seniority, job titles,
+email validation, USA states and street addresses.
+
+'''
+#>>>>>>>>>>>>> Import required Packages >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+import re
+
+import numpy as np
+import pandas as pd
+
+from metrics import instrument_stage
+
+from .io import _as_strings
+
+#>>>>>>>>>> Define Function filter by sic code >>>>>>>>>>>>>>
+@instrument_stage()
+def filter_by_sic_codes(df, target_sic_codes):
+    """
+    Filters a DataFrame to include only rows where at least one SIC code in the 'COMPANY_SIC' field
+    matches one of the target SIC codes. Assumes multiple SIC codes in 'COMPANY_SIC' are separated by a delimiter.
+
+    Parameters:
+    df (pd.DataFrame): The DataFrame to filter.
+    target_sic_codes (list): List of target SIC codes.
+
+    Returns:
+    pd.DataFrame: The filtered DataFrame.
+
+    Use Case:
+    To filter a DataFrame 'df' to include only rows where the 'COMPANY_SIC' field contains either '1234' or '5678', use:
+    >>> df = pd.DataFrame({'COMPANY_SIC': ['1234,2345', '5678,6789', '3456']})
+    >>> target_sic_codes = ['1234', '5678']
+    >>> filtered_df = filter_by_sic_codes(df, target_sic_codes)
+    This will return a DataFrame including only the first two rows where 'COMPANY_SIC' matches '1234' or '5678'.
+     DataFrame.
+    """
+    if 'COMPANY_SIC' not in df.columns:
+        raise ValueError("DataFrame must contain a 'COMPANY_SIC' column")
+
+    filtered_df = df[_sic_code_mask(df['COMPANY_SIC'], target_sic_codes)]
+
+    return filtered_df
+
+
+SIC_CODE_SEPARATOR = ';'
+
+
+def _sic_code_mask(sic_column, target_sic_codes, separator=SIC_CODE_SEPARATOR):
+    # Rows with at least one target code. Each distinct 'COMPANY_SIC' value is split once, its codes are
+    # exploded into a (distinct value, code) index and matched in one isin, missing values never match.
+    codes, uniques = pd.factorize(sic_column, use_na_sentinel=True)
+    if not len(uniques):
+        return np.zeros(len(sic_column), dtype=bool)
+
+    exploded = _as_strings(pd.Series(uniques)).str.split(separator).explode()
+    matches = exploded.str.strip().isin(list(target_sic_codes)).to_numpy(dtype=bool, na_value=False)
+    unique_match = np.bincount(exploded.index.to_numpy()[matches], minlength=len(uniques)) > 0
+
+    return np.append(unique_match, False)[codes]
+
+
+#>>>>>>>>>> - Define Function "sic_target_industry_filter" - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+def sic_target_industry_mask(df, target_sic_codes, target_industries, how="and"):
+    """
+    Computes in one pass which rows match the target SIC codes and/or the target industries, so that the
+    mask can be reused (e.g. combined with other filters or to segment the same frame several times).
+
+    Parameters:
+    df (pd.DataFrame): DataFrame with 'COMPANY_SIC' (codes separated by ';') and 'PRIMARY_INDUSTRY' columns.
+    target_sic_codes (list): Target SIC codes, e.g. ['7311', '8742'].
+    target_industries (list): Target values of 'PRIMARY_INDUSTRY'.
+    how (str): 'and' keeps rows matching both a target SIC code and a target industry,
+               'or' keeps rows matching either.
+
+    Returns:
+    np.ndarray: Boolean row mask, aligned with the rows of 'df'.
+
+    Raises:
+    ValueError: If a column is missing or 'how' is not 'and' or 'or'.
+    """
+    if how not in ("and", "or"):
+        raise ValueError(f"'how' must be 'and' or 'or', not '{how}'")
+    for column in ('COMPANY_SIC', 'PRIMARY_INDUSTRY'):
+        if column not in df.columns:
+            raise ValueError(f"DataFrame must contain a '{column}' column")
+
+    sic_match = _sic_code_mask(df['COMPANY_SIC'], target_sic_codes)
+
+    # Industries: factorized category codes looked up in a boolean array of the target categories
+    industry_codes, industry_categories = pd.factorize(df['PRIMARY_INDUSTRY'], use_na_sentinel=True)
+    industry_match = _industry_mask(industry_codes, pd.Index(industry_categories), target_industries)
+
+    return sic_match & industry_match if how == "and" else sic_match | industry_match
+
+
+@instrument_stage()
+def sic_target_industry_filter(df, target_sic_codes, target_industries, how="and"):
+    """
+    Filters a DataFrame on the target SIC codes and the target industries in one pass, instead of running
+    filter_by_sic_codes and filter_by_target_industries one after the other.
+
+    Parameters:
+    df (pd.DataFrame): DataFrame with 'COMPANY_SIC' and 'PRIMARY_INDUSTRY' columns.
+    target_sic_codes (list): Target SIC codes.
+    target_industries (list): Target industries.
+    how (str): 'and' (both must match, the default) or 'or' (either matches).
+
+    Returns:
+    pd.DataFrame: The rows selected by sic_target_industry_mask.
+
+    Use Case:
+    >>> sic_code = ["7311", "8721", "8748", "7319", "8742"]
+    >>> target_industries = ["Advertising", "Media", "Marketing", "Consulting"]
+    >>> df_filtered = sic_target_industry_filter(df, sic_code, target_industries)
+    >>> either_df = sic_target_industry_filter(df, sic_code, target_industries, how="or")
+    """
+    return df[sic_target_industry_mask(df, target_sic_codes, target_industries, how)]
+
+
+#>>>>>>>>>> - Define Function "filter_by_seniority" - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+@instrument_stage()
+def filter_by_seniority(df, exclude_levels=None):
+    """
+    Filters a dataframe to exclude rows with specified seniority levels in SENIORITY_LEVEL, and rows with non-standard characters in this column.
+
+    Parameters:
+    df (pd.DataFrame): DataFrame with a column named "SENIORITY_LEVEL".
+    exclude_levels (list, optional): List of seniority levels to exclude, e.g., ["Staff", "Manager"]. Defaults to None.
+
+    Returns:
+    pd.DataFrame: DataFrame with rows containing specified levels and non-standard characters removed.
+
+    Raises:
+    ValueError: If the DataFrame does not contain a 'SENIORITY_LEVEL' column.
+    """
+    if 'SENIORITY_LEVEL' not in df.columns:
+        raise ValueError("DataFrame must contain a 'SENIORITY_LEVEL' column")
+
+    exclude_levels = [level.lower() for level in (exclude_levels or [])]  # Normalize exclude_levels to lower case
+    seniority_regex = re.compile(r"[^\w\s]+")  # Matches non-alphanumeric characters except spaces and underscore
+
+    filtered_df = df[
+        df["SENIORITY_LEVEL"].notna() &
+        ~df["SENIORITY_LEVEL"].str.lower().isin(exclude_levels) &
+        ~df["SENIORITY_LEVEL"].str.contains(seniority_regex, na=False)
+    ]
+
+    return filtered_df 
+
+
+#>>>>>>>>>> - Define Function filter_by_valid_business_email - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+@instrument_stage()
+def filter_by_valid_business_email(df, column_name="BUSINESS_EMAIL_VALIDATION_STATUS"):
+    """
+    Filters a DataFrame for rows with "Valid" in the specified email validation status column.
+
+    Parameters:
+    df (pd.DataFrame): The DataFrame to filter.
+    column_name (str): The name of the column containing email validation status. 
+                       Defaults to "BUSINESS_EMAIL_VALIDATION_STATUS".
+
+    Returns:
+    pd.DataFrame: A new DataFrame containing only rows with validated emails.
+
+    Raises:
+    ValueError: If the specified column does not exist in the DataFrame.
+
+    Use Case:
+    To filter a DataFrame 'df' to include only rows where the business email validation status is 'Valid', use the function as follows:
+    >>> df = pd.read_csv('your_file.csv')
+    >>> valid_email_df = filter_by_valid_business_email(df)
+    
+    If the email validation status is in a different column, specify the column name:
+    >>> valid_email_df = filter_by_valid_business_email(df, 'CUSTOM_EMAIL_STATUS_COLUMN')
+    """
+    if column_name not in df.columns:
+        raise ValueError(f"Column '{column_name}' not found in DataFrame")
+
+    # Filter the DataFrame for rows where the specified column contains 'Valid' (case-insensitive)
+    filtered_df = df[df[column_name].str.contains("Valid", case=False, na=False)]
+
+    return filtered_df
+
+#>>>>>>>>>> - create function sort_and_filter_jobs - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+@instrument_stage()
+def sort_and_filter_jobs(df, keywords_to_exclude):
+    """
+    Sorts the data by 'JOB_TITLE' and filters out rows with specific keywords in 'JOB_TITLE'.
+
+    Parameters:
+    df (pd.DataFrame): The DataFrame containing the job data.
+    keywords_to_exclude (list): List of keywords to exclude from 'JOB_TITLE' (case-insensitive).
+
+    Returns:
+    pd.DataFrame: A new DataFrame sorted by 'JOB_TITLE' and filtered based on specified keywords.
+
+    Raises:
+    ValueError: If the 'JOB_TITLE' column is not present in the DataFrame.
+
+    Use Case:
+    To sort a DataFrame 'df' by 'JOB_TITLE' and exclude job titles containing keywords like 'intern' or 'engineer', use:
+    >>> df = pd.read_csv('jobs.csv')
+    >>> filtered_df = sort_and_filter_jobs(df, ['intern', 'engineer'])
+    """
+    if 'JOB_TITLE' not in df.columns:
+        raise ValueError("DataFrame must contain a 'JOB_TITLE' column")
+
+    # Sort the data by 'JOB_TITLE', keeping the file order of equal titles
+    sorted_df = df.sort_values(by="JOB_TITLE", kind="stable")
+
+    # Escape keywords for safety in regex
+    escaped_keywords = [re.escape(keyword) for keyword in keywords_to_exclude]
+
+    # Filter out rows with 'JOB_TITLE' containing the specified keywords
+    pattern = '|'.join(escaped_keywords)
+    filtered_df = sorted_df[~sorted_df["JOB_TITLE"].str.lower().str.contains(pattern, na=False)]
+
+    return filtered_df
+
+
+#>>>>>>>>>> - create function filter_valid_personal_emails - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+@instrument_stage()
+def filter_valid_personal_emails(df):
+    """
+    Filters a DataFrame to include only rows with valid email addresses in the 'PERSONAL_EMAIL' column.
+
+    This function checks for the presence of an '@' symbol as a basic criterion for email validation.
+
+    Parameters:
+    df (pd.DataFrame): The DataFrame containing the 'PERSONAL_EMAIL' column.
+
+    Returns:
+    pd.DataFrame: A new DataFrame with rows containing email addresses that have an '@' symbol.
+
+    Raises:
+    ValueError: If the 'PERSONAL_EMAIL' column is not present in the DataFrame.
+
+    Use Case:
+    To filter a DataFrame 'df' to include only rows with valid email addresses in 'PERSONAL_EMAIL', use:
+    >>> df = pd.read_csv('your_data.csv')
+    >>> valid_email_df = filter_valid_personal_emails(df)
+    """
+    if 'PERSONAL_EMAIL' not in df.columns:
+        raise ValueError("DataFrame must contain a 'PERSONAL_EMAIL' column")
+
+    # Basic check for '@' in 'PERSONAL_EMAIL'
+    valid_email_df = df[df['PERSONAL_EMAIL'].str.contains('@', na=False)]
+
+    return valid_email_df
+
+#>>>>>>>>>> - create function filter usa_states - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+US_STATE_ABBREVIATIONS = [
+    "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA",
+    "HI", "ID", "IL", "IN", "IA", "KS", "KY", "LA", "ME", "MD",
+    "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ",
+    "NM", "NY", "NC", "ND", "OH", "OK", "OR", "PA", "RI", "SC",
+    "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY"
+]
+
+# USPS 3-digit ZIP prefix ranges (first prefix, last prefix, state). Military prefixes are left out.
+ZIP3_STATE_RANGES = [
+    (5, 5, "NY"), (6, 7, "PR"), (8, 8, "VI"), (9, 9, "PR"), (10, 27, "MA"), (28, 29, "RI"),
+    (30, 38, "NH"), (39, 49, "ME"), (50, 54, "VT"), (55, 55, "MA"), (56, 59, "VT"), (60, 69, "CT"),
+    (70, 89, "NJ"), (100, 149, "NY"), (150, 196, "PA"), (197, 199, "DE"), (200, 200, "DC"),
+    (201, 201, "VA"), (202, 205, "DC"), (206, 219, "MD"), (220, 246, "VA"), (247, 268, "WV"),
+    (270, 289, "NC"), (290, 299, "SC"), (300, 319, "GA"), (320, 339, "FL"), (341, 349, "FL"),
+    (350, 369, "AL"), (370, 385, "TN"), (386, 397, "MS"), (398, 399, "GA"), (400, 427, "KY"),
+    (430, 459, "OH"), (460, 479, "IN"), (480, 499, "MI"), (500, 528, "IA"), (530, 549, "WI"),
+    (550, 567, "MN"), (569, 569, "DC"), (570, 577, "SD"), (580, 588, "ND"), (590, 599, "MT"),
+    (600, 629, "IL"), (630, 658, "MO"), (660, 679, "KS"), (680, 693, "NE"), (700, 714, "LA"),
+    (716, 729, "AR"), (730, 732, "OK"), (733, 733, "TX"), (734, 749, "OK"), (750, 799, "TX"),
+    (800, 816, "CO"), (820, 831, "WY"), (832, 838, "ID"), (840, 847, "UT"), (850, 865, "AZ"),
+    (870, 884, "NM"), (885, 885, "TX"), (889, 898, "NV"), (900, 961, "CA"), (967, 968, "HI"),
+    (969, 969, "GU"), (970, 979, "OR"), (980, 994, "WA"), (995, 999, "AK"),
+]
+
+# Static lookup array: ZIP3_STATE[prefix] is the state of a 3-digit ZIP prefix, or '' when unknown
+ZIP3_STATE = np.full(1000, "", dtype=object)
+for _first, _last, _state in ZIP3_STATE_RANGES:
+    ZIP3_STATE[_first:_last + 1] = _state
+
+ZIP_CODE_PATTERN = r"\d{5}(?:-\d{4})?"
+
+
+def _zip_strings(zip_codes):
+    # ZIP codes as strings; numeric columns (ZIPs read as numbers lose their leading zeros) are re-padded
+    if pd.api.types.is_numeric_dtype(zip_codes):
+        return zip_codes.astype("Int64").astype("string").str.zfill(5)
+    return zip_codes.astype("string")
+
+
+@instrument_stage()
+def filter_usa_states(df, infer_state=False):
+    """
+    Filters a DataFrame to include rows with valid US state abbreviations or valid ZIP codes when the state is '-'.
+
+    Parameters:
+    df (pd.DataFrame): The DataFrame to filter. Requires 'PERSONAL_STATE' and 'PERSONAL_ZIP' columns.
+    infer_state (bool): If True, the state of rows kept for their ZIP code is filled in from the 3-digit
+                        ZIP prefix, and rows whose ZIP belongs to a territory outside the 50 states are dropped.
+
+    Returns:
+    pd.DataFrame: The filtered DataFrame containing only rows with valid US states or ZIP codes.
+
+    Raises:
+    ValueError: If the required columns ('PERSONAL_STATE' and 'PERSONAL_ZIP') are not present in the DataFrame.
+
+    Use Case:
+    To filter a DataFrame 'df' for rows with valid US states or ZIP codes, use:
+    >>> df = pd.read_csv('your_file.csv')
+    >>> filtered_df = filter_usa_states(df)
+    To also fill in 'PERSONAL_STATE' from the ZIP code where it is '-', use:
+    >>> filtered_df = filter_usa_states(df, infer_state=True)
+    """
+    # Check for required columns and apply filtering logic
+    if 'PERSONAL_STATE' not in df.columns or 'PERSONAL_ZIP' not in df.columns:
+        raise ValueError("Required columns 'PERSONAL_STATE' and 'PERSONAL_ZIP' not found in DataFrame")
+
+    state_valid = df['PERSONAL_STATE'].isin(US_STATE_ABBREVIATIONS).to_numpy(dtype=bool)
+    missing_state = df['PERSONAL_STATE'].eq('-').to_numpy(dtype=bool, na_value=False)
+
+    # Check the ZIP code of the rows without a state only
+    zip_codes = _zip_strings(df.loc[missing_state, 'PERSONAL_ZIP'])
+    zip_valid = zip_codes.str.fullmatch(ZIP_CODE_PATTERN).to_numpy(dtype=bool, na_value=False)
+
+    if not infer_state:
+        state_or_zip_valid = state_valid.copy()
+        state_or_zip_valid[missing_state] = zip_valid
+        return df[state_or_zip_valid]
+
+    # Look the state up from the 3-digit ZIP prefix of the valid ZIP codes
+    inferred = np.full(len(zip_codes), "", dtype=object)
+    inferred[zip_valid] = ZIP3_STATE[zip_codes[zip_valid].str[:3].astype(int).to_numpy()]
+    zip_valid &= np.isin(inferred, US_STATE_ABBREVIATIONS)
+
+    state_or_zip_valid = state_valid.copy()
+    state_or_zip_valid[missing_state] = zip_valid
+
+    filtered_df = df[state_or_zip_valid].copy()
+    filled = missing_state[state_or_zip_valid]
+    filtered_df.iloc[np.flatnonzero(filled), filtered_df.columns.get_loc('PERSONAL_STATE')] = inferred[zip_valid]
+    return filtered_df
+
+
+
+#>>>>>>>>>> - filter_and_label_valid_addresses -  >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+ADDRESS_FIELDS = [
+    'PERSONAL_ADDRESS', 'PERSONAL_ADDRESS_2',
+    'PROFESSIONAL_ADDRESS', 'PROFESSIONAL_ADDRESS_2',
+    'COMPANY_ADDRESS', 'COMPANY_ADDRESS_2'
+]
+
+PO_BOX_PATTERN = r'(?i)p\.?\s*o\.?\s*box'
+
+# Name of the address rule in the persistent address cache, bump it when PO_BOX_PATTERN changes
+ADDRESS_RULE = 'po_box_regex_v1'
+
+
+def _validate_address_values(addresses):
+    # An address is valid when it is present, not just a hyphen and not a P.O. Box
+    addresses = _as_strings(pd.Series(addresses))
+    valid = addresses.ne('-') & ~addresses.str.contains(PO_BOX_PATTERN, regex=True)
+    return valid.to_numpy(dtype=bool, na_value=False)
+
+
+def address_validity(addresses, cache=None):
+    """
+    Checks a column of addresses, validating each distinct address string only once.
+
+    Parameters:
+    addresses (pd.Series): The addresses to check.
+    cache (AddressValidationCache, optional): Persistent cache of results from earlier runs.
+
+    Returns:
+    np.ndarray: Boolean array aligned with 'addresses', True for valid addresses.
+    """
+    codes, uniques = pd.factorize(pd.Series(addresses), use_na_sentinel=True)
+    uniques = _as_strings(pd.Series(uniques))
+
+    if cache is None:
+        unique_valid = _validate_address_values(uniques)
+    else:
+        unique_valid = np.array(cache.validate(ADDRESS_RULE, uniques.tolist(), _validate_address_values), dtype=bool)
+
+    valid = np.zeros(len(codes), dtype=bool)
+    present = codes >= 0
+    valid[present] = unique_valid[codes[present]]
+    return valid
+
+
+@instrument_stage()
+def filter_and_label_valid_addresses(df, cache=None):
+    """
+    Filters a DataFrame to retain rows with valid addresses and adds two new columns:
+    'VALID_ADDRESS' containing the first valid address and 'ADDRESS_USED' indicating 
+    the field name of the valid address used. A valid address is one that is not NaN, not 
+    just a hyphen, and does not contain 'P.O. Box' or variations of it.
+
+    Each distinct address string across the six address columns is validated once.
+
+    Parameters:
+    df (pd.DataFrame): DataFrame with address columns to be processed.
+    cache (AddressValidationCache, optional): Persistent cache of validation results, so addresses
+                                              seen in earlier runs are not validated again.
+
+    Returns:
+    pd.DataFrame: Modified DataFrame with only valid address rows and added columns.
+
+    Raises:
+    ValueError: If the input is not a DataFrame or required columns are missing.
+    """
+    if not isinstance(df, pd.DataFrame):
+        raise ValueError("Input must be a pandas DataFrame")
+
+    # Verify if all required columns are present in the DataFrame
+    missing_cols = [col for col in ADDRESS_FIELDS if col not in df.columns]
+    if missing_cols:
+        raise ValueError(f"Missing columns in DataFrame: {missing_cols}")
+
+    labels = _label_valid_addresses(df, cache)
+    df['VALID_ADDRESS'] = labels['VALID_ADDRESS']
+    df['ADDRESS_USED'] = labels['ADDRESS_USED']
+    df = df[labels['HAS_VALID_ADDRESS']]
+
+    return df
+
+
+def _label_valid_addresses(df, cache=None):
+    # First valid address of each row, the field it came from and whether the row has one at all
+    stacked = pd.concat([df[field] for field in ADDRESS_FIELDS], ignore_index=True)
+    valid = address_validity(stacked, cache).reshape(len(ADDRESS_FIELDS), len(df))
+
+    has_valid = valid.any(axis=0)
+    first_valid = valid.argmax(axis=0)
+    addresses = np.column_stack([df[field].to_numpy(dtype=object) for field in ADDRESS_FIELDS]) if len(df) else np.empty((0, len(ADDRESS_FIELDS)), dtype=object)
+
+    return {
+        'VALID_ADDRESS': np.where(has_valid, addresses[np.arange(len(df)), first_valid], None),
+        'ADDRESS_USED': np.where(has_valid, np.array(ADDRESS_FIELDS, dtype=object)[first_valid], None),
+        'HAS_VALID_ADDRESS': has_valid,
+    }
+
+
+#>>>>>>>>>> - filter for vaild business and personal email-  >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+
+@instrument_stage()
+def filter_by_valid_business_personal_email(df, validation_column="BUSINESS_EMAIL_VALIDATION_STATUS", business_email_column="BUSINESS_EMAIL", personal_email_column="PERSONAL_EMAIL"):
+    """
+    Modifies a DataFrame to create a new column 'Valid_Business_Email'. This column contains
+    the business email if it's validated as 'Valid' in the specified validation column. Otherwise,
+    it uses the personal email, selecting an alternate email from a list of personal emails if the business email is not unique.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to modify.
+        validation_column (str): The name of the column containing email validation status.
+        business_email_column (str): The name of the column containing business email addresses.
+        personal_email_column (str): The name of the column containing personal email addresses.
+
+    Returns:
+        pd.DataFrame: A modified DataFrame with an additional column 'Valid_Business_Email'.
+
+    Use Case:
+    Assume a DataFrame 'df' with columns 'BUSINESS_EMAIL', 'PERSONAL_EMAIL', and 'BUSINESS_EMAIL_VALIDATION_STATUS'.
+    If 'BUSINESS_EMAIL_VALIDATION_STATUS' is 'Invalid', use 'PERSONAL_EMAIL'. If 'PERSONAL_EMAIL' contains multiple emails separated by semicolons, choose an email different from 'BUSINESS_EMAIL'.
+    >>> df = pd.DataFrame({
+        'BUSINESS_EMAIL': ['john@example.com', 'jane@example.com'],
+        'PERSONAL_EMAIL': ['john.personal@example.com;john.other@example.com', 'jane.personal@example.com'],
+        'BUSINESS_EMAIL_VALIDATION_STATUS': ['Invalid', 'Valid']
+    })
+    >>> modified_df = filter_by_valid_business_personal_email(df)
+    This modifies 'df' to include a 'Valid_Business_Email' column with the appropriate email addresses.
+    """
+    df_processed = df.copy()
+
+    df_processed['Valid_Business_Email'] = _resolve_business_emails(
+        df_processed[validation_column], df_processed[business_email_column], df_processed[personal_email_column]
+    ).array
+
+    return df_processed
+
+
+def _resolve_business_emails(validation_status, business_emails, personal_emails):
+    # Business email when validated, otherwise the second personal email if there are several, else the first
+    is_valid = validation_status.str.contains("Valid", case=False, na=False)
+
+    if not pd.api.types.is_string_dtype(personal_emails):
+        personal_emails = personal_emails.astype("object")
+    personal_parts = personal_emails.str.split(',')
+    alternate = personal_parts.str[1].where(personal_parts.str.len() > 1, personal_parts.str[0])
+    # Values that are not strings (missing emails) are used as they are
+    alternate = alternate.where(personal_parts.notna(), personal_emails)
+
+    return business_emails.where(is_valid, alternate)
+
+#>>>>>>>>>> - filter by target industry -  >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+#taget industry
+@instrument_stage()
+def filter_by_target_industries(df, target_industries):
+    """
+    Filters a DataFrame to include only rows that belong to the specified target industries.
+
+    Parameters:
+    df (pd.DataFrame): The DataFrame to filter.
+    target_industries (list): List of target industries.
+
+    Returns:
+    pd.DataFrame: The filtered DataFrame.
+    """
+    filtered_df = df[df['PRIMARY_INDUSTRY'].isin(target_industries)]
+
+    return filtered_df
+
+
+#>>>>>>>>>> - drop_rows_with_hyphen -  >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+
+@instrument_stage()
+def drop_rows_with_hyphen(df, columns):
+    """
+    Drops rows in a DataFrame where specified columns contain a hyphen ("-").
+
+    Args:
+        df (pd.DataFrame): The DataFrame to process.
+        columns (list): List of column names to check for hyphens.
+
+    Returns:
+        pd.DataFrame: A new DataFrame with rows containing hyphens in specified columns dropped.
+    """
+    # Ensure columns is a list, even if a single column name is provided
+    if not isinstance(columns, list):
+        columns = [columns]
+
+    # Drop rows where any of the specified columns contain a hyphen, missing values are kept
+    for column in columns:
+        if column in df.columns:
+            df = df[df[column].ne('-').to_numpy(dtype=bool, na_value=True)]
+    
+    return df
+
+def _industry_mask(industry_codes, industry_categories, target_industries):
+    # Membership of each row in the target industries, from the factorized 'PRIMARY_INDUSTRY' column
+    wanted = np.append(industry_categories.isin(target_industries), False)
+    return wanted[industry_codes]
@@ -0,0 +1,350 @@
+'''
+Adfunctions.io reads raw exports into DataFrames and writes the lists to CSV.
+
+'''
+#>>>>>>>>>>>>> Import required Packages >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+import csv
+import io
+import os
+from contextlib import nullcontext
+from functools import lru_cache
+from importlib.util import find_spec
+
+import numpy as np
+import pandas as pd
+
+from canonical import hash_identifier_columns
+from csv_index import read_byte_range
+from metrics import instrument_stage
+from schema import projection, require_schemas
+
+# Directory the lists are saved to, overridable per call or with the ADLIST_OUTPUT_DIR environment variable
+OUTPUT_DIRECTORY = os.environ.get("ADLIST_OUTPUT_DIR", "Output_list_DataBase")
+
+# File extension written for each supported output compression
+CSV_COMPRESSION_EXTENSIONS = {None: "", "gzip": ".gz", "zstd": ".zst"}
+
+# Identifier columns of the output lists, used for suppression and hashed exports
+LIVERAMP_EMAIL_COLUMNS = ['Email1', 'Email2', 'Email3']
+LIVERAMP_PHONE_COLUMNS = ['PhoneNumber1', 'PhoneNumber2']
+OUTPUT_EMAIL_COLUMNS = LIVERAMP_EMAIL_COLUMNS + ['Email']
+OUTPUT_PHONE_COLUMNS = LIVERAMP_PHONE_COLUMNS + ['Phone Number']
+
+#>>>>>>>>>>>>> - Define Function to read Data - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+def _string_inference(arrow_strings):
+    # Make read_csv infer text columns as Arrow backed strings (the default from pandas 3 on), or as
+    # Python objects when 'arrow_strings' is False
+    if arrow_strings and find_spec("pyarrow") is None:
+        return nullcontext()
+    try:
+        return pd.option_context("future.infer_string", bool(arrow_strings))
+    except (KeyError, pd.errors.OptionError):
+        return nullcontext()
+
+
+def _as_strings(values):
+    # Keep string columns (Arrow backed or object) as they are, convert other columns (e.g. an all
+    # missing float column) to the pandas string dtype
+    if pd.api.types.is_string_dtype(values):
+        return values
+    return values.astype("string")
+
+
+@instrument_stage()
+def get_data(file_path, byte_range=None, arrow_strings=True, **kwargs):
+    """
+    Reads data from a CSV file into a pandas DataFrame.
+
+    This function reads a CSV file from the given file path using pandas, allowing additional
+    optional parameters to be passed to pandas.read_csv for more flexibility.
+
+    Parameters:
+    file_path (str): The file path to the CSV file to be read.
+    byte_range (tuple, optional): (start_byte, end_byte) of the records to read, as returned by
+                                  CsvRowIndex.shards. The header is always read. Defaults to the whole file.
+    arrow_strings (bool): If True, text columns are read as Arrow backed strings instead of Python object
+                          columns (needs pyarrow). They are much more compact and their string methods faster.
+    **kwargs: Optional keyword arguments that are passed to pandas.read_csv.
+
+    Returns:
+    pd.DataFrame: A DataFrame containing the data from the CSV file.
+
+    Raises:
+    ValueError: If the file_path is not a string.
+    FileNotFoundError: If the file does not exist at the specified path.
+    Exception: For other issues that may arise during file reading.
+
+    Example:
+    >>> df = get_data("path/to/your/data.csv", sep=';', header=None)
+    >>> shard_df = get_data("path/to/your/data.csv", byte_range=CsvRowIndex.load_or_build("path/to/your/data.csv").shards(4)[0])
+    """
+    if not isinstance(file_path, str):
+        raise ValueError("File path must be a string")
+
+    try:
+        source = file_path if byte_range is None else read_byte_range(file_path, byte_range)
+        with _string_inference(arrow_strings):
+            df = pd.read_csv(source, low_memory=False, **kwargs)
+        return df
+    except FileNotFoundError:
+        raise FileNotFoundError("File not found at the specified path")
+    except Exception as e:
+        raise Exception(f"An error occurred while reading the file: {e}")
+
+
+def _read_for_schemas(file_path, data, *schema_names):
+    # Check the header (or the frame given by the caller) against the schemas before any row is parsed,
+    # then read only the columns they need
+    if data is not None:
+        require_schemas(data.columns, schema_names)
+        return data
+    return get_data(file_path, usecols=projection(file_path, *schema_names))
+
+#>>>>>>>>>> Define Function fcount duplicates >>>>>>>>>>>>>>
+    
+def count_duplicates(df):
+    """
+    Checks for duplicate rows in a DataFrame and returns a message indicating the number of duplicates.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to check for duplicates.
+
+    Returns:
+        str: A message indicating no duplicates or the number of duplicate rows.
+    """
+    num_duplicates = df.duplicated().sum()
+
+    if num_duplicates == 0:
+        return "No duplicates found."
+    else:
+        return f"The data has {num_duplicates} duplicates."
+ 
+
+#>>>>>>>>>>create - function list files in a path ->>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+
+def list_files_in_folder(folder_path):
+    """
+    Lists all files in the specified folder, excluding subdirectories.
+
+    Parameters:
+    folder_path (str): The path to the folder whose files need to be listed.
+
+    Returns:
+    list: A list of filenames (str) found in the folder. Returns an empty list if the folder doesn't exist or an error occurs.
+
+    Use Case:
+    To get a list of all files in a specific folder, use:
+    >>> file_list = list_files_in_folder('/path/to/folder')
+    """
+    try:
+        file_list = os.listdir(folder_path)
+        # Filter out subfolders and keep only files
+        file_list = [file for file in file_list if os.path.isfile(os.path.join(folder_path, file))]
+        return file_list
+    except OSError as e:
+        print(f"Error occurred while listing files in the folder '{folder_path}': {e}")
+        return []
+
+#>>>>>>>>>> - create csv file -  >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+
+def write_csv(df, file_path, engine="pandas", compression=None, chunk_size=500_000, buffer_size=16 * 1024 * 1024):
+    """
+    Writes a DataFrame to a CSV file atomically: the data is written to a temporary file in the same
+    directory, which is renamed over 'file_path' only once it is complete, so readers never see a
+    half written list.
+
+    Parameters:
+    df (pd.DataFrame): The DataFrame to write.
+    file_path (str): The destination file. The compression extension ('.gz' or '.zst') is appended if missing.
+    engine (str): 'pandas' produces the same text as a plain to_csv call. It formats string, integer, float
+                  and boolean columns with Arrow string kernels, so they are written about ten times faster
+                  than by to_csv; frames holding other dtypes are formatted by to_csv. 'pyarrow' uses
+                  pyarrow's multithreaded CSV writer, which is faster still but quotes every string and the
+                  header and writes booleans and floats the Arrow way ('true', '1234').
+    compression (str, optional): None, 'gzip' or 'zstd'.
+    chunk_size (int): Number of rows formatted at a time by the 'pandas' engine.
+    buffer_size (int): Size in bytes of the write buffer.
+
+    Returns:
+    str: The path of the written file.
+
+    Raises:
+    ValueError: If the engine or the compression is not supported.
+
+    Use Case:
+    >>> write_csv(formatted_df, 'Output_list_DataBase/liveramp_list.csv', engine='pyarrow', compression='gzip')
+    'Output_list_DataBase/liveramp_list.csv.gz'
+    """
+    if engine not in ("pandas", "pyarrow"):
+        raise ValueError(f"Unsupported CSV engine '{engine}', expected 'pandas' or 'pyarrow'")
+    if compression not in CSV_COMPRESSION_EXTENSIONS:
+        raise ValueError(f"Unsupported compression '{compression}', expected one of {list(CSV_COMPRESSION_EXTENSIONS)}")
+
+    extension = CSV_COMPRESSION_EXTENSIONS[compression]
+    if extension and not file_path.endswith(extension):
+        file_path = f"{file_path}{extension}"
+
+    temp_path = os.path.join(os.path.dirname(file_path) or ".", f".{os.path.basename(file_path)}.{os.getpid()}.tmp")
+    try:
+        if engine == "pyarrow":
+            _write_csv_pyarrow(df, temp_path, compression, buffer_size)
+        else:
+            _write_csv_pandas(df, temp_path, compression, chunk_size, buffer_size)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    return file_path
+
+
+def _write_csv_pandas(df, path, compression, chunk_size, buffer_size):
+    # Write the to_csv text of the frame, chunk by chunk, into one buffered (and optionally compressed) stream
+    raw = open(path, "wb", buffering=buffer_size)
+    try:
+        if compression == "gzip":
+            import gzip
+            binary = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6)
+        elif compression == "zstd":
+            try:
+                import zstandard
+            except ImportError:
+                raise ValueError("zstd compression with the 'pandas' engine requires the 'zstandard' package, use engine='pyarrow' instead")
+            binary = zstandard.ZstdCompressor().stream_writer(raw, closefd=False)
+        else:
+            binary = nullcontext(raw)
+
+        with binary as stream:
+            stream.write(_csv_header_bytes(df))
+            for start in range(0, len(df), chunk_size):
+                stream.write(_csv_rows_bytes(df.iloc[start:start + chunk_size]))
+    finally:
+        raw.close()
+
+
+def _csv_header_bytes(df):
+    # Header line exactly as DataFrame.to_csv writes it
+    return df.iloc[:0].to_csv(index=False).encode("utf-8")
+
+
+def _csv_rows_bytes(df):
+    # Rows exactly as DataFrame.to_csv(header=False) writes them, built with Arrow string kernels when every
+    # column has a dtype whose to_csv text is reproduced by _csv_text_column
+    if find_spec("pyarrow") is None:
+        return df.to_csv(index=False, header=False).encode("utf-8")
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    columns = [_csv_text_column(df.iloc[:, position]) for position in range(df.shape[1])]
+    if len(df) == 0 or len(columns) < 2 or any(column is None for column in columns):
+        # A lone column writes empty values as '""', left to to_csv like the other dtypes
+        return df.to_csv(index=False, header=False).encode("utf-8")
+
+    quote, delimiter, newline, empty = (pa.scalar(text, type=pa.large_string()) for text in ('"', ",", "\n", ""))
+    special_characters = _csv_special_characters()
+    quoted = []
+    for column in columns:
+        # QUOTE_MINIMAL: quote the values holding the delimiter, the quote character or a line break. Most
+        # columns hold none of them, which a search of their data buffer tells without a kernel per value
+        data = column.buffers()[2].to_pybytes() if column.buffers()[2] is not None else b""
+        if not any(character.encode() in data for character in special_characters):
+            quoted.append(column)
+            continue
+        needs_quotes = pc.match_substring_regex(column, f"[{special_characters}]")
+        escaped = pc.binary_join_element_wise(quote, pc.replace_substring(column, '"', '""'), quote, empty)
+        quoted.append(pc.if_else(needs_quotes, escaped, column))
+
+    lines = pc.binary_join_element_wise(pc.binary_join_element_wise(*quoted, delimiter), newline, empty)
+    offsets = np.frombuffer(lines.buffers()[1], dtype=np.int64, count=len(lines) + 1, offset=lines.offset * 8)
+    return pa.py_buffer(lines.buffers()[2])[int(offsets[0]):int(offsets[-1])].to_pybytes()
+
+
+@lru_cache(maxsize=None)
+def _csv_special_characters():
+    # Characters that make to_csv quote a value. '\r' only does on Python versions whose csv writer quotes
+    # it regardless of the line terminator
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerow(["\r", ""])
+    return ',"\n\r' if buffer.getvalue().startswith('"') else ',"\n'
+
+
+def _csv_text_column(series):
+    # Large string array holding the to_csv text of every value (missing values as ''), or None for dtypes
+    # whose text is left to to_csv
+    import pyarrow as pa
+
+    dtype = series.dtype
+    if isinstance(dtype, pd.StringDtype) and dtype.storage == "pyarrow":
+        return pa.array(series.array).cast(pa.large_string()).fill_null("")
+    if isinstance(dtype, pd.StringDtype) or dtype == object:
+        values = series.to_numpy(dtype=object, na_value=None)
+        missing = pd.isna(values)
+        if dtype == object and not all(type(value) is str for value in values[~missing]):
+            # csv.writer writes str() of the other objects
+            values = np.where(missing, None, values).astype(str)
+            values[missing] = ""
+        return pa.array(values, type=pa.large_string(), from_pandas=True).fill_null("")
+    if isinstance(dtype, np.dtype) and (dtype.kind in "iu" or dtype == np.float64):
+        # NumPy and to_csv both write the shortest repr of floats, '1234.0' and '1e+20'
+        values = series.to_numpy().astype(str)
+        if dtype.kind == "f":
+            values[series.isna().to_numpy()] = ""
+        return pa.array(values, type=pa.large_string())
+    if dtype == bool:
+        return pa.array(np.where(series.to_numpy(), "True", "False"), type=pa.large_string())
+    return None
+
+
+def _write_csv_pyarrow(df, path, compression, buffer_size):
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    stream = pa.output_stream(path, compression=compression, buffer_size=buffer_size)
+    with stream:
+        pa_csv.write_csv(table, stream, write_options=pa_csv.WriteOptions(quoting_style="needed"))
+
+
+@instrument_stage()
+def save_df_to_csv(df, file_name, hashed=False, directory=None, engine="pandas", compression=None):
+    """
+    Saves a pandas DataFrame to a CSV file, creating the directory if it does not exist.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to save.
+        file_name (str): The file name for the CSV file.
+        hashed (bool): If True, the email and phone columns of the output lists are normalized and
+                       written as SHA-256 digests instead of plaintext.
+        directory (str, optional): The output directory. Defaults to OUTPUT_DIRECTORY, which is
+                                   'Output_list_DataBase' unless the ADLIST_OUTPUT_DIR environment variable is set.
+        engine (str): CSV writer engine, 'pandas' or 'pyarrow'. See write_csv.
+        compression (str, optional): None, 'gzip' or 'zstd'.
+
+    Returns:
+        None, or a message starting with 'An error occurred' if the file could not be written.
+
+    Use Case:
+    To save a DataFrame 'df' to a CSV file named 'data.csv' in the 'Output_list_DataBase' directory, use:
+    >>> df = pd.DataFrame({'A': [1, 2, 3], 'B': [4, 5, 6]})
+    >>> save_df_to_csv(df, 'data')
+    This will save 'df' as a CSV file named 'data.csv' in the 'Output_list_DataBase' directory.
+    To write a gzip compressed list with the pyarrow writer into another directory, use:
+    >>> save_df_to_csv(df, 'data', directory='/data/lists', engine='pyarrow', compression='gzip')
+    """
+    directory = directory or OUTPUT_DIRECTORY
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+
+    file_path = os.path.join(directory, f"{file_name}.csv")
+
+    if hashed:
+        df = hash_identifier_columns(df, OUTPUT_EMAIL_COLUMNS, OUTPUT_PHONE_COLUMNS)
+
+    try:
+        file_path = write_csv(df, file_path, engine=engine, compression=compression)
+        print(f"DataFrame successfully saved to {file_path}")
+    except Exception as e:
+        print(f"Error saving DataFrame to CSV: {e}")
+        # Reported like the list creators report their failures, so callers count the list as failed
+        return f"An error occurred: could not save '{file_path}': {e}"
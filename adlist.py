@@ -0,0 +1,257 @@
+'''
+adlist is the command line entry point of the list builders. It imports nothing heavy itself: pandas and
+the Adfunctions submodules are loaded by the command that needs them, so '--help' or a misspelled command
+returns at once from cron.
+
+Every command takes any number of inputs and runs them all in one process, which parses its imports once.
+With '--workers N' the inputs are spread over N worker processes started from that process. Inputs given
+as '-' (or no input at all) are read from standard input, one path per line, so a shell loop or xargs
+feeds one invocation instead of starting one per file. With several inputs, '--output' is a template in
+which '{stem}' is replaced by the input file name without its extensions.
+
+Usage:
+    python adlist.py build ./raw_data/Adpromoter_FirstPriority.csv --industries "Marketing" "Newspapers" --output marketing_liveramp_list
+    python adlist.py build ./raw_data/*.csv --industries "Marketing" --workers 4 --chunk-size 200000 --output-format csv.gz
+    python adlist.py email ./raw_data/Event-Promoter.csv --industries "Events Services" --output events_email_list
+    python adlist.py merge ./merger_input_data --output ./output_list_database/combined_liveramp_list.csv --columns Email1 PhoneNumber1
+    python adlist.py profile ./raw_data/Adpromoter_FirstPriority.csv --industries "Marketing"
+    find ./raw_data -name "*.csv" | python adlist.py build - --industries "Marketing" --engine pyarrow
+
+'''
+#>>>>>>>>>>>>> Import required Packages >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from importlib import import_module
+
+# --output-format choices and the write_csv compression of each
+OUTPUT_FORMATS = {"csv": None, "csv.gz": "gzip", "csv.zst": "zstd"}
+
+DEFAULT_OUTPUTS = {
+    "build": "{stem}_liveramp_list",
+    "email": "{stem}_email_list",
+    "merge": "{stem}_merged.csv",
+    "profile": None,
+}
+
+# Module each command runs on, imported before the workers start so they begin warm
+COMMAND_MODULES = {"build": "Adfunctions.export", "email": "Adfunctions.export", "merge": "Adfunctions.export",
+                   "profile": "profiler"}
+
+
+#>>>>>>>>>> - Define commands - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+# Each command runs one input and returns the message of its list builder, None meaning success
+
+def _build(input_path, output, args):
+    from Adfunctions import liveramp_adlist_creator
+
+    return liveramp_adlist_creator(input_path, args.industries, output, hashed=args.hashed, chunk_rows=args.chunk_size,
+                                   directory=args.output_dir, engine=args.engine,
+                                   compression=OUTPUT_FORMATS[args.output_format])
+
+
+def _email(input_path, output, args):
+    from Adfunctions import email_list_creator
+
+    return email_list_creator(input_path, args.industries, output, directory=args.output_dir, engine=args.engine,
+                              compression=OUTPUT_FORMATS[args.output_format])
+
+
+def _merge(input_path, output, args):
+    from Adfunctions import merge_csv_files
+
+    if args.output_dir:
+        output = os.path.join(args.output_dir, output)
+    merge_csv_files(input_path, output, args.columns, engine=args.engine,
+                    compression=OUTPUT_FORMATS[args.output_format], fuzzy=args.fuzzy)
+
+
+def _profile(input_path, output, args):
+    import json
+    from profiler import print_profile, profile_file
+
+    profile = profile_file(input_path, top_k=args.top_k, chunk_rows=args.chunk_size, target_industries=args.industries)
+    if args.json:
+        # Machine readable output: the profile on stdout, or in the --output file when given
+        if output is None:
+            print(json.dumps(profile, default=float))
+        else:
+            with open(output, "w", encoding="utf-8") as json_file:
+                json.dump(profile, json_file, indent=2, default=float)
+    else:
+        print_profile(profile)
+
+
+def _run_input(job):
+    """
+    Runs one input of a command and returns its outcome. Output printed by the command is captured, so
+    the outcomes of parallel workers are printed whole and in input order.
+    """
+    command, input_path, output, args = job
+    start = time.perf_counter()
+    printed = io.StringIO()
+    with contextlib.redirect_stdout(printed):
+        try:
+            message = command(input_path, output, args)
+        except Exception as e:
+            message = f"An error occurred: {str(e)}"
+
+    failed = isinstance(message, str) and message.startswith("An error occurred")
+    return {
+        "input": input_path,
+        "output": output,
+        "status": "failed" if failed else "ok",
+        "message": message,
+        "printed": printed.getvalue(),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+#>>>>>>>>>> - Define input handling - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+def read_inputs(inputs, stdin=None):
+    """
+    Expands the command line inputs: each '-', or an empty input list, stands for the paths read from
+    'stdin' (one per line, blank lines ignored).
+    """
+    stdin = stdin if stdin is not None else sys.stdin
+    expanded = []
+    for input_path in inputs or ["-"]:
+        if input_path == "-":
+            expanded.extend(line.strip() for line in stdin if line.strip())
+        else:
+            expanded.append(input_path)
+    return expanded
+
+
+def input_stem(input_path):
+    """
+    File name of 'input_path' without directory and extensions ('raw/first.csv.gz' -> 'first').
+    """
+    name = os.path.basename(os.path.normpath(input_path))
+    for extension in (".gz", ".zst", ".csv"):
+        if name.endswith(extension):
+            name = name[:-len(extension)]
+    return name
+
+
+def output_names(inputs, template):
+    """
+    Output name of each input from the '--output' template.
+
+    Raises:
+    ValueError: If several inputs would be written to the same output.
+    """
+    if template is None:
+        return [None] * len(inputs)
+
+    outputs = [template.format(stem=input_stem(input_path)) for input_path in inputs]
+    duplicated = sorted({output for output in outputs if outputs.count(output) > 1})
+    if duplicated:
+        raise ValueError(f"Several inputs would be written to {duplicated}; use '{{stem}}' in --output")
+    return outputs
+
+
+def run_inputs(command, inputs, outputs, args, workers=1):
+    """
+    Runs 'command' on every input, in this process or on 'workers' worker processes, and yields the
+    outcome of each input in input order.
+    """
+    jobs = [(command, input_path, output, args) for input_path, output in zip(inputs, outputs)]
+    if workers <= 1 or len(jobs) <= 1:
+        yield from map(_run_input, jobs)
+        return
+
+    # Import the engine once before the pool starts so forked workers inherit it already loaded
+    import_module(COMMAND_MODULES[args.command])
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+        yield from executor.map(_run_input, jobs)
+
+
+#>>>>>>>>>> - Define the parser - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+def _positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {value}")
+    return number
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="adlist", description="Build advertising lists from raw exports.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    # Options every command shares
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("inputs", nargs="*", help="Input paths; '-' or none reads paths from standard input")
+    common.add_argument("--workers", type=_positive_int, default=1, help="Worker processes for several inputs")
+
+    writer = argparse.ArgumentParser(add_help=False)
+    writer.add_argument("--output-dir", default=None, help="Output directory (default: ADLIST_OUTPUT_DIR or Output_list_DataBase)")
+    writer.add_argument("--engine", choices=("pandas", "pyarrow"), default="pandas", help="CSV writer engine")
+    writer.add_argument("--output-format", choices=list(OUTPUT_FORMATS), default="csv", help="Output file format")
+
+    build = commands.add_parser("build", parents=[common, writer], help="Build LiveRamp lists")
+    build.add_argument("--industries", nargs="+", required=True, help="Target industries")
+    build.add_argument("--output", default=DEFAULT_OUTPUTS["build"], help="Name (template) of the output list")
+    build.add_argument("--hashed", action="store_true", help="Write SHA-256 hashed emails and phone numbers")
+    build.add_argument("--chunk-size", type=_positive_int, default=None, help="Read and filter this many rows at a time")
+    build.set_defaults(func=_build)
+
+    email = commands.add_parser("email", parents=[common, writer], help="Build email lists")
+    email.add_argument("--industries", nargs="+", required=True, help="Target industries")
+    email.add_argument("--output", default=DEFAULT_OUTPUTS["email"], help="Name (template) of the output list")
+    email.set_defaults(func=_email)
+
+    merge = commands.add_parser("merge", parents=[common, writer], help="Merge the CSV lists of folders")
+    merge.add_argument("--output", default=DEFAULT_OUTPUTS["merge"], help="Path (template) of the merged file")
+    merge.add_argument("--columns", nargs="+", default=None, help="Columns to check for duplicates")
+    merge.add_argument("--fuzzy", action="store_true", help="Also drop near-duplicate contacts")
+    merge.set_defaults(func=_merge)
+
+    profile = commands.add_parser("profile", parents=[common], help="Profile raw exports")
+    profile.add_argument("--industries", nargs="*", default=None, help="Target industries of the list")
+    profile.add_argument("--top-k", type=_positive_int, default=10, help="Number of top values per column")
+    profile.add_argument("--chunk-size", type=_positive_int, default=200_000, help="Rows read at a time")
+    profile.add_argument("--json", action="store_true", help="Write the profile as JSON")
+    profile.add_argument("--output", default=DEFAULT_OUTPUTS["profile"], help="JSON file (template) instead of stdout")
+    profile.set_defaults(func=_profile)
+
+    return parser
+
+
+def main(argv=None, stdin=None):
+    """
+    Runs the command given in 'argv' (default: the command line) on each of its inputs and returns the
+    process exit code: 0 when every input succeeded, 1 otherwise.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    inputs = read_inputs(args.inputs, stdin)
+    if not inputs:
+        parser.error("no inputs given")
+    try:
+        outputs = output_names(inputs, args.output)
+    except ValueError as e:
+        parser.error(str(e))
+
+    failed = 0
+    start = time.perf_counter()
+    for outcome in run_inputs(args.func, inputs, outputs, args, args.workers):
+        sys.stdout.write(outcome["printed"])
+        if outcome["message"]:
+            print(outcome["message"])
+        failed += outcome["status"] == "failed"
+        if len(inputs) > 1:
+            print(f"[{outcome['status']}] {outcome['input']} ({outcome['seconds']:.2f}s)")
+
+    if len(inputs) > 1:
+        print(f"Finished {len(inputs)} inputs in {time.perf_counter() - start:.2f}s, {failed} failed.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
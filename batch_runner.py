@@ -0,0 +1,317 @@
+'''
+batch_runner runs a manifest of list jobs (one JSON object per line) instead of hardcoding the sequence
+of liveramp_adlist_creator, email_list_creator and merge_csv_files calls in a script.
+
+Jobs form a dependency graph: a merge job waits for the jobs it depends on, either listed in its
+'depends_on' field or inferred because their output file lands in the merge input folder. Independent
+jobs run concurrently on a bounded process pool, and list jobs that read the same raw file are run
+together in one worker so the file is parsed, and its shared filtering stages run, only once.
+
+Manifest example (jobs.jsonl):
+{"job_id": "first_priority", "list_type": "liveramp", "input": "./raw_data/Adpromoter_FirstPriority.csv", "industries": ["Marketing"], "output": "first_priority_liveramp_list"}
+{"job_id": "events_email", "list_type": "email", "input": "./raw_data/Event-Promoter.csv", "industries": ["Events Services"], "output": "events_email_list", "directory": "./email_lists", "engine": "pyarrow", "compression": "gzip"}
+{"job_id": "combined", "list_type": "merge", "input": "./Output_list_DataBase", "output": "./output_list_database/combined_liveramp_list.csv", "columns_to_check": ["Email1", "PhoneNumber1"]}
+
+List jobs may set 'directory', 'engine' and 'compression', passed to save_df_to_csv, to choose where
+and how their file is written.
+
+Usage:
+    python batch_runner.py jobs.jsonl --workers 4
+
+'''
+#>>>>>>>>>>>>> Import required Packages >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+import argparse
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+LIST_TYPES = ("liveramp", "email")
+JOB_TYPES = LIST_TYPES + ("merge",)
+
+# Directory save_df_to_csv writes the lists to (Adfunctions.OUTPUT_DIRECTORY, without importing pandas here)
+LIST_OUTPUT_DIRECTORY = os.environ.get("ADLIST_OUTPUT_DIR", "Output_list_DataBase")
+# Extensions write_csv appends per compression (Adfunctions.io.CSV_COMPRESSION_EXTENSIONS)
+LIST_COMPRESSION_EXTENSIONS = {None: "", "gzip": ".gz", "zstd": ".zst"}
+LIST_ENGINES = ("pandas", "pyarrow")
+
+
+#>>>>>>>>>> - Define manifest loading - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+def load_manifest(manifest_path):
+    """
+    Reads and validates a JSONL job manifest.
+
+    Parameters:
+    manifest_path (str): Path to the manifest, one JSON job per line. Blank lines are ignored.
+
+    Returns:
+    list of dict: The jobs in manifest order.
+
+    Raises:
+    FileNotFoundError: If the manifest does not exist.
+    ValueError: If a job is malformed, has an unknown type or a duplicated 'job_id'.
+    """
+    if not os.path.exists(manifest_path):
+        raise FileNotFoundError(f"Manifest '{manifest_path}' not found.")
+
+    jobs = []
+    seen = set()
+    with open(manifest_path, "r", encoding="utf-8") as manifest_file:
+        for line_number, line in enumerate(manifest_file, start=1):
+            if not line.strip():
+                continue
+            try:
+                job = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Line {line_number} of '{manifest_path}' is not valid JSON: {e}")
+
+            job.setdefault("job_id", f"job_{line_number}")
+            if job.get("list_type") not in JOB_TYPES:
+                raise ValueError(f"Job '{job['job_id']}' has unknown list_type '{job.get('list_type')}', expected one of {JOB_TYPES}")
+            for field in ("input", "output"):
+                if field not in job:
+                    raise ValueError(f"Job '{job['job_id']}' is missing the '{field}' field")
+            if job["list_type"] in LIST_TYPES and "industries" not in job:
+                raise ValueError(f"Job '{job['job_id']}' is missing the 'industries' field")
+            if job.get("engine", "pandas") not in LIST_ENGINES:
+                raise ValueError(f"Job '{job['job_id']}' has unknown engine '{job['engine']}', expected one of {LIST_ENGINES}")
+            if job.get("compression") not in LIST_COMPRESSION_EXTENSIONS:
+                raise ValueError(f"Job '{job['job_id']}' has unknown compression '{job['compression']}', "
+                                 f"expected one of {list(LIST_COMPRESSION_EXTENSIONS)}")
+            if job["job_id"] in seen:
+                raise ValueError(f"Duplicated job_id '{job['job_id']}'")
+
+            seen.add(job["job_id"])
+            jobs.append(job)
+
+    return jobs
+
+
+def list_output_path(job):
+    """
+    Returns the file a list job writes to, in its 'directory' and with the extension of its 'compression'.
+    """
+    directory = job.get("directory") or LIST_OUTPUT_DIRECTORY
+    return os.path.join(directory, f"{job['output']}.csv{LIST_COMPRESSION_EXTENSIONS[job.get('compression')]}")
+
+
+#>>>>>>>>>> - Define dependency graph - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+def build_tasks(jobs):
+    """
+    Groups jobs into tasks and computes the dependencies between tasks.
+
+    List jobs reading the same raw file share one task, so the file is parsed once. Each merge job is a
+    task of its own and depends on its 'depends_on' jobs and on every list job whose output file is
+    written to the merge input folder.
+
+    Parameters:
+    jobs (list of dict): Jobs as returned by load_manifest.
+
+    Returns:
+    tuple: (tasks, dependencies) where tasks maps a task id to its list of jobs and dependencies maps a
+           task id to the set of task ids it waits for.
+
+    Raises:
+    ValueError: If a job depends on an unknown job or the dependencies contain a cycle.
+    """
+    tasks = {}
+    task_of_job = {}
+    for job in jobs:
+        if job["list_type"] in LIST_TYPES:
+            task_id = f"read:{os.path.abspath(job['input'])}"
+        else:
+            task_id = f"merge:{job['job_id']}"
+        tasks.setdefault(task_id, []).append(job)
+        task_of_job[job["job_id"]] = task_id
+
+    dependencies = {task_id: set() for task_id in tasks}
+    for job in jobs:
+        task_id = task_of_job[job["job_id"]]
+
+        for dependency in job.get("depends_on", []):
+            if dependency not in task_of_job:
+                raise ValueError(f"Job '{job['job_id']}' depends on unknown job '{dependency}'")
+            dependencies[task_id].add(task_of_job[dependency])
+
+        if job["list_type"] == "merge":
+            merge_folder = os.path.abspath(job["input"])
+            for other in jobs:
+                if other["list_type"] in LIST_TYPES and os.path.dirname(os.path.abspath(list_output_path(other))) == merge_folder:
+                    dependencies[task_id].add(task_of_job[other["job_id"]])
+
+        dependencies[task_id].discard(task_id)
+
+    _check_acyclic(dependencies)
+    return tasks, dependencies
+
+
+def _check_acyclic(dependencies):
+    # Kahn's algorithm, raising if some tasks can never become ready
+    remaining = {task_id: set(waits_for) for task_id, waits_for in dependencies.items()}
+    while remaining:
+        ready = [task_id for task_id, waits_for in remaining.items() if not waits_for]
+        if not ready:
+            raise ValueError(f"Job dependencies contain a cycle between tasks: {sorted(remaining)}")
+        for task_id in ready:
+            del remaining[task_id]
+        for waits_for in remaining.values():
+            waits_for.difference_update(ready)
+
+
+#>>>>>>>>>> - Define task execution - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+def run_task(jobs):
+    """
+    Runs the jobs of one task in the current process and returns one result per job.
+
+    List jobs of a task share the same raw file: it is parsed once and the lists are fanned out from it
+    with build_lists_from_raw, so the shared filtering stages also run once.
+    Each result is a dict with 'job_id', 'status' ('ok', 'failed'), 'seconds', 'parse_seconds' and 'message'.
+    """
+    from Adfunctions import build_lists_from_raw, get_data, merge_csv_files
+
+    if jobs[0]["list_type"] == "merge":
+        results = []
+        for job in jobs:
+            start = time.perf_counter()
+            try:
+                merge_csv_files(job["input"], job["output"], job.get("columns_to_check"))
+                results.append(_result(job, "ok", time.perf_counter() - start, f"Merged into '{job['output']}'"))
+            except Exception as e:
+                results.append(_result(job, "failed", time.perf_counter() - start, str(e)))
+        return results
+
+    start = time.perf_counter()
+    try:
+        data = get_data(jobs[0]["input"])
+    except Exception as e:
+        return [_result(job, "failed", 0.0, str(e)) for job in jobs]
+
+    # Jobs are fanned out per suppression list, all from the same parsed frame
+    by_suppression = {}
+    for job in jobs:
+        by_suppression.setdefault(job.get("suppression"), []).append(job)
+
+    results = {}
+    for suppression_path, suppression_jobs in by_suppression.items():
+        try:
+            specs = [{
+                "list_type": job["list_type"],
+                "target_industries": job["industries"],
+                "output": job["output"],
+                "hashed": job.get("hashed", False),
+                "directory": job.get("directory"),
+                "engine": job.get("engine", "pandas"),
+                "compression": job.get("compression"),
+            } for job in suppression_jobs]
+            list_results = build_lists_from_raw(jobs[0]["input"], specs, data=data, suppression=_load_suppression(suppression_path))
+        except Exception as e:
+            list_results = [{"message": f"An error occurred: {str(e)}", "seconds": 0.0} for _ in suppression_jobs]
+
+        for job, list_result in zip(suppression_jobs, list_results):
+            # The list builders return None for a written list and report failures, a failed write
+            # included, as an 'An error occurred' message instead of raising
+            message = list_result["message"]
+            if message is None and not os.path.exists(list_output_path(job)):
+                message = f"An error occurred: '{list_output_path(job)}' was not written"
+            if message is None:
+                results[job["job_id"]] = _result(job, "ok", list_result["seconds"], f"Saved to '{list_output_path(job)}'")
+            else:
+                results[job["job_id"]] = _result(job, "failed", list_result["seconds"], message)
+
+    # The parse and the shared stages are charged to the first job of the task
+    ordered = [results[job["job_id"]] for job in jobs]
+    ordered[0]["parse_seconds"] = time.perf_counter() - start - sum(result["seconds"] for result in ordered)
+    return ordered
+
+
+def _load_suppression(path):
+    if not path:
+        return None
+    from suppression import SuppressionList
+    return SuppressionList.load(path)
+
+
+def _result(job, status, seconds, message, parse_seconds=0.0):
+    return {"job_id": job["job_id"], "status": status, "seconds": seconds, "parse_seconds": parse_seconds, "message": message}
+
+
+def run_manifest(manifest_path, workers=None):
+    """
+    Runs every job of a manifest, respecting dependencies and running independent tasks concurrently.
+
+    Parameters:
+    manifest_path (str): Path to the JSONL manifest.
+    workers (int, optional): Maximum number of worker processes. Defaults to the CPU count.
+
+    Returns:
+    list of dict: One result per job, see run_task. Jobs whose dependencies failed are reported as 'skipped'.
+
+    Use Case:
+    >>> results = run_manifest('./jobs.jsonl', workers=4)
+    """
+    jobs = load_manifest(manifest_path)
+    tasks, dependencies = build_tasks(jobs)
+
+    results = {}
+    failed_tasks = set()
+    done_tasks = set()
+    pending = set(tasks)
+    running = {}
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while pending or running:
+            for task_id in sorted(pending):
+                waits_for = dependencies[task_id]
+                if waits_for & failed_tasks:
+                    pending.discard(task_id)
+                    failed_tasks.add(task_id)
+                    for job in tasks[task_id]:
+                        results[job["job_id"]] = _result(job, "skipped", 0.0, "A dependency failed")
+                elif waits_for <= done_tasks:
+                    pending.discard(task_id)
+                    running[executor.submit(run_task, tasks[task_id])] = task_id
+
+            if not running:
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                task_id = running.pop(future)
+                try:
+                    task_results = future.result()
+                except Exception as e:
+                    task_results = [_result(job, "failed", 0.0, str(e)) for job in tasks[task_id]]
+
+                for result in task_results:
+                    results[result["job_id"]] = result
+                if any(result["status"] != "ok" for result in task_results):
+                    failed_tasks.add(task_id)
+                else:
+                    done_tasks.add(task_id)
+
+    ordered = [results[job["job_id"]] for job in jobs]
+    print_report(ordered, time.perf_counter() - start)
+    return ordered
+
+
+def print_report(results, wall_seconds):
+    """
+    Prints per job timings and the total wall time of a batch run.
+    """
+    print(f"{'job_id':<32} {'status':<8} {'shared_s':>8} {'job_s':>8}  message")
+    for result in results:
+        print(f"{result['job_id']:<32} {result['status']:<8} {result['parse_seconds']:>8.2f} {result['seconds']:>8.2f}  {result['message']}")
+    busy_seconds = sum(result["seconds"] + result["parse_seconds"] for result in results)
+    print(f"Finished {len(results)} jobs in {wall_seconds:.2f}s wall time ({busy_seconds:.2f}s of job time).")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a JSONL manifest of list jobs.")
+    parser.add_argument("manifest", help="Path to the JSONL job manifest")
+    parser.add_argument("--workers", type=int, default=None, help="Maximum number of worker processes")
+    args = parser.parse_args()
+
+    # Exit with 1 when a job failed or was skipped, so cron sees the failure
+    results = run_manifest(args.manifest, workers=args.workers)
+    raise SystemExit(0 if all(result["status"] == "ok" for result in results) else 1)
@@ -0,0 +1,276 @@
+'''
+canonical is a module that turns raw email addresses and phone numbers into canonical forms and compact
+keys, so that '(555) 123-4567' and '5551234567' or 'John+ads@Mail.com ' and 'john@mail.com' are
+recognised as the same contact by the dedup, suppression and phone equality checks.
+
+Every function normalizes each distinct raw value once and broadcasts the result back to the column.
+
+'''
+#>>>>>>>>>>>>> Import required Packages >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+import hashlib
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_COUNTRY_CODE = "1"
+
+# Fixed siphash key so that email keys are stable between runs
+EMAIL_HASH_KEY = "adlistcanonical0"
+
+_MISSING_VALUES = ["", "-", "nan", "none", "null"]
+_PLUS_TAG_PATTERN = re.compile(r"^([^@+]+)\+[^@]*@")
+# Same digits as the r"\D" replacement of canonical_phones
+_NON_DIGIT_PATTERN = re.compile(r"\D")
+
+
+#>>>>>>>>>> - Define column canonicalization - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+def _per_distinct(values, normalize):
+    # Apply a vectorized normalizer to the distinct values of a column only, then broadcast back
+    values = pd.Series(values)
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    normalized = normalize(pd.Series(uniques, dtype="object").astype("string"))
+
+    result = pd.Series(pd.NA, index=values.index, dtype="string")
+    present = codes >= 0
+    result[present] = normalized.to_numpy()[codes[present]]
+    return result
+
+
+def canonical_emails(values, strip_plus_tags=True):
+    """
+    Canonicalizes a column of email addresses: trims spaces, lower cases and optionally removes
+    '+tag' suffixes from the local part.
+
+    Parameters:
+    values (pd.Series or list): Raw email values.
+    strip_plus_tags (bool): If True, 'john+ads@mail.com' becomes 'john@mail.com'.
+
+    Returns:
+    pd.Series: Canonical emails aligned with 'values', with '-' and empty values set to NA.
+
+    Use Case:
+    >>> canonical_emails(pd.Series([' John+ads@Mail.com', '-']))
+    0    john@mail.com
+    1             <NA>
+    """
+    def normalize(emails):
+        emails = emails.str.strip().str.lower()
+        if strip_plus_tags:
+            emails = emails.str.replace(_PLUS_TAG_PATTERN, r"\1@", regex=True)
+        return emails.mask(emails.isin(_MISSING_VALUES) | ~emails.str.contains("@", regex=False, na=False))
+
+    return _per_distinct(values, normalize)
+
+
+def canonical_phones(values, country_code=DEFAULT_COUNTRY_CODE):
+    """
+    Canonicalizes a column of phone numbers to E.164-style digits (country code followed by the
+    national number, without the leading '+').
+
+    Parameters:
+    values (pd.Series or list): Raw phone values.
+    country_code (str): Country code added to 10 digit national numbers. Defaults to '1'.
+
+    Returns:
+    pd.Series: Canonical phone digits aligned with 'values', with values that are not phone numbers set to NA.
+
+    Use Case:
+    >>> canonical_phones(pd.Series(['(555) 123-4567', '+1 555 123 4567', '-']))
+    0    15551234567
+    1    15551234567
+    2           <NA>
+    """
+    def normalize(phones):
+        digits = phones.str.replace(r"\.0$", "", regex=True).str.replace(r"\D", "", regex=True)
+        digits = digits.mask(digits.str.len() == 10, country_code + digits)
+        return digits.mask((digits.str.len() < 11) | (digits.str.len() > 15))
+
+    return _per_distinct(values, normalize)
+
+
+#>>>>>>>>>> - Define compact keys - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+def _unparsed_values(values, canonical):
+    # Trimmed raw text of the values that are present but have no canonical form, NA everywhere else
+    raw = pd.Series(values).astype("string").str.strip()
+    missing = raw.isna().to_numpy() | raw.str.lower().isin(_MISSING_VALUES).to_numpy() | canonical.notna().to_numpy()
+    return raw.mask(missing)
+
+
+def email_keys(values, strip_plus_tags=True):
+    """
+    Maps a column of emails to uint64 keys. Present values that are not email addresses are keyed on
+    their trimmed raw text, so that they are only equal to the same text. Missing values map to 0.
+
+    Returns:
+    np.ndarray: uint64 keys aligned with 'values'.
+    """
+    emails = canonical_emails(values, strip_plus_tags=strip_plus_tags)
+    keys = np.zeros(len(emails), dtype=np.uint64)
+    present = emails.notna().to_numpy()
+    if present.any():
+        keys[present] = pd.util.hash_array(emails[present].to_numpy(dtype=object), hash_key=EMAIL_HASH_KEY, categorize=True)
+
+    # Canonical emails hold an '@' and the unparsed values do not, so the two never share a text
+    unparsed = _unparsed_values(values, emails)
+    if unparsed.notna().any():
+        rows = unparsed.notna().to_numpy()
+        keys[rows] = pd.util.hash_array(unparsed[rows].to_numpy(dtype=object), hash_key=EMAIL_HASH_KEY, categorize=True)
+    return keys
+
+
+def phone_keys(values, country_code=DEFAULT_COUNTRY_CODE):
+    """
+    Maps a column of phone numbers to int64 keys holding their E.164 digits. Present values that are not
+    phone numbers get a negative key hashed from their trimmed raw text, so that they are only equal to the
+    same text. Missing values map to 0.
+
+    Returns:
+    np.ndarray: int64 keys aligned with 'values'.
+    """
+    phones = canonical_phones(values, country_code=country_code)
+    keys = pd.to_numeric(phones, errors="coerce").fillna(0).to_numpy(dtype=np.int64)
+
+    unparsed = _unparsed_values(values, phones)
+    if unparsed.notna().any():
+        rows = unparsed.notna().to_numpy()
+        hashes = pd.util.hash_array(unparsed[rows].to_numpy(dtype=object), categorize=True)
+        keys[rows] = -(hashes >> np.uint64(1)).astype(np.int64) - 1
+    return keys
+
+
+def identifier_keys(df, columns):
+    """
+    Builds a DataFrame of compact keys for identifier columns, to be used for dedup and joins in place
+    of the raw strings. Columns whose name mentions 'mail' become email keys, columns whose name mentions
+    'phone' or 'number' become phone keys, other columns are kept as they are.
+
+    Parameters:
+    df (pd.DataFrame): The DataFrame holding the identifier columns.
+    columns (list of str): The identifier columns.
+
+    Returns:
+    pd.DataFrame: A DataFrame with one key column per identifier column, aligned with 'df'.
+    """
+    keys = {}
+    for column in columns:
+        name = column.lower()
+        if "mail" in name:
+            keys[column] = email_keys(df[column])
+        elif "phone" in name or "number" in name:
+            keys[column] = phone_keys(df[column])
+        else:
+            keys[column] = df[column].to_numpy()
+    return pd.DataFrame(keys, index=df.index)
+
+
+#>>>>>>>>>> - Define scalar canonicalization for the row oriented scripts - >>>>>>>>>>>>>>>>>>>>>>>>
+@lru_cache(maxsize=1_000_000)
+def canonical_email(value, strip_plus_tags=True):
+    """
+    Scalar counterpart of canonical_emails, cached per distinct raw value.
+    """
+    email = (value or "").strip().lower()
+    if strip_plus_tags:
+        email = _PLUS_TAG_PATTERN.sub(r"\1@", email)
+    return email if email not in _MISSING_VALUES and "@" in email else None
+
+
+@lru_cache(maxsize=1_000_000)
+def canonical_phone(value, country_code=DEFAULT_COUNTRY_CODE):
+    """
+    Scalar counterpart of canonical_phones, cached per distinct raw value.
+    """
+    value = (value or "").removesuffix(".0")
+    digits = _NON_DIGIT_PATTERN.sub("", value)
+    if len(digits) == 10:
+        digits = country_code + digits
+    return digits if 11 <= len(digits) <= 15 else None
+
+
+@lru_cache(maxsize=100_000)
+def canonical_domain(value):
+    """
+    Canonical email domain: trimmed, lower cased, without a leading '@' or 'www.'. The domain of an email
+    address is taken after its last '@'.
+
+    Use Case:
+    >>> canonical_domain(' @Competitor.COM'), canonical_domain('john@competitor.com')
+    ('competitor.com', 'competitor.com')
+    """
+    domain = (value or "").strip().lower().rsplit("@", 1)[-1].removeprefix("www.")
+    return domain if domain not in _MISSING_VALUES and "." in domain else None
+
+
+#>>>>>>>>>> - Define bulk SHA-256 hashing of identifiers - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+# Below this many distinct values hashing in the current process is faster than starting a pool
+PARALLEL_HASH_THRESHOLD = 200_000
+
+
+def _sha256_batch(values):
+    # Module level so that it can be sent to worker processes
+    return [hashlib.sha256(value.encode("utf-8")).hexdigest() for value in values]
+
+
+def sha256_values(values, processes=None, chunk_size=50_000):
+    """
+    Hashes a sequence of strings with SHA-256, using a process pool for long sequences.
+
+    Parameters:
+    values (list of str): The strings to hash.
+    processes (int, optional): Number of worker processes. Defaults to the CPU count; 1 disables the pool.
+    chunk_size (int): Number of values sent to a worker at a time.
+
+    Returns:
+    list of str: Hex digests in the order of 'values'.
+    """
+    values = list(values)
+    if processes == 1 or len(values) < PARALLEL_HASH_THRESHOLD:
+        return _sha256_batch(values)
+
+    chunks = [values[start:start + chunk_size] for start in range(0, len(values), chunk_size)]
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return [digest for batch in executor.map(_sha256_batch, chunks) for digest in batch]
+
+
+def hash_identifier_columns(df, email_columns=(), phone_columns=(), processes=None):
+    """
+    Normalizes and SHA-256 hashes email and phone columns in bulk, for hashed LiveRamp uploads.
+
+    Emails are trimmed and lower cased (plus tags are kept, they are part of the mailbox). Phones are
+    reduced to their digits and, for US numbers, to the 10 digit national number. The distinct values of
+    all columns are hashed once and mapped back, missing values stay missing.
+
+    Parameters:
+    df (pd.DataFrame): The DataFrame holding the identifier columns.
+    email_columns (list of str): Email columns to hash. Columns not in 'df' are skipped.
+    phone_columns (list of str): Phone columns to hash. Columns not in 'df' are skipped.
+    processes (int, optional): Number of worker processes used for large lists.
+
+    Returns:
+    pd.DataFrame: A copy of 'df' with the identifier columns replaced by their hex SHA-256 digests.
+
+    Use Case:
+    >>> hashed_df = hash_identifier_columns(formatted_df, ['Email1', 'Email2', 'Email3'], ['PhoneNumber1', 'PhoneNumber2'])
+    """
+    email_columns = [column for column in email_columns if column in df.columns]
+    phone_columns = [column for column in phone_columns if column in df.columns]
+
+    normalized = {column: canonical_emails(df[column], strip_plus_tags=False) for column in email_columns}
+    for column in phone_columns:
+        phones = canonical_phones(df[column])
+        us_numbers = phones.str.len().eq(11) & phones.str.startswith(DEFAULT_COUNTRY_CODE)
+        normalized[column] = phones.mask(us_numbers.fillna(False), phones.str[1:])
+
+    if not normalized:
+        return df.copy()
+
+    uniques = pd.unique(pd.concat(normalized.values(), ignore_index=True).dropna().to_numpy(dtype=object))
+    digests = pd.Series(sha256_values(uniques, processes=processes), index=uniques, dtype="object")
+
+    hashed_df = df.copy()
+    for column, values in normalized.items():
+        hashed_df[column] = values.map(digests).astype("object")
+    return hashed_df
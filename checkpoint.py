@@ -0,0 +1,106 @@
+'''
+checkpoint keeps the intermediate results of a long list build in a local Parquet scratch directory,
+keyed by a run ID, so that a failed build can be rerun from its last completed stage (or, for chunked
+builds, from its last committed chunk) instead of parsing and filtering the raw export again.
+
+Each stage result is written to a temporary file and moved in place, and only then recorded as
+completed in the run's 'progress.json', so an interrupted write is never mistaken for a checkpoint.
+
+'''
+#>>>>>>>>>>>>> Import required Packages >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+import hashlib
+import json
+import os
+import shutil
+
+import pandas as pd
+
+DEFAULT_CHECKPOINT_DIRECTORY = os.environ.get("ADLIST_CHECKPOINT_DIR", ".adlist_checkpoints")
+
+
+def make_run_id(file_path, *params):
+    """
+    Derives a run ID from an input file and the build parameters. The ID changes when the file is
+    modified, so a rerun of the same build on the same file resumes, and any other build starts afresh.
+
+    Use Case:
+    >>> run_id = make_run_id('./raw_data/Adpromoter_FirstPriority.csv', 'liveramp', ['Marketing'], 'marketing_list')
+    """
+    stat = os.stat(file_path)
+    key = json.dumps([os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, params], default=str)
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+class RunCheckpoints:
+    """
+    Parquet checkpoints of the stages and input chunks of one run.
+
+    Parameters:
+    run_id (str): ID of the run, e.g. from make_run_id.
+    directory (str): Scratch directory holding one sub directory per run.
+
+    Use Case:
+    >>> checkpoints = RunCheckpoints(run_id)
+    >>> state_df = checkpoints.stage('states', lambda: filter_usa_states(get_data(file_path)))
+    >>> checkpoints.clear()        # once the build succeeded
+    """
+
+    def __init__(self, run_id, directory=DEFAULT_CHECKPOINT_DIRECTORY):
+        self.run_id = run_id
+        self.path = os.path.join(directory, run_id)
+        os.makedirs(os.path.join(self.path, "chunks"), exist_ok=True)
+
+        self.progress_path = os.path.join(self.path, "progress.json")
+        self.progress = {"stages": [], "chunks": []}
+        if os.path.exists(self.progress_path):
+            with open(self.progress_path, "r", encoding="utf-8") as progress_file:
+                self.progress = json.load(progress_file)
+
+    @property
+    def completed_stages(self):
+        return list(self.progress["stages"])
+
+    @property
+    def committed_chunks(self):
+        return sorted(self.progress["chunks"])
+
+    def _commit(self, kind, name, df, file_path):
+        temp_path = f"{file_path}.tmp"
+        df.to_parquet(temp_path)
+        os.replace(temp_path, file_path)
+
+        self.progress[kind].append(name)
+        with open(f"{self.progress_path}.tmp", "w", encoding="utf-8") as progress_file:
+            json.dump(self.progress, progress_file)
+        os.replace(f"{self.progress_path}.tmp", self.progress_path)
+
+    def stage(self, name, compute):
+        """
+        Returns the checkpointed result of stage 'name', or computes it with 'compute()' and checkpoints it.
+        """
+        file_path = os.path.join(self.path, f"{name}.parquet")
+        if name in self.progress["stages"]:
+            print(f"Resuming run '{self.run_id}' from stage '{name}'.")
+            return pd.read_parquet(file_path)
+
+        df = compute()
+        self._commit("stages", name, df, file_path)
+        return df
+
+    def chunk(self, number, compute):
+        """
+        Returns the checkpointed result of input chunk 'number', or computes it with 'compute()' and commits it.
+        """
+        file_path = os.path.join(self.path, "chunks", f"chunk_{number:06d}.parquet")
+        if number in self.progress["chunks"]:
+            return pd.read_parquet(file_path)
+
+        df = compute()
+        self._commit("chunks", number, df, file_path)
+        return df
+
+    def clear(self):
+        """
+        Deletes the checkpoints of the run, once it completed.
+        """
+        shutil.rmtree(self.path, ignore_errors=True)
@@ -0,0 +1,331 @@
+'''
+csv_index builds a row offset index over a raw CSV export so that the row count, random access to any
+row and record aligned byte ranges for parallel processing are available without re-parsing the file.
+
+The index is built by scanning a memory map of the file with NumPy, block by block, and treats newlines
+inside quoted fields as part of the field. Like csv.reader, a quote only opens a quoted field at the start
+of a field, so a stray quote inside an unquoted value ('27in" Monitor') is part of the value.
+
+The index is stored as a compact uint64 array in a cache directory ('.adlist_row_index', or the
+ADLIST_INDEX_DIR environment variable), under a name derived from the path, size and modification time of
+the CSV, so it is reused as long as the CSV is unchanged. When the cache directory cannot be written the
+index is kept in memory for the rest of the process instead.
+
+'''
+#>>>>>>>>>>>>> Import required Packages >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+import csv
+import hashlib
+import io
+import mmap
+import os
+
+import numpy as np
+
+DEFAULT_INDEX_DIRECTORY = os.environ.get("ADLIST_INDEX_DIR", ".adlist_row_index")
+DEFAULT_BLOCK_SIZE = 64 * 1024 * 1024
+
+_QUOTE = ord('"')
+_NEWLINE = ord('\n')
+_DELIMITER = ord(',')
+
+# Indexes that could not be saved, keyed by file signature, so they are built once per process
+_MEMORY_INDEXES = {}
+
+
+#>>>>>>>>>> - Define index building - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+def _scan_record_ends(buffer, block_size=DEFAULT_BLOCK_SIZE):
+    # Return the positions of the newlines that end a record. The quote parity scan is exact as long as
+    # every quote it reads as opening a quoted field does so for csv.reader too, otherwise the file has
+    # stray quotes in unquoted values and is scanned again quote by quote
+    ends = _scan_record_ends_by_parity(buffer, block_size)
+    if ends is None:
+        ends = _scan_record_ends_sequential(buffer, block_size)
+    return ends
+
+
+def _block(buffer, block_start, block_size):
+    return np.frombuffer(buffer, dtype=np.uint8, count=min(block_size, len(buffer) - block_start), offset=block_start)
+
+
+def _previous_bytes(buffer, block, block_start, positions):
+    # Byte before each position of the block, a newline before the start of the file
+    previous = block[np.maximum(positions, 1) - 1].copy()
+    if len(positions) and positions[0] == 0:
+        previous[0] = buffer[block_start - 1] if block_start else _NEWLINE
+    return previous
+
+
+def _scan_record_ends_by_parity(buffer, block_size):
+    # Newlines preceded by an even number of quotes, escaped quotes ('""') count twice and keep the parity.
+    # Returns None if a quote read as opening is not at the start of a field (after a delimiter, a
+    # newline or a closing quote), where csv.reader takes it as a literal character
+    ends = []
+    quotes_seen = 0
+    for block_start in range(0, len(buffer), block_size):
+        block = _block(buffer, block_start, block_size)
+        quotes = np.flatnonzero(block == _QUOTE)
+        newlines = np.flatnonzero(block == _NEWLINE)
+
+        opening = quotes[(quotes_seen + np.arange(len(quotes))) & 1 == 0]
+        previous = _previous_bytes(buffer, block, block_start, opening)
+        if not np.isin(previous, (_DELIMITER, _NEWLINE, _QUOTE)).all():
+            return None
+
+        parity = (quotes_seen + np.searchsorted(quotes, newlines)) & 1
+        ends.append(newlines[parity == 0].astype(np.uint64) + np.uint64(block_start))
+        quotes_seen += len(quotes)
+
+    return np.concatenate(ends) if ends else np.empty(0, dtype=np.uint64)
+
+
+def _scan_record_ends_sequential(buffer, block_size):
+    # csv.reader's quoting rules applied to the quotes and newlines of the file in order
+    ends = []
+    in_quotes = False
+    last_closing = -2
+    for block_start in range(0, len(buffer), block_size):
+        block = _block(buffer, block_start, block_size)
+        quotes = np.flatnonzero(block == _QUOTE)
+        newlines = np.flatnonzero(block == _NEWLINE)
+        previous = _previous_bytes(buffer, block, block_start, quotes)
+        field_start = dict(zip(quotes.tolist(), np.isin(previous, (_DELIMITER, _NEWLINE)).tolist()))
+
+        positions = np.concatenate([quotes, newlines])
+        for position in positions[np.argsort(positions, kind="stable")].tolist():
+            if position in field_start:
+                if in_quotes:
+                    in_quotes = False
+                    last_closing = block_start + position
+                elif field_start[position] or last_closing == block_start + position - 1:
+                    # Opens a quoted field, or is the second quote of an escaped quote
+                    in_quotes = True
+            elif not in_quotes:
+                ends.append(block_start + position)
+
+    return np.array(ends, dtype=np.uint64)
+
+
+def build_row_index(file_path, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Builds the row offset index of a CSV file by scanning a memory map of it.
+
+    Parameters:
+    file_path (str): Path to the CSV file. The first record is the header.
+    block_size (int): Number of bytes scanned at a time, bounds the memory used by the scan.
+
+    Returns:
+    CsvRowIndex: The index of the file.
+
+    Raises:
+    FileNotFoundError: If the file does not exist.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File '{file_path}' not found.")
+
+    size = os.path.getsize(file_path)
+    if size == 0:
+        return CsvRowIndex(file_path, np.zeros(1, dtype=np.uint64))
+
+    with open(file_path, "rb") as csv_file, mmap.mmap(csv_file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        ends = _scan_record_ends(buffer, block_size)
+
+    # Each record starts after the end of the previous one, the last offset is the end of the file
+    starts = ends + np.uint64(1)
+    offsets = np.concatenate([starts[starts < size], np.array([size], dtype=np.uint64)])
+    return CsvRowIndex(file_path, offsets)
+
+
+def _file_signature(file_path):
+    # Path, size and modification time of the file, the index is rebuilt when any of them changes
+    stat = os.stat(file_path)
+    return os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns
+
+
+def _index_path(file_path, directory=DEFAULT_INDEX_DIRECTORY):
+    # '<path hash>-<signature hash>.npy', the path hash finds the indexes of older versions of the file
+    path, size, mtime_ns = _file_signature(file_path)
+    path_key = hashlib.sha1(path.encode("utf-8")).hexdigest()[:16]
+    signature_key = hashlib.sha1(f"{size}:{mtime_ns}".encode("utf-8")).hexdigest()[:16]
+    return os.path.join(directory, f"{path_key}-{signature_key}.npy")
+
+
+#>>>>>>>>>> - Define row index - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+class CsvRowIndex:
+    """
+    Row offset index of a CSV file.
+
+    'offsets[i]' is the byte offset where data row i starts (the header is not a data row) and the last
+    offset is the file size, so data row i spans 'offsets[i]:offsets[i + 1]'.
+
+    Use Case:
+    >>> index = CsvRowIndex.load_or_build('./raw_data/Event-Promoter.csv')
+    >>> len(index)                 # number of data rows
+    >>> index.row(41)              # fields of data row 41
+    >>> index.shards(8)            # 8 record aligned byte ranges for parallel workers
+    """
+
+    def __init__(self, file_path, offsets):
+        self.file_path = file_path
+        self.offsets = np.asarray(offsets, dtype=np.uint64)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def save(self, directory=DEFAULT_INDEX_DIRECTORY):
+        """
+        Saves the index in 'directory' under the current signature of the CSV file, replacing the index
+        saved for an earlier version of the file. If the directory cannot be written, the index is kept
+        in memory for the rest of the process instead.
+
+        Returns:
+        bool: True if the index was saved to disk.
+        """
+        index_path = _index_path(self.file_path, directory)
+        temp_path = f"{index_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(temp_path, "wb") as index_file:
+                np.save(index_file, self.offsets)
+            os.replace(temp_path, index_path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            _MEMORY_INDEXES[_file_signature(self.file_path)] = self.offsets
+            return False
+
+        stale_prefix = os.path.basename(index_path).split("-")[0] + "-"
+        for name in os.listdir(directory):
+            if name.startswith(stale_prefix) and name.endswith(".npy") and name != os.path.basename(index_path):
+                os.remove(os.path.join(directory, name))
+        return True
+
+    @classmethod
+    def load_or_build(cls, file_path, save=True, directory=DEFAULT_INDEX_DIRECTORY):
+        """
+        Loads the saved index of a CSV file, or builds it (and saves it if 'save' is True) when there is
+        no index yet or the size or modification time of the CSV changed since it was built.
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File '{file_path}' not found.")
+
+        signature = _file_signature(file_path)
+        if signature in _MEMORY_INDEXES:
+            return cls(file_path, _MEMORY_INDEXES[signature])
+
+        index_path = _index_path(file_path, directory)
+        if os.path.exists(index_path):
+            offsets = np.load(index_path, mmap_mode="r")
+            if len(offsets) and int(offsets[-1]) == os.path.getsize(file_path):
+                return cls(file_path, offsets)
+
+        index = build_row_index(file_path)
+        if save:
+            index.save(directory)
+        return index
+
+    @property
+    def header_end(self):
+        # Byte offset where the first data row starts
+        return int(self.offsets[0])
+
+    def header(self, encoding="utf-8-sig"):
+        """
+        Returns the column names of the file.
+        """
+        with open(self.file_path, "rb") as csv_file:
+            raw_header = csv_file.read(self.header_end)
+        return next(csv.reader(io.StringIO(raw_header.decode(encoding))), [])
+
+    def row_bytes(self, row_number):
+        """
+        Returns the raw bytes of data row 'row_number', including its line terminator.
+
+        Raises:
+        IndexError: If the row does not exist.
+        """
+        if not 0 <= row_number < len(self):
+            raise IndexError(f"Row {row_number} out of range, the file has {len(self)} rows")
+
+        start, end = int(self.offsets[row_number]), int(self.offsets[row_number + 1])
+        with open(self.file_path, "rb") as csv_file:
+            csv_file.seek(start)
+            return csv_file.read(end - start)
+
+    def row(self, row_number, encoding="utf-8"):
+        """
+        Returns the fields of data row 'row_number' as a list of strings.
+        """
+        return next(csv.reader(io.StringIO(self.row_bytes(row_number).decode(encoding))), [])
+
+    def row_dict(self, row_number, encoding="utf-8"):
+        """
+        Returns data row 'row_number' as a dict keyed by the header, like csv.DictReader does.
+        """
+        return dict(zip(self.header(), self.row(row_number, encoding)))
+
+    def shards(self, num_shards):
+        """
+        Splits the data rows into up to 'num_shards' byte ranges of similar size that start and end on
+        record boundaries.
+
+        Returns:
+        list of tuple: (start_byte, end_byte) pairs covering every data row exactly once.
+        """
+        if len(self) == 0:
+            return []
+
+        first, last = int(self.offsets[0]), int(self.offsets[-1])
+        targets = np.linspace(first, last, num=max(int(num_shards), 1) + 1)
+        boundaries = self.offsets[np.searchsorted(self.offsets, targets[1:-1].astype(np.uint64))]
+        boundaries = np.unique(np.concatenate([[first], boundaries, [last]]).astype(np.uint64))
+        return [(int(start), int(end)) for start, end in zip(boundaries[:-1], boundaries[1:])]
+
+    def rows_in(self, byte_range):
+        """
+        Returns the number of data rows starting in 'byte_range', one of shards or row_chunks.
+        """
+        start, end = byte_range
+        return int(np.searchsorted(self.offsets[:-1], end) - np.searchsorted(self.offsets[:-1], start))
+
+    def row_chunks(self, chunk_rows):
+        """
+        Splits the data rows into byte ranges of 'chunk_rows' rows each (the last one may be shorter).
+        Unlike shards, chunk i always covers the same rows of an unchanged file, so chunks can be
+        checkpointed and resumed.
+
+        Returns:
+        list of tuple: (start_byte, end_byte) pairs covering every data row exactly once.
+        """
+        boundaries = np.append(self.offsets[:-1][::max(int(chunk_rows), 1)], self.offsets[-1])
+        return [(int(start), int(end)) for start, end in zip(boundaries[:-1], boundaries[1:])]
+
+
+def count_rows(file_path):
+    """
+    Returns the number of data rows of a CSV file (the header excluded), using its saved row index.
+
+    Use Case:
+    >>> num_rows_before = count_rows('docs/Adpromoter_FirstPriority.csv')
+    """
+    return len(CsvRowIndex.load_or_build(file_path))
+
+
+def read_byte_range(file_path, byte_range, index=None):
+    """
+    Returns the header followed by the records in 'byte_range' as an in-memory CSV buffer, ready to be
+    handed to pandas.read_csv or csv.reader.
+
+    Parameters:
+    file_path (str): Path to the CSV file.
+    byte_range (tuple): (start_byte, end_byte), usually one of CsvRowIndex.shards.
+    index (CsvRowIndex, optional): Index of the file, loaded or built when not given.
+
+    Returns:
+    io.BytesIO: The header and the selected records.
+    """
+    index = index or CsvRowIndex.load_or_build(file_path)
+    start, end = byte_range
+    with open(file_path, "rb") as csv_file:
+        header = csv_file.read(index.header_end)
+        csv_file.seek(start)
+        return io.BytesIO(header + csv_file.read(end - start))
@@ -1,6 +1,9 @@
 import os
 import glob
-import pandas as pd
+from functools import lru_cache
+
+# pandas is imported inside the functions that need it, so that the row scripts, which only
+# use the row validators, do not pay for importing it
 
 def validate_email(value):
     # po_box_variations = ['PO Box', 'P.O. Box', 'P O Box', 'Post Office Box', 'Post Office']
@@ -24,18 +27,24 @@ def programmatic_email_filter(value):
     return None
 
 
-def validate_address(*address_fields):
-    # po_box_variations = ['PO Box', 'P.O. Box', 'P O Box', 'Post Office Box', 'Post Office']
-    po_box_variations = [
-        'PO Box', 'P.O. Box', 'P.O Box', 'P.OBOX', 'P O Box', 'Post Office Box', 'po box', 'Po Box', 'PO. Box', 'Post Office', 'Box No', 'Box #', 'Mailbox', 'Mail Box', 'MB',
-        'Drawer', 'Drawer No', 'Drawer #', 'Private Bag', 'PMB', 'Postal Bag',
-        'Parcel Locker', 'Locker No', 'Locker #', 'Community Mail Center',
-        'CMC', 'Apt #', 'Attention', 'Attn', 'Attn:', 'C/O', 'Care Of', 'CO', 'c/o'
-    ]
+PO_BOX_VARIATIONS = (
+    'PO Box', 'P.O. Box', 'P.O Box', 'P.OBOX', 'P O Box', 'Post Office Box', 'po box', 'Po Box', 'PO. Box', 'Post Office', 'Box No', 'Box #', 'Mailbox', 'Mail Box', 'MB',
+    'Drawer', 'Drawer No', 'Drawer #', 'Private Bag', 'PMB', 'Postal Bag',
+    'Parcel Locker', 'Locker No', 'Locker #', 'Community Mail Center',
+    'CMC', 'Apt #', 'Attention', 'Attn', 'Attn:', 'C/O', 'Care Of', 'CO', 'c/o'
+)
+
+
+# Company addresses repeat on every employee row, so each distinct address is checked only once per run
+@lru_cache(maxsize=1_000_000)
+def is_valid_address(address):
+    return bool(address) and address != "-" and not any(variation in address for variation in PO_BOX_VARIATIONS)
 
 
+def validate_address(*address_fields):
+    # po_box_variations = ['PO Box', 'P.O. Box', 'P O Box', 'Post Office Box', 'Post Office']
     for address in address_fields:
-        if address and not any(variation in address for variation in po_box_variations) and address != "-" and address != "":
+        if is_valid_address(address):
             return address
 
     return None
@@ -61,6 +70,10 @@ def check_primary_industry(primary_industry_field):
     return False
 
 
+# Row validators called once or more per row by the row scripts (main.py, main2.py, ...), sampled by metrics.instrument_validators
+ROW_VALIDATORS = ('validate_email', 'validate_address', 'check_primary_industry')
+
+
 # def merge_csv_files(folder_path, output_file):
 #     # Check if the output directory exists, create it if not
 #     if not os.path.exists(folder_path):
@@ -118,6 +131,8 @@ def merge_csv_files2(folder_path, output_file, columns_to_check=None):
     and save the result to 'data/merged_output.csv', use:
     >>> merge_csv_files('data/csv_files', 'data/merged_output.csv', ['Email', 'UserID'])
     """
+    import pandas as pd
+
     if not os.path.exists(folder_path):
         raise FileNotFoundError(f"Folder '{folder_path}' not found.")
 
@@ -163,6 +178,8 @@ def split_columns_by_separator(df, columns, separator=","):
 
     Each new column is named based on the original column name with a suffix attached.
     """
+    import pandas as pd
+
     # Ensure columns is a list, even if a single column name is provided
     if isinstance(columns, str):
         columns = [columns]
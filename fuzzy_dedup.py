@@ -0,0 +1,357 @@
+'''
+fuzzy_dedup finds near-duplicate contacts in a merged list, e.g. the same person shipped twice as
+'Jon Smith, 12 Main St' and 'John Smith, 12 Main Street'.
+
+Rows are only compared with rows sharing a blocking key (ZIP code + soundex of the last name, or email
+domain + first initial), and within a block each row is compared with its next neighbours once the block
+is sorted (sorted neighbourhood), so the number of comparisons grows linearly with the number of rows
+instead of with all pairs. Records are compared on MinHash signatures of the character 3-grams of their
+name and address, computed with NumPy for all rows at once, and pairs above the similarity threshold are
+grouped into clusters of duplicates.
+
+First names and street words are normalized before the 3-grams are taken ('jon' -> 'john', 'street'
+-> 'st'): the raw pair above only shares 62% of its 3-grams, the normalized records are identical.
+
+'''
+#>>>>>>>>>>>>> Import required Packages >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+import numpy as np
+import pandas as pd
+
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_WINDOW = 10
+DEFAULT_NUM_PERM = 64
+
+# Number of candidate pairs compared at a time, bounds the memory used by the comparison
+PAIR_CHUNK_SIZE = 500_000
+
+# Records are compared on their first bytes only, which is plenty for a name and a street address
+RECORD_WIDTH = 64
+
+# Columns of the LiveRamp list format
+DEFAULT_COLUMNS = {
+    'first_name': 'First Name',
+    'last_name': 'Last Name',
+    'address': 'Street Address 1',
+    'zip_code': 'Zip Code',
+    'email': 'Email1',
+}
+
+# Variants of a first name, mapped to one form
+FIRST_NAME_VARIANTS = {
+    **dict.fromkeys(["jon", "johnny", "jonny"], "john"),
+    **dict.fromkeys(["bob", "bobby", "rob", "robbie"], "robert"),
+    **dict.fromkeys(["bill", "billy", "will", "willy"], "william"),
+    **dict.fromkeys(["jim", "jimmy", "jamie"], "james"),
+    **dict.fromkeys(["mike", "mikey"], "michael"),
+    **dict.fromkeys(["dave", "davy"], "david"),
+    **dict.fromkeys(["steve", "stephen"], "steven"),
+    **dict.fromkeys(["tom", "tommy"], "thomas"),
+    **dict.fromkeys(["chris"], "christopher"),
+    **dict.fromkeys(["dan", "danny"], "daniel"),
+    **dict.fromkeys(["joe", "joey"], "joseph"),
+    **dict.fromkeys(["matt"], "matthew"),
+    **dict.fromkeys(["nick"], "nicholas"),
+    **dict.fromkeys(["tony"], "anthony"),
+    **dict.fromkeys(["rick", "ricky", "rich", "dick"], "richard"),
+    **dict.fromkeys(["ed", "eddie", "ted"], "edward"),
+    **dict.fromkeys(["liz", "beth", "betty"], "elizabeth"),
+    **dict.fromkeys(["kate", "katie", "kathy", "catherine"], "katherine"),
+    **dict.fromkeys(["jen", "jenny"], "jennifer"),
+    **dict.fromkeys(["sue", "susie"], "susan"),
+    **dict.fromkeys(["meg", "maggie", "peggy"], "margaret"),
+}
+
+# Street words mapped to their USPS abbreviation
+STREET_ABBREVIATIONS = {
+    "street": "st", "avenue": "ave", "av": "ave", "road": "rd", "drive": "dr", "boulevard": "blvd",
+    "lane": "ln", "court": "ct", "place": "pl", "square": "sq", "terrace": "ter", "circle": "cir",
+    "highway": "hwy", "parkway": "pkwy", "trail": "trl", "suite": "ste", "apartment": "apt",
+    "floor": "fl", "building": "bldg", "north": "n", "south": "s", "east": "e", "west": "w",
+}
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys("BFPV", "1"), **dict.fromkeys("CGJKQSXZ", "2"), **dict.fromkeys("DT", "3"),
+    "L": "4", **dict.fromkeys("MN", "5"), "R": "6",
+}
+
+
+#>>>>>>>>>> - Define blocking keys - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+def soundex(name):
+    """
+    American soundex code of a name, e.g. 'Robert' and 'Rupert' are both 'R163'. Returns '' for values
+    without letters.
+    """
+    letters = [ch for ch in str(name).upper() if "A" <= ch <= "Z"]
+    if not letters:
+        return ""
+
+    code = letters[0]
+    previous = _SOUNDEX_CODES.get(letters[0], "")
+    for ch in letters[1:]:
+        digit = _SOUNDEX_CODES.get(ch, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        # 'H' and 'W' do not separate letters with the same code, vowels do
+        if ch not in "HW":
+            previous = digit
+    return code.ljust(4, "0")
+
+
+def _text(values):
+    # Lower cased, trimmed strings with missing values and '-' as NA
+    values = pd.Series(values).astype("string").str.strip().str.lower()
+    return values.mask(values.isin(["", "-", "nan"]))
+
+
+def _normalized_words(values, replacements):
+    # Text without punctuation whose words are replaced through 'replacements', each distinct value once
+    values = _text(values)
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    uniques = pd.Series(uniques, dtype="string").str.replace(r"[^a-z0-9 ]+", " ", regex=True)
+    normalized = [" ".join(replacements.get(word, word) for word in value.split()) for value in uniques]
+    return pd.Series(np.append(np.array(normalized, dtype=object), None)[codes], index=values.index, dtype="string")
+
+
+def _first_names(df, columns):
+    # First names with their variants mapped to one form ('jon' -> 'john')
+    return _normalized_words(df[columns['first_name']], FIRST_NAME_VARIANTS)
+
+
+def blocking_keys(df, columns=None):
+    """
+    Computes the blocking keys of each row: ZIP code + soundex of the last name, and email domain + first
+    initial. Rows missing a part of a key get NA for that key and are not blocked on it.
+
+    Parameters:
+    df (pd.DataFrame): The list.
+    columns (dict, optional): Column names, see DEFAULT_COLUMNS. Keys whose columns are missing are skipped.
+
+    Returns:
+    dict: Blocking key name -> pd.Series of keys aligned with 'df'.
+    """
+    columns = {**DEFAULT_COLUMNS, **(columns or {})}
+    available = lambda *names: all(columns[name] in df.columns for name in names)
+
+    keys = {}
+    if available('zip_code', 'last_name'):
+        zip_codes = _text(df[columns['zip_code']]).str.extract(r"^(\d{3,5})", expand=False).str.zfill(5)
+        last_names = _text(df[columns['last_name']])
+        codes, uniques = pd.factorize(last_names, use_na_sentinel=True)
+        # Soundex of each distinct last name only
+        sounds = np.append(np.array([soundex(name) for name in uniques], dtype=object), None)[codes]
+        sounds = pd.Series(sounds, index=df.index, dtype="string").replace("", pd.NA)
+        keys['zip_soundex'] = zip_codes + "|" + sounds
+
+    if available('email', 'first_name'):
+        domains = _text(df[columns['email']]).str.extract(r"@([^@\s]+)$", expand=False)
+        initials = _first_names(df, columns).str[0]
+        keys['domain_initial'] = domains + "|" + initials
+
+    return keys
+
+
+#>>>>>>>>>> - Define MinHash signatures - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+def record_strings(df, columns=None):
+    """
+    Builds the text records compared between rows: first name (see FIRST_NAME_VARIANTS), last name and
+    address (see STREET_ABBREVIATIONS), normalized.
+    """
+    columns = {**DEFAULT_COLUMNS, **(columns or {})}
+    replacements = {'first_name': FIRST_NAME_VARIANTS, 'last_name': {}, 'address': STREET_ABBREVIATIONS}
+    parts = [
+        _normalized_words(df[columns[name]], replacements[name]).fillna("")
+        for name in ('first_name', 'last_name', 'address') if columns[name] in df.columns
+    ]
+    if not parts:
+        raise ValueError(f"None of the name and address columns {columns} are in the DataFrame")
+
+    records = parts[0]
+    for part in parts[1:]:
+        records = records + " " + part
+    return records.str.replace(r"[^a-z0-9 ]+", "", regex=True).str.replace(r"\s+", " ", regex=True).str.strip()
+
+
+def first_initials(df, columns=None):
+    """
+    Codes the first initial of each first name, once its variants are mapped to one form ('bob' and
+    'robert' share 'r'), -1 when missing, or returns None without a first name column.
+    """
+    columns = {**DEFAULT_COLUMNS, **(columns or {})}
+    if columns['first_name'] not in df.columns:
+        return None
+    codes, _ = pd.factorize(_first_names(df, columns).str[0], use_na_sentinel=True)
+    return codes
+
+
+def address_numbers(df, columns=None):
+    """
+    Codes the numbers of each address ('12 Main St, Suite 4' -> '12 4'), so that neighbours such as
+    '12 Main St' and '14 Main St' are not taken for the same contact.
+
+    Returns:
+    np.ndarray or None: Integer code of the numbers of each address, -1 for addresses without numbers,
+                        or None when the list has no address column.
+    """
+    columns = {**DEFAULT_COLUMNS, **(columns or {})}
+    if columns['address'] not in df.columns:
+        return None
+
+    addresses = _text(df[columns['address']])
+    codes, uniques = pd.factorize(addresses, use_na_sentinel=True)
+    numbers = pd.Series(uniques, dtype="string").str.findall(r"\d+").str.join(" ").replace("", pd.NA)
+    number_codes, _ = pd.factorize(numbers, use_na_sentinel=True)
+    return np.append(number_codes, -1)[codes]
+
+
+def minhash_signatures(records, num_perm=DEFAULT_NUM_PERM, chunk_size=16_384, seed=0):
+    """
+    Computes MinHash signatures of the character 3-grams of each record, with NumPy, chunk by chunk.
+
+    Parameters:
+    records (pd.Series): The records, see record_strings.
+    num_perm (int): Number of hash functions. The similarity estimate has a standard error of about 1 / sqrt(num_perm).
+    chunk_size (int): Number of records hashed at a time, bounds the memory used.
+    seed (int): Seed of the hash functions, fixed so that signatures are stable between runs.
+
+    Returns:
+    np.ndarray: (n_records, num_perm) uint32 signatures. Records shorter than 3 characters get
+                all-max signatures and are never considered similar.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, np.iinfo(np.int64).max, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, np.iinfo(np.int64).max, size=num_perm, dtype=np.uint64)
+
+    encoded = np.array(records.fillna("").to_numpy(dtype=object), dtype=f"S{RECORD_WIDTH}")
+    signatures = np.full((len(encoded), num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+
+    for start in range(0, len(encoded), chunk_size):
+        chars = encoded[start:start + chunk_size].view(np.uint8).reshape(-1, RECORD_WIDTH).astype(np.uint64)
+        grams = (chars[:, :-2] << np.uint64(16)) | (chars[:, 1:-1] << np.uint64(8)) | chars[:, 2:]
+
+        # Grams running into the padding after the end of the record are replaced by the first gram of
+        # the record, which leaves the minimums unchanged without masking every hash
+        valid = chars[:, 2:] != 0
+        grams = np.where(valid, grams, grams[:, :1])
+
+        for perm in range(num_perm):
+            # Multiply-shift hashing of the 24 bit grams (the product wraps around 2**64), keeping the high 32 bits
+            signatures[start:start + chunk_size, perm] = ((grams * a[perm] + b[perm]) >> np.uint64(32)).min(axis=1)
+
+        # Records shorter than one gram are never similar to anything
+        signatures[start:start + chunk_size][~valid[:, 0]] = np.iinfo(np.uint32).max
+
+    return signatures
+
+
+#>>>>>>>>>> - Define candidate pairs and clustering - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+def candidate_pairs(keys, records, window=DEFAULT_WINDOW):
+    """
+    Pairs each row with its next 'window' rows sharing its blocking key, once rows are sorted by key and
+    record, so at most n * window pairs are produced per key.
+
+    Returns:
+    tuple of np.ndarray: (left, right) row positions of the candidate pairs.
+    """
+    present = np.flatnonzero(keys.notna().to_numpy())
+    if len(present) < 2:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    order = present[np.lexsort((records.to_numpy(dtype=object)[present].astype(str), keys.to_numpy(dtype=object)[present].astype(str)))]
+    sorted_keys = keys.to_numpy(dtype=object)[order]
+
+    left, right = [], []
+    for offset in range(1, window + 1):
+        same_block = sorted_keys[:-offset] == sorted_keys[offset:]
+        left.append(order[:-offset][same_block])
+        right.append(order[offset:][same_block])
+    return np.concatenate(left), np.concatenate(right)
+
+
+def _connected_components(num_rows, left, right):
+    # Label each row with the smallest row of its cluster, by propagating minimum labels along the pairs
+    labels = np.arange(num_rows)
+    while True:
+        pair_labels = np.minimum(labels[left], labels[right])
+        updated = labels.copy()
+        np.minimum.at(updated, left, pair_labels)
+        np.minimum.at(updated, right, pair_labels)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def find_fuzzy_duplicates(df, threshold=DEFAULT_THRESHOLD, window=DEFAULT_WINDOW, num_perm=DEFAULT_NUM_PERM, columns=None):
+    """
+    Finds clusters of near-duplicate contacts.
+
+    Parameters:
+    df (pd.DataFrame): The list, e.g. a merged LiveRamp list.
+    threshold (float): Minimum estimated Jaccard similarity of the name and address 3-grams of two rows
+                       for them to be duplicates.
+    window (int): Number of following rows of the same block each row is compared with.
+    num_perm (int): Number of MinHash functions.
+    columns (dict, optional): Column names overriding DEFAULT_COLUMNS, e.g. {'email': 'Email'}.
+
+    Returns:
+    np.ndarray: Cluster label of each row, the position of the first row of its cluster. Rows without
+                duplicates are labeled with their own position.
+
+    Use Case:
+    >>> labels = find_fuzzy_duplicates(merged_df)
+    >>> merged_df[labels != np.arange(len(merged_df))]     # the rows that duplicate an earlier row
+    """
+    records = record_strings(df, columns)
+
+    pairs = [candidate_pairs(keys, records, window) for keys in blocking_keys(df, columns).values()]
+    if not pairs:
+        return np.arange(len(df))
+    left = np.concatenate([pair_left for pair_left, _ in pairs])
+    right = np.concatenate([pair_right for _, pair_right in pairs])
+    if len(left) == 0:
+        return np.arange(len(df))
+
+    # Pairs found through both blocking keys are compared once (sorted, as hashing millions of ids is slower)
+    pair_ids = np.sort(np.minimum(left, right).astype(np.int64) * len(df) + np.maximum(left, right))
+    pair_ids = pair_ids[np.concatenate(([True], pair_ids[1:] != pair_ids[:-1]))]
+    left, right = pair_ids // len(df), pair_ids % len(df)
+
+    # Signatures are only computed for the rows that have a candidate pair
+    in_pair = np.zeros(len(df), dtype=bool)
+    in_pair[left] = True
+    in_pair[right] = True
+    signatures = minhash_signatures(records[in_pair], num_perm=num_perm)
+    signature_row = np.cumsum(in_pair) - 1
+    left_signatures, right_signatures = signature_row[left], signature_row[right]
+
+    duplicates = np.zeros(len(left), dtype=bool)
+    for start in range(0, len(left), PAIR_CHUNK_SIZE):
+        chunk = slice(start, start + PAIR_CHUNK_SIZE)
+        matches = (signatures[left_signatures[chunk]] == signatures[right_signatures[chunk]]).sum(axis=1)
+        duplicates[chunk] = matches >= threshold * num_perm
+
+    # Records too short to have a signature are never duplicates
+    has_signature = signatures[:, 0] != np.iinfo(np.uint32).max
+    duplicates &= has_signature[left_signatures] & has_signature[right_signatures]
+
+    # Neither are people with different first initials or addresses with different house or suite
+    # numbers, however similar the rest of the text is
+    for codes in (first_initials(df, columns), address_numbers(df, columns)):
+        if codes is not None:
+            duplicates &= (codes[left] == codes[right]) | (codes[left] < 0) | (codes[right] < 0)
+
+    return _connected_components(len(df), left[duplicates], right[duplicates])
+
+
+def drop_fuzzy_duplicates(df, **kwargs):
+    """
+    Drops near-duplicate contacts, keeping the first row of each cluster. See find_fuzzy_duplicates for
+    the parameters.
+
+    Returns:
+    pd.DataFrame: 'df' without the rows duplicating an earlier row.
+    """
+    labels = find_fuzzy_duplicates(df, **kwargs)
+    return df[labels == np.arange(len(df))]
@@ -0,0 +1,344 @@
+'''
+list_service is a long-running local list builder. Raw exports are parsed once and kept in memory with
+the stages every list shares (USA state filter, address validation, phone availability, email
+resolution), so a list for another set of target industries only applies its industry mask and its
+formatter, as build_lists_from_raw does within one call.
+
+Datasets live in a least-recently-used cache bounded in bytes. An entry is reloaded when the size or
+modification time of its file changed, and the least recently used entries are evicted when the cache
+grows beyond its budget.
+
+Requests and responses are JSON over HTTP, on a local TCP port or a Unix socket:
+
+    POST /build   {"input": "./raw_data/Adpromoter_FirstPriority.csv", "list_type": "liveramp",
+                   "target_industries": ["Marketing"], "output": "marketing_liveramp_list"}
+                  -> {"status": "ok", "rows": 1234, "cached": true, "seconds": 0.08, "file": "..."}
+                  Without "output" the list itself is returned as text/csv. Optional keys: "hashed",
+                  "directory", "engine" and "compression" (see save_df_to_csv).
+    GET  /cache   -> the cached datasets and their sizes
+    POST /evict   {"input": "..."} drops one dataset, {} drops them all
+    GET  /health  -> {"status": "ok"}
+
+Usage:
+    python list_service.py --port 8765 --max-bytes 4000000000
+    python list_service.py --socket /tmp/adlist.sock --address-cache .adlist_cache/address_validity.sqlite
+    curl -s localhost:8765/build -d '{"input": "raw.csv", "list_type": "email", "target_industries": ["Marketing"]}'
+
+'''
+#>>>>>>>>>>>>> Import required Packages >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+import argparse
+import json
+import os
+import socketserver
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from Adfunctions import (CSV_COMPRESSION_EXTENSIONS, _industry_mask, _list_base, _list_frame_from_base, _read_for_schemas,
+                         filter_usa_states, save_df_to_csv)
+
+LIST_TYPES = ("liveramp", "email")
+
+DEFAULT_PORT = 8765
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+
+#>>>>>>>>>> - Define the dataset cache - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+def _frame_bytes(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class PreparedExport:
+    """
+    One parsed raw export and the list bases derived from it. The base of a list type is computed on
+    first use and shared by every later list of that type.
+    """
+
+    def __init__(self, file_path, signature, state_df, address_cache=None):
+        self.file_path = file_path
+        self.signature = signature
+        self.state_df = state_df
+        self.address_cache = address_cache
+        self.bases = {}
+        self.industries = {}
+        self.hits = 0
+        self.nbytes = _frame_bytes(state_df)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, file_path, signature, address_cache=None):
+        # Only the columns of the list types served are parsed and cached
+        return cls(file_path, signature, filter_usa_states(_read_for_schemas(file_path, None, *LIST_TYPES)), address_cache)
+
+    def base(self, list_type):
+        """
+        Returns the base rows of 'list_type' and the factorized 'PRIMARY_INDUSTRY' column of those rows.
+        """
+        with self._lock:
+            if list_type not in self.bases:
+                base = _list_base(self.state_df, list_type, self.address_cache)
+                self.bases[list_type] = base
+                self.industries[list_type] = pd.factorize(base['PRIMARY_INDUSTRY'], use_na_sentinel=True)
+                self.nbytes += _frame_bytes(base)
+            return self.bases[list_type], self.industries[list_type]
+
+    def list_frame(self, list_type, target_industries, suppression=None):
+        """
+        Returns the formatted list of 'list_type' for 'target_industries'.
+        """
+        base, (codes, categories) = self.base(list_type)
+        return _list_frame_from_base(base[_industry_mask(codes, pd.Index(categories), target_industries)], list_type,
+                                     suppression)
+
+
+class DatasetCache:
+    """
+    Least-recently-used cache of PreparedExport entries, bounded by the memory of their frames.
+
+    Parameters:
+    max_bytes (int): Memory budget of the cached frames. The most recently used entry is always kept,
+                     even when it alone exceeds the budget.
+    address_cache (AddressValidationCache, optional): Persistent cache of address validation results,
+                                                      shared by the request threads.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, address_cache=None):
+        self.max_bytes = max_bytes
+        self.address_cache = address_cache
+        self._entries = OrderedDict()
+        self._loading = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _signature(file_path):
+        stat = os.stat(file_path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def get(self, file_path):
+        """
+        Returns the PreparedExport of 'file_path' and whether it was already cached. The file is parsed
+        again when it changed since it was cached.
+
+        Raises:
+        FileNotFoundError: If the file does not exist.
+        """
+        key = os.path.abspath(file_path)
+        if not os.path.exists(key):
+            raise FileNotFoundError(f"File '{file_path}' not found.")
+
+        while True:
+            signature = self._signature(key)
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry.signature == signature:
+                    self._entries.move_to_end(key)
+                    entry.hits += 1
+                    return entry, True
+                self._entries.pop(key, None)
+
+                # One thread parses a file, the others asking for it wait for that parse
+                loading = self._loading.get(key)
+                if loading is None:
+                    loading = self._loading[key] = threading.Event()
+                    break
+            loading.wait()
+
+        try:
+            entry = PreparedExport.load(key, signature, self.address_cache)
+            with self._lock:
+                self._entries[key] = entry
+                self._evict()
+            return entry, False
+        finally:
+            with self._lock:
+                self._loading.pop(key).set()
+
+    def _evict(self):
+        # Drop least recently used entries until the cache fits its budget (caller holds the lock)
+        while len(self._entries) > 1 and self.nbytes > self.max_bytes:
+            self._entries.popitem(last=False)
+
+    def refresh(self):
+        """
+        Re-applies the memory budget after entries grew (a list base was added to one of them).
+        """
+        with self._lock:
+            self._evict()
+
+    def evict(self, file_path=None):
+        """
+        Drops the entry of 'file_path', or every entry when no path is given. Returns the number dropped.
+        """
+        with self._lock:
+            if file_path is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+                return dropped
+            return int(self._entries.pop(os.path.abspath(file_path), None) is not None)
+
+    @property
+    def nbytes(self):
+        return sum(entry.nbytes for entry in self._entries.values())
+
+    def stats(self):
+        with self._lock:
+            return {
+                "max_bytes": self.max_bytes,
+                "bytes": self.nbytes,
+                "entries": [
+                    {"input": key, "bytes": entry.nbytes, "hits": entry.hits, "list_types": sorted(entry.bases)}
+                    for key, entry in self._entries.items()
+                ],
+            }
+
+
+#>>>>>>>>>> - Define list builds - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+def build_list(cache, request, suppression=None):
+    """
+    Builds one list from a cached dataset.
+
+    Parameters:
+    cache (DatasetCache): The dataset cache.
+    request (dict): 'input', 'list_type' ('liveramp' or 'email'), 'target_industries' and optionally
+                    'output', 'hashed', 'directory', 'engine' and 'compression'.
+    suppression (SuppressionList, optional): Suppression list applied to the list.
+
+    Returns:
+    tuple: (summary dict, formatted list DataFrame). The list is saved when the request has an 'output';
+           if it could not be written the summary has status 'failed' and the error message.
+
+    Raises:
+    ValueError: If the request is missing a key or has an unknown list type.
+    FileNotFoundError: If the input file does not exist.
+    """
+    missing = [key for key in ("input", "list_type", "target_industries") if key not in request]
+    if missing:
+        raise ValueError(f"Request is missing {missing}")
+    if request["list_type"] not in LIST_TYPES:
+        raise ValueError(f"Unknown list_type '{request['list_type']}', expected one of {list(LIST_TYPES)}")
+    if request.get("compression") not in CSV_COMPRESSION_EXTENSIONS:
+        raise ValueError(f"Unsupported compression '{request.get('compression')}'")
+
+    start = time.perf_counter()
+    entry, cached = cache.get(request["input"])
+    list_df = entry.list_frame(request["list_type"], request["target_industries"], suppression)
+    cache.refresh()
+
+    summary = {"status": "ok", "rows": len(list_df), "cached": cached}
+    if request.get("output"):
+        message = save_df_to_csv(list_df, request["output"],
+                                 hashed=request.get("hashed", False) and request["list_type"] == "liveramp",
+                                 directory=request.get("directory"), engine=request.get("engine", "pandas"),
+                                 compression=request.get("compression"))
+        summary["output"] = request["output"]
+        if message:
+            summary.update(status="failed", message=message)
+    summary["seconds"] = round(time.perf_counter() - start, 4)
+    return summary, list_df
+
+
+#>>>>>>>>>> - Define the HTTP service - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+class ListRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON request handler of the list service; the cache is 'self.server.cache'.
+    """
+
+    def _send(self, status, body, content_type="application/json"):
+        data = body.encode("utf-8") if isinstance(body, str) else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if not isinstance(request, dict):
+            raise ValueError("Request body must be a JSON object")
+        return request
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, {"status": "ok"})
+        elif self.path == "/cache":
+            self._send(200, self.server.cache.stats())
+        else:
+            self._send(404, {"status": "error", "message": f"Unknown path '{self.path}'"})
+
+    def do_POST(self):
+        try:
+            request = self._read_json()
+            if self.path == "/build":
+                summary, list_df = build_list(self.server.cache, request, self.server.suppression)
+                if "output" in summary:
+                    self._send(200 if summary["status"] == "ok" else 500, summary)
+                else:
+                    self._send(200, list_df.to_csv(index=False), content_type="text/csv")
+            elif self.path == "/evict":
+                self._send(200, {"status": "ok", "evicted": self.server.cache.evict(request.get("input"))})
+            else:
+                self._send(404, {"status": "error", "message": f"Unknown path '{self.path}'"})
+        except (ValueError, KeyError, FileNotFoundError) as e:
+            self._send(400, {"status": "error", "message": str(e)})
+        except Exception as e:
+            self._send(500, {"status": "error", "message": f"An error occurred: {str(e)}"})
+
+    def address_string(self):
+        # Unix socket clients have no address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(cache, port=DEFAULT_PORT, host="127.0.0.1", socket_path=None, suppression=None):
+    """
+    Returns the list service bound to 'host:port', or to the Unix socket 'socket_path' when given.
+    Call serve_forever() on it to serve requests.
+    """
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = ThreadingUnixHTTPServer(socket_path, ListRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), ListRequestHandler)
+    server.cache = cache
+    server.suppression = suppression
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve list builds from a warm in-memory dataset cache.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port to listen on")
+    parser.add_argument("--socket", default=None, help="Listen on this Unix socket instead of TCP")
+    parser.add_argument("--max-bytes", type=int, default=DEFAULT_MAX_BYTES, help="Memory budget of the dataset cache")
+    parser.add_argument("--suppression", default=None, help="Saved suppression list applied to every list")
+    parser.add_argument("--address-cache", default=None, help="SQLite file of the persistent address validation cache")
+    args = parser.parse_args()
+
+    suppression = None
+    if args.suppression:
+        from suppression import SuppressionList
+        suppression = SuppressionList.load(args.suppression)
+
+    address_cache = None
+    if args.address_cache:
+        from address_cache import AddressValidationCache
+        address_cache = AddressValidationCache(args.address_cache)
+
+    server = make_server(DatasetCache(args.max_bytes, address_cache), args.port, args.host, args.socket, suppression)
+    print(f"Serving lists on {args.socket or f'{args.host}:{args.port}'}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if address_cache is not None:
+            address_cache.close()
@@ -1,92 +1,118 @@
+import argparse
 import csv
+import time
 import functions as fc
+import metrics
+import row_parallel
+from csv_index import count_rows
+from schema import read_header, require_columns
 import os
-def filter_us_states(csv_file_path, output_file_path):
-    us_territory_codes = ['AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA', 'HI', 'ID', 'IL', 'IN', 'IA', 'KS', 'KY', 'LA', 'ME', 'MD', 'MA', 'MI', 'MN', 'MS', 'MO', 'MT', 'NE', 'NV', 'NH', 'NJ', 'NM', 'NY', 'NC', 'ND', 'OH', 'OK', 'OR', 'PA', 'RI', 'SC', 'SD', 'TN', 'TX', 'UT', 'VT', 'VA', 'WA', 'WV', 'WI', 'WY', 'DC', 'PR', 'GU', 'VI', 'AS', 'MP']
+# States and territories a row must be in
+US_TERRITORY_CODES = ['AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA', 'HI', 'ID', 'IL', 'IN', 'IA', 'KS', 'KY', 'LA', 'ME', 'MD', 'MA', 'MI', 'MN', 'MS', 'MO', 'MT', 'NE', 'NV', 'NH', 'NJ', 'NM', 'NY', 'NC', 'ND', 'OH', 'OK', 'OR', 'PA', 'RI', 'SC', 'SD', 'TN', 'TX', 'UT', 'VT', 'VA', 'WA', 'WV', 'WI', 'WY', 'DC', 'PR', 'GU', 'VI', 'AS', 'MP']
+
+# Columns of the output file; output records are tuples in this order
+OUTPUT_FIELDNAMES = [
+    'Client Customer ID', 'First Name', 'Last Name', 'Street Address 1', 'Street Address 2',
+    'City', 'State', 'Zip Code', 'Zip Code Plus 4', 'Email1', 'Email2', 'Email3',
+    'PhoneNumber1', 'PhoneNumber2'
+]
+
+# Row fields checked against the suppression list
+SUPPRESSION_EMAIL_FIELDS = ['BUSINESS_EMAIL', 'PERSONAL_EMAIL', 'PROGRAMMATIC_BUSINESS_EMAILS']
+SUPPRESSION_PHONE_FIELDS = ['DIRECT_NUMBER', 'MOBILE_PHONE']
+
+
+def row_filter(header):
+    """
+    Builds the filter of this script for csv.reader rows with 'header': it returns the output record of a
+    row, without its 'Client Customer ID', or None when the row is dropped.
+    """
+    first_name, last_name = header.index('FIRST_NAME'), header.index('LAST_NAME')
+    state = header.index('PERSONAL_STATE')
+    # The second address lines are optional, a missing one reads as '' (None position)
+    address_pairs = [(header.index(address), header.index(address_2) if address_2 in header else None)
+                     for address, address_2 in (('PERSONAL_ADDRESS', 'PERSONAL_ADDRESS_2'),
+                                                ('PROFESSIONAL_ADDRESS', 'PROFESSIONAL_ADDRESS_2'),
+                                                ('COMPANY_ADDRESS', 'COMPANY_ADDRESS_2'))]
+    primary_industry = header.index('PRIMARY_INDUSTRY')
+    city, zip_code, zip_4 = header.index('PERSONAL_CITY'), header.index('PERSONAL_ZIP'), header.index('PERSONAL_ZIP4')
+    email_1, email_2, email_3 = (header.index(column) for column in ('PERSONAL_EMAIL', 'BUSINESS_EMAIL', 'BUSINESS_EMAIL'))
+    phone_1, phone_2 = header.index('DIRECT_NUMBER'), header.index('MOBILE_PHONE')
+    us_territory_codes = set(US_TERRITORY_CODES)
+
+    def output(row):
+        state_column = row[state]
+        if state_column not in us_territory_codes:
+            return None
+        valid_address = None
+        for address, address_2 in address_pairs:
+            valid_address = fc.validate_address(row[address], row[address_2] if address_2 is not None else '')
+            if valid_address:
+                break
+        if not valid_address or not fc.check_primary_industry(row[primary_industry]):
+            return None
+        return (row[first_name], row[last_name], valid_address, valid_address, row[city], state_column,
+                row[zip_code], row[zip_4], row[email_1], row[email_2], row[email_3], row[phone_1], row[phone_2])
+
+    return output
+
+
+def filter_us_states(csv_file_path, output_file_path, suppression=None, raw_output_path='output/raw.csv', workers=1):
+    # Time the run and sample the row validators when metrics are on (see metrics.py)
+    start_time = time.perf_counter()
+    metrics.instrument_validators(fc, fc.ROW_VALIDATORS)
+
+    if workers > 1:
+        # Filter pieces of the file on several processes with row_filter, then number and join them
+        require_columns(read_header(csv_file_path), 'rows_liveramp_industry', f"File '{csv_file_path}'")
+        num_rows_before = count_rows(csv_file_path)
+        print(f'Number of rows before processing: {num_rows_before}')
+        num_rows_after = row_parallel.filter_rows(
+            csv_file_path, output_file_path, raw_output_path, OUTPUT_FIELDNAMES, row_filter, workers=workers,
+            suppression=suppression, email_fields=SUPPRESSION_EMAIL_FIELDS, phone_fields=SUPPRESSION_PHONE_FIELDS
+        )
+        print(f'Number of rows after processing: {num_rows_after}')
+        metrics.record_stage('main2.filter_us_states', time.perf_counter() - start_time, num_rows_before, num_rows_after)
+        return
 
+    with open(csv_file_path, 'r', encoding='utf-8') as input_file, open(output_file_path, 'w', newline='', encoding='utf-8') as output_file, open(raw_output_path, 'w', newline='', encoding='utf-8') as output_file2:
+        reader = csv.reader(input_file)
+        fieldnames2 = next(reader, None)
 
-    with open(csv_file_path, 'r', encoding='utf-8') as input_file, open(output_file_path, 'w', newline='', encoding='utf-8') as output_file, open("output/raw.csv", 'w', newline='', encoding='utf-8') as output_file2:
-        reader = csv.DictReader(input_file)
-        fieldnames2 = reader.fieldnames
+        # Fail on a missing column now instead of reading it as '' on every row
+        require_columns(fieldnames2 or [], 'rows_liveramp_industry', f"File '{csv_file_path}'")
         print(fieldnames2)
 
-        # Define the columns for the output file
-        output_fieldnames = [
-            'Client Customer ID', 'First Name', 'Last Name', 'Street Address 1', 'Street Address 2',
-            'City', 'State', 'Zip Code', 'Zip Code Plus 4', 'Email1', 'Email2', 'Email3',
-            'PhoneNumber1', 'PhoneNumber2'
-        ]
-
         # Write header to the output file
-        writer = csv.DictWriter(output_file, fieldnames=output_fieldnames)
-        writer.writeheader()
+        writer = csv.writer(output_file)
+        writer.writerow(OUTPUT_FIELDNAMES)
 
-        writer2 = csv.DictWriter(output_file2, fieldnames=fieldnames2)
-        writer2.writeheader()
+        writer2 = csv.writer(output_file2)
+        writer2.writerow(fieldnames2)
 
-        # Autoincrement for "Client Customer ID"
-        client_customer_id_counter = 1
-
-        # Track the number of rows before processing
-        num_rows_before = sum(1 for _ in reader)
+        # Track the number of rows before processing, from the saved row index instead of a full re-read
+        num_rows_before = count_rows(csv_file_path)
         print(f'Number of rows before processing: {num_rows_before}')
 
-        # Reset the file pointer to the beginning of the file
-        input_file.seek(0)
-
-        # Skip the header row
-        next(reader)
-
-        # Filter rows and write to the output file
-        for row in reader:
-            state_column = row.get('PERSONAL_STATE', '')  # Assuming the column name is 'PERSONAL_STATE'
-            
-            # Validate addresses
-            valid_address1 = fc.validate_address(row.get('PERSONAL_ADDRESS', ''), row.get('PERSONAL_ADDRESS_2', ''))
-            valid_address2 = fc.validate_address(row.get('PROFESSIONAL_ADDRESS', ''), row.get('PROFESSIONAL_ADDRESS2', ''))
-            valid_address3 = fc.validate_address(row.get('COMPANY_ADDRESS', ''), row.get('COMPANY_ADDRESS2', ''))
-
-            # Inside your loop where you process rows
-            primary_industry_column = row.get('PRIMARY_INDUSTRY', '')  # Assuming the column name is 'PRIMARY_INDUSTRY'
-
-            # Check if the primary industry is valid
-            # if check_primary_industry(primary_industry_column):
-                # Your existing code for processing and writing the row
-
-
-            # Check conditions before adding the row to the output file
-            if state_column in us_territory_codes and (valid_address1 or valid_address2 or valid_address3) and fc.check_primary_industry(primary_industry_column):
-                # Prepare the  row for the output file
-                output_row = {
-                    'Client Customer ID': client_customer_id_counter,
-                    'First Name': row.get('FIRST_NAME', ''),
-                    'Last Name': row.get('LAST_NAME', ''),
-                    'Street Address 1': valid_address1 or valid_address2 or valid_address3,
-                    'Street Address 2': valid_address1 or valid_address2 or valid_address3,
-                    'City': row.get('PERSONAL_CITY', ''),
-                    'State': state_column,
-                    'Zip Code': row.get('PERSONAL_ZIP', ''),
-                    'Zip Code Plus 4': row.get('PERSONAL_ZIP4', ''),
-                    'Email1': row.get('PERSONAL_EMAIL', ''),
-                    'Email2': row.get('BUSINESS_EMAIL', ''),
-                    'Email3': row.get('BUSINESS_EMAIL', ''),  # Assuming Email3 is from BUSINESS_EMAIL
-                    'PhoneNumber1': row.get('DIRECT_NUMBER', ''),
-                    'PhoneNumber2': row.get('MOBILE_PHONE', '')
-                }
-
-                # Write the row to the output file
-                writer.writerow(output_row)
-                writer2.writerow(row)
-
-                # Increment the "Client Customer ID" counter
-                client_customer_id_counter += 1
-
-        # Track the number of rows after processing
-        num_rows_after = client_customer_id_counter - 1  # Exclude the header row
+        # Drop opted-out contacts when a suppression list is given
+        keep_row = suppression.row_predicate(
+            email_fields=SUPPRESSION_EMAIL_FIELDS,
+            phone_fields=SUPPRESSION_PHONE_FIELDS,
+            header=fieldnames2
+        ) if suppression is not None else None
+
+        # Filter rows into output records, tuples numbered from 1 as 'Client Customer ID', and write them in batches
+        num_rows_after = row_parallel.write_filtered_rows(reader, fieldnames2, row_filter(fieldnames2), writer, writer2,
+                                                          keep_row=keep_row, first_id=1)
         print(f'Number of rows after processing: {num_rows_after}')
+        metrics.record_stage('main2.filter_us_states', time.perf_counter() - start_time, num_rows_before, num_rows_after)
 
-# Replace 'your_input_file.csv' and 'output_filtered_states.csv' with the actual paths
-input_file_path = 'docs/Adgency-7311_SecondPriority.csv'
-output_file_path = 'output/output_Adgency-7311_SecondPriority.csv'
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Filter a raw export to US states with a valid address.")
+    parser.add_argument("input", nargs="?", default='docs/Adgency-7311_SecondPriority.csv', help="Path to the raw CSV export")
+    parser.add_argument("output", nargs="?", default='output/output_Adgency-7311_SecondPriority.csv', help="Path of the filtered list")
+    parser.add_argument("--raw-output", default='output/raw.csv', help="Path of the kept raw rows")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (see row_parallel.py)")
+    args = parser.parse_args()
 
-filter_us_states(input_file_path, output_file_path)
+    filter_us_states(args.input, args.output, raw_output_path=args.raw_output, workers=args.workers)
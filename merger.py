@@ -1,8 +1,13 @@
+import argparse
+
 import functions as fc
 
-# Specify the folder path and output file name
-folder_path = 'output'
-output_file = 'final/merged_output.csv'
+if __name__ == "__main__":
+    # Specify the folder path and output file name (defaults: 'output' into 'final/merged_output.csv')
+    parser = argparse.ArgumentParser(description="Merge the CSV files of a folder into one file.")
+    parser.add_argument("folder_path", nargs="?", default='output', help="Folder of the CSV files to merge")
+    parser.add_argument("output_file", nargs="?", default='final/merged_output.csv', help="Path of the merged file")
+    args = parser.parse_args()
 
-# Call the function to merge CSV files
-fc.merge_csv_files(folder_path, output_file)
+    # Call the function to merge CSV files
+    fc.merge_csv_files(args.folder_path, args.output_file)
@@ -0,0 +1,279 @@
+'''
+metrics holds the instrumentation hooks of the list builders: rows in and out and latency of every
+Adfunctions stage, and sampled timings of the functions.py row validators used by the row scripts.
+
+Hooks are off unless a sink is set, either in code with set_sink or for cron runs with the
+'ADLIST_METRICS' environment variable:
+
+    ADLIST_METRICS=jsonl:/var/log/adlist/metrics.jsonl              one JSON line per record
+    ADLIST_METRICS=prometheus:/var/lib/node_exporter/adlist.prom    Prometheus textfile collector format
+
+With hooks off an instrumented stage costs one extra function call and the row validators are not
+wrapped at all. With hooks on, stages are timed on every call and each validator on one call every
+'DEFAULT_SAMPLE_INTERVAL' seconds.
+
+Use Case:
+>>> sink = set_sink(MemorySink())
+>>> liveramp_adlist_creator(file_path, target_industries, "marketing_list")
+>>> [record['name'] for record in sink.records]
+
+'''
+#>>>>>>>>>>>>> Import required Packages >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+
+DEFAULT_SAMPLE_INTERVAL = 0.01
+
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, float("inf"))
+VALIDATOR_BUCKETS = (1e-7, 1e-6, 1e-5, 1e-4, 1e-3, 1e-2, float("inf"))
+
+
+#>>>>>>>>>> - Define sinks - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+class MemorySink:
+    """
+    Keeps the records in a list, for tests and notebooks.
+    """
+
+    def __init__(self):
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def flush(self):
+        pass
+
+
+class JsonLinesSink:
+    """
+    Appends one JSON line per record to 'path'.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def emit(self, record):
+        line = json.dumps(record)
+        with self._lock:
+            self._file.write(line + "\n")
+            if record["kind"] == "stage":
+                self._file.flush()
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+
+
+class PrometheusTextfileSink:
+    """
+    Aggregates the records into counters and latency histograms and writes them to 'path' in the
+    Prometheus text format, for the node exporter textfile collector. The file is rewritten atomically
+    after every stage and on flush.
+    """
+
+    def __init__(self, path, prefix="adlist"):
+        self.path = path
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    def _observe(self, metric, labels, buckets, value):
+        key = (metric, labels)
+        histogram = self._histograms.setdefault(key, {"buckets": buckets, "counts": [0] * len(buckets), "sum": 0.0, "count": 0})
+        for position, bound in enumerate(buckets):
+            if value <= bound:
+                histogram["counts"][position] += 1
+        histogram["sum"] += value
+        histogram["count"] += 1
+
+    def _increment(self, metric, labels, value):
+        self._counters[(metric, labels)] = self._counters.get((metric, labels), 0) + value
+
+    def emit(self, record):
+        with self._lock:
+            labels = (("name", record["name"]),)
+            if record["kind"] == "stage":
+                self._increment("stage_calls_total", labels, 1)
+                for field in ("rows_in", "rows_out"):
+                    if record.get(field) is not None:
+                        self._increment(f"stage_{field}_total", labels, record[field])
+                self._observe("stage_seconds", labels, STAGE_BUCKETS, record["seconds"])
+            else:
+                self._observe("validator_seconds", labels, VALIDATOR_BUCKETS, record["seconds"])
+
+        if record["kind"] == "stage":
+            self.flush()
+
+    def _lines(self):
+        lines = []
+        for (metric, labels), value in sorted(self._counters.items()):
+            lines.append(f"{self.prefix}_{metric}{_labels(labels)} {value}")
+        for (metric, labels), histogram in sorted(self._histograms.items()):
+            for bound, count in zip(histogram["buckets"], histogram["counts"]):
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.prefix}_{metric}_bucket{_labels(labels + (('le', le),))} {count}")
+            lines.append(f"{self.prefix}_{metric}_sum{_labels(labels)} {histogram['sum']}")
+            lines.append(f"{self.prefix}_{metric}_count{_labels(labels)} {histogram['count']}")
+        return lines
+
+    def flush(self):
+        with self._lock:
+            lines = self._lines()
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as textfile:
+            textfile.write("\n".join(lines) + "\n")
+        os.replace(temp_path, self.path)
+
+
+def _labels(labels):
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+
+def sink_from_env(value=None):
+    """
+    Creates the sink described by 'value' (default: the 'ADLIST_METRICS' environment variable), or None.
+
+    Raises:
+    ValueError: If the value is not 'jsonl:<path>' or 'prometheus:<path>'.
+    """
+    value = os.environ.get("ADLIST_METRICS", "") if value is None else value
+    if not value:
+        return None
+
+    kind, _, path = value.partition(":")
+    if kind == "jsonl" and path:
+        return JsonLinesSink(path)
+    if kind == "prometheus" and path:
+        return PrometheusTextfileSink(path)
+    raise ValueError(f"ADLIST_METRICS must be 'jsonl:<path>' or 'prometheus:<path>', not '{value}'")
+
+
+#>>>>>>>>>> - Define hooks - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+_sink = sink_from_env()
+
+
+def set_sink(sink):
+    """
+    Sets the sink the hooks emit to, None turns the hooks off. Returns the sink.
+    """
+    global _sink
+    if _sink is not None:
+        _sink.flush()
+    _sink = sink
+    return sink
+
+
+def enabled():
+    return _sink is not None
+
+
+@atexit.register
+def flush():
+    if _sink is not None:
+        _sink.flush()
+
+
+def _row_count(value):
+    # Rows of a DataFrame (or anything with a shape), None for anything else
+    shape = getattr(value, "shape", None)
+    return int(shape[0]) if shape else None
+
+
+def record_stage(name, seconds, rows_in=None, rows_out=None):
+    """
+    Emits one stage record. Does nothing when the hooks are off.
+    """
+    if _sink is not None:
+        _sink.emit({"kind": "stage", "name": name, "ts": time.time(), "seconds": seconds, "rows_in": rows_in, "rows_out": rows_out})
+
+
+def instrument_stage(name=None):
+    """
+    Decorator timing a stage and counting its rows: 'rows_in' are the rows of its first argument and
+    'rows_out' the rows of its result, when they are DataFrames.
+
+    Use Case:
+    >>> @instrument_stage()
+    ... def filter_usa_states(df, infer_state=False): ...
+    """
+    def decorator(func):
+        stage_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _sink is None:
+                return func(*args, **kwargs)
+
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            seconds = time.perf_counter() - start
+            rows_in = _row_count(args[0]) if args else None
+            record_stage(stage_name, seconds, rows_in, _row_count(result))
+            return result
+        return wrapper
+    return decorator
+
+
+class _ValidatorSampler(threading.Thread):
+    # Every 'interval' seconds, swaps a timing wrapper in for each validator. The wrapper times the next
+    # call and swaps the validator back, so between samples the validators run unwrapped.
+
+    def __init__(self, module, names, interval):
+        super().__init__(name=f"metrics-{module.__name__}", daemon=True)
+        self.module = module
+        self.interval = interval
+        self.validators = {validator: getattr(module, validator) for validator in names}
+        self.wrappers = {validator: self._wrapper(validator, func) for validator, func in self.validators.items()}
+
+    def _wrapper(self, validator, func):
+        name = f"{self.module.__name__}.{validator}"
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            setattr(self.module, validator, func)
+            start = time.perf_counter()
+            result = func(*args)
+            seconds = time.perf_counter() - start
+            if _sink is not None:
+                _sink.emit({"kind": "validator", "name": name, "seconds": seconds})
+            return result
+        return wrapper
+
+    def run(self):
+        while _sink is not None:
+            for validator, wrapper in self.wrappers.items():
+                setattr(self.module, validator, wrapper)
+            time.sleep(self.interval)
+
+        # Hooks turned off: leave the validators unwrapped
+        for validator, func in self.validators.items():
+            setattr(self.module, validator, func)
+
+
+_samplers = {}
+
+
+def instrument_validators(module, names, interval=DEFAULT_SAMPLE_INTERVAL):
+    """
+    Samples the timings of the row validators 'names' of 'module': one call of each validator is timed
+    every 'interval' seconds. Does nothing when the hooks are off, so the validators then run unwrapped.
+
+    Use Case:
+    >>> instrument_validators(fc, fc.ROW_VALIDATORS)
+    """
+    if _sink is None:
+        return
+    sampler = _samplers.get(module.__name__)
+    if sampler is None or not sampler.is_alive():
+        sampler = _samplers[module.__name__] = _ValidatorSampler(module, names, interval)
+        sampler.start()
@@ -0,0 +1,288 @@
+'''
+profiler makes one streaming pass over a raw export and reports, with memory bounded by the chunk size
+(plus 8 bytes per row for the duplicate count), what is otherwise found by running value_counts and
+count_duplicates one at a time in a notebook:
+
+- per column null and '-' rates,
+- approximate distinct counts (HyperLogLog),
+- top values (exact counts for low cardinality columns, a count-min sketch beyond that),
+- the full state and industry distributions,
+- duplicate rows, counted exactly from a 64 bit hash of each row,
+- the pass rate of each filter stage of the LiveRamp and email lists.
+
+Usage:
+    python profiler.py ./raw_data/Adpromoter_FirstPriority.csv --top-k 10 --industries "Marketing" "Events Services"
+
+'''
+#>>>>>>>>>>>>> Import required Packages >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+import argparse
+import json
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_ROWS = 200_000
+DEFAULT_TOP_K = 10
+
+# Columns with up to this many distinct values are counted exactly, beyond it they move to a sketch
+EXACT_COUNT_LIMIT = 10_000
+
+DISTRIBUTION_COLUMNS = ('PERSONAL_STATE', 'PRIMARY_INDUSTRY')
+
+_HLL_PRECISION = 14
+_SKETCH_DEPTH = 4
+_SKETCH_WIDTH = 1 << 14
+# Fixed siphash keys, one per count-min row, so that the sketches are reproducible
+_SKETCH_KEYS = [f"adlistsketch{row:04d}" for row in range(_SKETCH_DEPTH)]
+
+
+#>>>>>>>>>> - Define sketches - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+class HyperLogLog:
+    """
+    Approximate distinct counter over 64 bit hashes, about 1% standard error with the default precision.
+    """
+
+    def __init__(self, precision=_HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add_hashes(self, hashes):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if not len(hashes):
+            return
+        shift = np.uint64(64 - self.precision)
+        buckets = (hashes >> shift).astype(np.intp)
+        remainder = hashes & np.uint64((1 << (64 - self.precision)) - 1)
+
+        # Rank: position of the leftmost 1 bit of the remaining bits, from the exponent of their float value
+        _, exponents = np.frexp(remainder.astype(np.float64))
+        ranks = np.where(remainder == 0, 64 - self.precision + 1, 64 - self.precision - exponents + 1).astype(np.uint8)
+        np.maximum.at(self.registers, buckets, ranks)
+
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        empty = np.count_nonzero(self.registers == 0)
+        # Linear counting is more accurate for small cardinalities
+        if estimate <= 2.5 * m and empty:
+            estimate = m * np.log(m / empty)
+        return int(round(estimate))
+
+
+class TopValues:
+    """
+    Top values of a column: exact counts until the column has more than 'exact_limit' distinct values,
+    then a count-min sketch with a bounded set of heavy hitter candidates.
+    """
+
+    def __init__(self, top_k=DEFAULT_TOP_K, exact_limit=EXACT_COUNT_LIMIT):
+        self.top_k = top_k
+        self.exact_limit = exact_limit
+        self.counts = pd.Series(dtype="int64")
+        self.sketch = None
+        self.candidates = pd.Series(dtype="int64")
+
+    @property
+    def exact(self):
+        return self.sketch is None
+
+    def _sketch_add(self, value_counts):
+        values = value_counts.index.to_numpy(dtype=object)
+        for row, key in enumerate(_SKETCH_KEYS):
+            columns = pd.util.hash_array(values, hash_key=key, categorize=False) % np.uint64(_SKETCH_WIDTH)
+            self.sketch[row] += np.bincount(columns.astype(np.intp), weights=value_counts.to_numpy(), minlength=_SKETCH_WIDTH).astype(np.int64)
+
+    def _sketch_estimate(self, values):
+        values = np.asarray(values, dtype=object)
+        estimates = [self.sketch[row][(pd.util.hash_array(values, hash_key=key, categorize=False) % np.uint64(_SKETCH_WIDTH)).astype(np.intp)]
+                     for row, key in enumerate(_SKETCH_KEYS)]
+        return np.min(estimates, axis=0)
+
+    def add(self, value_counts):
+        """
+        Adds the value counts of one chunk.
+        """
+        if self.exact:
+            self.counts = self.counts.add(value_counts, fill_value=0).astype("int64")
+            if len(self.counts) <= self.exact_limit:
+                return
+            # Too many distinct values: move the counts seen so far to a sketch
+            self.sketch = np.zeros((_SKETCH_DEPTH, _SKETCH_WIDTH), dtype=np.int64)
+            value_counts, self.counts = self.counts, None
+
+        self._sketch_add(value_counts)
+        # Keep the best candidates of the previous chunks and of this chunk, re-estimated from the sketch
+        candidates = pd.Index(self.candidates.index).append(value_counts.nlargest(self.top_k * 10).index).unique()
+        estimates = pd.Series(self._sketch_estimate(candidates), index=candidates)
+        self.candidates = estimates.nlargest(self.top_k * 10)
+
+    def top(self):
+        counts = self.counts if self.exact else self.candidates
+        return [(str(value), int(count)) for value, count in counts.nlargest(self.top_k).items()]
+
+
+#>>>>>>>>>> - Define filter stage pass rates - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+def _stage_counts(chunk, target_industries=None):
+    # Rows left after each filter stage of the LiveRamp list, and of the email list, for one chunk
+    import Adfunctions as af
+
+    counts = {'rows': len(chunk)}
+    df = chunk
+    if target_industries:
+        df = af.filter_by_target_industries(df, target_industries)
+        counts['target_industries'] = len(df)
+
+    state_df = af.filter_usa_states(df)
+    counts['usa_states'] = len(state_df)
+
+    has_address = af._label_valid_addresses(state_df)['HAS_VALID_ADDRESS']
+    counts['valid_address'] = int(has_address.sum())
+
+    phones = state_df[af.LIVERAMP_PHONE_SOURCE_COLUMNS].replace('-', np.nan).notna().any(axis=1).to_numpy()
+    counts['liveramp_phone_number'] = int((has_address & phones).sum())
+
+    emails = af.drop_rows_with_hyphen(af.enrich_email(state_df), ['Valid_Business_Email'])
+    counts['email_resolved'] = len(emails)
+    counts['valid_business_email'] = len(af.filter_by_valid_business_email(state_df))
+    return counts
+
+
+def _distinct_count(hash_chunks):
+    # Number of distinct values of the sorted-in-place concatenation of the per chunk hashes. With 64 bit
+    # hashes two different rows collide with a probability of about rows**2 / 2**65, negligible for exports
+    hashes = np.concatenate(hash_chunks) if hash_chunks else np.empty(0, dtype=np.uint64)
+    hash_chunks.clear()
+    if not len(hashes):
+        return 0
+    hashes.sort()
+    return 1 + int(np.count_nonzero(hashes[1:] != hashes[:-1]))
+
+
+#>>>>>>>>>> - Define profiling pass - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+def profile_file(file_path, top_k=DEFAULT_TOP_K, chunk_rows=DEFAULT_CHUNK_ROWS, target_industries=None,
+                 distribution_columns=DISTRIBUTION_COLUMNS, exact_limit=EXACT_COUNT_LIMIT):
+    """
+    Profiles a raw export in one streaming pass.
+
+    Parameters:
+    file_path (str): Path to the raw CSV export.
+    top_k (int): Number of top values reported per column.
+    chunk_rows (int): Number of rows read at a time, bounds the memory used.
+    target_industries (list, optional): Industries of the list, adds their filter to the stage pass rates.
+    distribution_columns (tuple): Columns whose full value distribution is reported (if low cardinality).
+    exact_limit (int): Distinct values counted exactly per column before switching to a sketch.
+
+    Returns:
+    dict: The profile, with 'rows', 'duplicate_rows', 'columns' (per column 'null_rate',
+          'dash_rate', 'approx_distinct', 'top_values', 'top_values_exact'), 'distributions' and
+          'stage_pass_rates' (rows left after each stage, as a share of all rows).
+
+    Use Case:
+    >>> profile = profile_file('./raw_data/Adpromoter_FirstPriority.csv', target_industries=['Marketing'])
+    >>> print_profile(profile)
+    """
+    rows = 0
+    columns = None
+    nulls = dashes = None
+    distinct = {}
+    top_values = {}
+    row_hashes = []
+    stages = {}
+    stage_error = None
+
+    reader = pd.read_csv(file_path, dtype=str, chunksize=chunk_rows, low_memory=False)
+    for chunk in reader:
+        if columns is None:
+            columns = list(chunk.columns)
+            nulls = pd.Series(0, index=columns, dtype="int64")
+            dashes = pd.Series(0, index=columns, dtype="int64")
+            distinct = {column: HyperLogLog() for column in columns}
+            top_values = {column: TopValues(top_k, exact_limit) for column in columns}
+
+        rows += len(chunk)
+        nulls += chunk.isna().sum()
+        dashes += chunk.eq('-').sum()
+        # Distinct row hashes of the chunk, duplicates across chunks are counted once all chunks are read
+        row_hashes.append(np.unique(pd.util.hash_pandas_object(chunk, index=False).to_numpy()))
+
+        for column in columns:
+            value_counts = chunk[column].value_counts(dropna=True)
+            if len(value_counts):
+                distinct[column].add_hashes(pd.util.hash_array(value_counts.index.to_numpy(dtype=object), categorize=False))
+                top_values[column].add(value_counts)
+
+        if stage_error is None:
+            try:
+                for stage, count in _stage_counts(chunk, target_industries).items():
+                    stages[stage] = stages.get(stage, 0) + count
+            except (KeyError, ValueError) as e:
+                # Exports without the list columns are still profiled, without the stage pass rates
+                stage_error = str(e)
+                stages = {}
+
+    if columns is None:
+        raise ValueError(f"'{file_path}' has no data rows to profile.")
+
+    return {
+        'file': file_path,
+        'rows': rows,
+        'duplicate_rows': rows - _distinct_count(row_hashes),
+        'columns': {
+            column: {
+                'null_rate': nulls[column] / rows,
+                'dash_rate': dashes[column] / rows,
+                'approx_distinct': distinct[column].count(),
+                'top_values': top_values[column].top(),
+                'top_values_exact': top_values[column].exact,
+            }
+            for column in columns
+        },
+        'distributions': {
+            column: {str(value): int(count) for value, count in top_values[column].counts.sort_values(ascending=False).items()}
+            for column in distribution_columns
+            if column in top_values and top_values[column].exact
+        },
+        'stage_pass_rates': {stage: count / rows for stage, count in stages.items()},
+        'stage_error': stage_error,
+    }
+
+
+def print_profile(profile):
+    """
+    Prints a profile as returned by profile_file.
+    """
+    print(f"{profile['file']}: {profile['rows']} rows, {profile['duplicate_rows']} duplicate rows")
+    print(f"{'column':<36} {'null':>7} {'-':>7} {'~distinct':>10}  top values")
+    for column, stats in profile['columns'].items():
+        top = ", ".join(f"{value!r} ({count})" for value, count in stats["top_values"][:3])
+        approx = "" if stats['top_values_exact'] else "~"
+        print(f"{column:<36} {stats['null_rate']:>7.1%} {stats['dash_rate']:>7.1%} {stats['approx_distinct']:>10}  {approx}{top}")
+
+    for column, distribution in profile['distributions'].items():
+        print(f"\n{column} distribution:")
+        for value, count in distribution.items():
+            print(f"  {value:<60} {count}")
+
+    if profile['stage_pass_rates']:
+        print("\nRows left after each filter stage:")
+        for stage, rate in profile['stage_pass_rates'].items():
+            print(f"  {stage:<28} {rate:>7.1%}")
+    elif profile['stage_error']:
+        print(f"\nNo stage pass rates: {profile['stage_error']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile a raw export in one streaming pass.")
+    parser.add_argument("file", help="Path to the raw CSV export")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K, help="Number of top values per column")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help="Rows read at a time")
+    parser.add_argument("--industries", nargs="*", default=None, help="Target industries of the list")
+    parser.add_argument("--json", default=None, help="Also write the profile to this JSON file")
+    args = parser.parse_args()
+
+    profile = profile_file(args.file, top_k=args.top_k, chunk_rows=args.chunk_rows, target_industries=args.industries)
+    print_profile(profile)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as json_file:
+            json.dump(profile, json_file, indent=2, default=float)
@@ -0,0 +1,207 @@
+'''
+row_parallel runs the row filters of the row scripts (main.py, main2.py, main_email.py and main2_email.py),
+in their own process with write_filtered_rows or on several processes with filter_rows.
+
+Rows are parsed with csv.reader into plain lists and a row filter reads the fields by their precomputed
+position, returning the output record as a plain tuple in the order of the output columns, so a kept
+row costs one tuple instead of the input and output dicts of csv.DictReader and csv.DictWriter. Records
+are written with csv.writer.writerows in batches of WRITE_BATCH_ROWS.
+
+On several processes the file is split at record boundaries with its row index (see csv_index) and each
+worker filters its piece, writes its kept rows to ordered part files and returns how many it kept. The 'Client Customer ID' of each part then starts right after the
+IDs of the parts before it, so the IDs stay contiguous (1 to N) exactly as with one process, and the
+numbered parts are concatenated in order behind the headers.
+
+Each worker also counts the records its piece parses into. If a piece does not parse into the rows the
+index puts in it (a piece starting inside a quoted field, a bare '\r' read as a line break), the file is
+filtered again as one piece, which is read exactly as one process reads it.
+
+A row filter factory is a module-level function taking the header and returning a function of one row
+(a list of strings), which returns the output record without its 'Client Customer ID', or None to drop
+the row:
+
+>>> def row_filter(header):
+...     state = header.index('PERSONAL_STATE')
+...     first_name = header.index('FIRST_NAME')
+...     def output(row):
+...         return (row[first_name], row[state]) if row[state] in US_STATES else None
+...     return output
+>>> filter_rows('docs/Adpromoter_FirstPriority.csv', 'output/list.csv', 'output/raw.csv',
+...             ['Client Customer ID', 'First Name', 'State'], row_filter, workers=8)
+
+'''
+#>>>>>>>>>>>>> Import required Packages >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+import csv
+import io
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from csv_index import CsvRowIndex, read_byte_range
+
+# Pieces per worker, so that a slow piece does not leave the other workers idle at the end
+SHARDS_PER_WORKER = 4
+
+# Rows handed to csv.writer.writerows at a time. A batch holds two tracked objects per row (the row list
+# and its record tuple), so batches stay under the 700 allocations that trigger a garbage collection
+WRITE_BATCH_ROWS = 256
+
+# Set in each worker by _init_worker, so the suppression list is sent once per worker and not per piece
+_worker_keep_row = None
+
+
+#>>>>>>>>>> - Define the batch writer - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+def write_filtered_rows(reader, header, output, output_writer, raw_writer, keep_row=None, first_id=None):
+    """
+    Writes the rows of 'reader' (a csv.reader past the header) kept by the row filter 'output': the output
+    records to 'output_writer' and the raw rows to 'raw_writer', in batches of WRITE_BATCH_ROWS with
+    writerows. Blank lines are skipped and short rows padded, as csv.DictReader does.
+
+    Parameters:
+    reader (iterator): Rows as lists of strings.
+    header (list of str): Column names of the rows.
+    output (callable): Row filter returned by a row filter factory for 'header'.
+    output_writer (csv.writer): Writer of the output records.
+    raw_writer (csv.writer): Writer of the kept raw rows.
+    keep_row (callable, optional): Suppression predicate of a row, False to drop it.
+    first_id (int, optional): 'Client Customer ID' of the first kept row. If None the records are written
+                              without their ID.
+
+    Returns:
+    int: The number of rows kept.
+    """
+    width = len(header)
+    kept = 0
+    records, raws = [], []
+    for row in reader:
+        if not row:
+            continue
+        if len(row) < width:
+            row += [''] * (width - len(row))
+        if keep_row is not None and not keep_row(row):
+            continue
+        record = output(row)
+        if record is None:
+            continue
+        records.append(record if first_id is None else (first_id + kept + len(records), *record))
+        raws.append(row)
+        if len(records) == WRITE_BATCH_ROWS:
+            output_writer.writerows(records)
+            raw_writer.writerows(raws)
+            kept += len(records)
+            records, raws = [], []
+    output_writer.writerows(records)
+    raw_writer.writerows(raws)
+    return kept + len(records)
+
+
+#>>>>>>>>>> - Define the workers - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+def _init_worker(suppression, email_fields, phone_fields, header):
+    global _worker_keep_row
+    _worker_keep_row = suppression.row_predicate(email_fields, phone_fields, header=header) if suppression is not None else None
+
+
+def _counted(rows, count):
+    # Yield 'rows', keeping the number yielded so far in count[0]
+    for count[0], row in enumerate(rows, start=1):
+        yield row
+
+
+def _filter_piece(task):
+    # Phase 1: filter one piece into an output part (records without their ID) and a raw part, and return
+    # the number of rows kept and of records parsed. The piece is read like the scripts read the whole
+    # file (utf-8, universal newlines)
+    file_path, byte_range, header, row_filter, output_part, raw_part = task
+    index = CsvRowIndex.load_or_build(file_path, save=False)
+    reader = csv.reader(io.TextIOWrapper(read_byte_range(file_path, byte_range, index), encoding="utf-8"))
+    next(reader, None)
+
+    parsed = [0]
+    with open(output_part, 'w', newline='', encoding='utf-8') as output_file, \
+            open(raw_part, 'w', newline='', encoding='utf-8') as raw_file:
+        kept = write_filtered_rows(_counted(reader, parsed), header, row_filter(header), csv.writer(output_file),
+                                   csv.writer(raw_file), keep_row=_worker_keep_row)
+    return kept, parsed[0]
+
+
+def _number_part(task):
+    # Phase 2: prefix the records of a part with their 'Client Customer ID', starting at 'first_id'
+    output_part, numbered_part, first_id = task
+    with open(output_part, 'r', newline='', encoding='utf-8') as part_file, \
+            open(numbered_part, 'w', newline='', encoding='utf-8') as numbered_file:
+        csv.writer(numbered_file).writerows([customer_id, *record] for customer_id, record in enumerate(csv.reader(part_file), start=first_id))
+    os.remove(output_part)
+
+
+def _concatenate(path, header, parts):
+    # Header row followed by the bytes of each part, in order
+    with open(path, 'w', newline='', encoding='utf-8') as csv_file:
+        csv.writer(csv_file).writerow(header)
+    with open(path, 'ab') as csv_file:
+        for part in parts:
+            with open(part, 'rb') as part_file:
+                shutil.copyfileobj(part_file, csv_file, 16 * 1024 * 1024)
+
+
+def _filter_pieces(executor, file_path, pieces, header, row_filter, part_directory):
+    # Phase 1 on every piece: the output and raw part paths, and the (kept, parsed) counts of each piece
+    output_parts = [os.path.join(part_directory, f"output_{number:05d}.csv") for number in range(len(pieces))]
+    raw_parts = [os.path.join(part_directory, f"raw_{number:05d}.csv") for number in range(len(pieces))]
+    tasks = [(file_path, piece, header, row_filter, output_part, raw_part)
+             for piece, output_part, raw_part in zip(pieces, output_parts, raw_parts)]
+    return output_parts, raw_parts, list(executor.map(_filter_piece, tasks))
+
+
+#>>>>>>>>>> - Define the parallel filter - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+def filter_rows(csv_file_path, output_file_path, raw_output_path, output_fieldnames, row_filter, workers=None,
+                suppression=None, email_fields=(), phone_fields=()):
+    """
+    Filters a raw export into a list with contiguous 'Client Customer ID's on several processes, and copies
+    the kept raw rows to 'raw_output_path'. Both files are the same as the ones written in one process
+    with write_filtered_rows.
+
+    Parameters:
+    csv_file_path (str): Path to the raw CSV export.
+    output_file_path (str): Path of the list. Its first column is 'Client Customer ID'.
+    raw_output_path (str): Path of the copy of the kept raw rows.
+    output_fieldnames (list of str): Header of the list, 'Client Customer ID' first.
+    row_filter (callable): Module-level row filter factory (see the module docstring).
+    workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+    suppression (SuppressionList, optional): Suppression list used to drop opted-out contacts.
+    email_fields (list of str): Columns checked against the suppression list as emails.
+    phone_fields (list of str): Columns checked against the suppression list as phone numbers.
+
+    Returns:
+    int: The number of rows kept.
+    """
+    index = CsvRowIndex.load_or_build(csv_file_path)
+    header = index.header(encoding="utf-8")
+    workers = workers or os.cpu_count() or 1
+    pieces = index.shards(workers * SHARDS_PER_WORKER)
+
+    part_directory = tempfile.mkdtemp(prefix=".row_parts_", dir=os.path.dirname(os.path.abspath(output_file_path)))
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(suppression, email_fields, phone_fields, header)) as executor:
+            output_parts, raw_parts, results = _filter_pieces(executor, csv_file_path, pieces, header, row_filter, part_directory)
+
+            misparsed = [piece for piece, (_, parsed) in zip(pieces, results) if parsed != index.rows_in(piece)]
+            if misparsed and len(pieces) > 1:
+                print(f"{len(misparsed)} of {len(pieces)} pieces of '{csv_file_path}' do not parse into the rows "
+                      f"of its row index, filtering the file as one piece.")
+                pieces = [(index.header_end, int(index.offsets[-1]))]
+                output_parts, raw_parts, results = _filter_pieces(executor, csv_file_path, pieces, header, row_filter, part_directory)
+            counts = [kept for kept, _ in results]
+
+            numbered_parts = [os.path.join(part_directory, f"numbered_{number:05d}.csv") for number in range(len(pieces))]
+            # IDs are assigned once every part is counted: part i starts after the rows of parts 0 to i-1
+            first_ids = [1 + sum(counts[:number]) for number in range(len(counts))]
+            list(executor.map(_number_part, zip(output_parts, numbered_parts, first_ids)))
+
+        _concatenate(output_file_path, output_fieldnames, numbered_parts)
+        _concatenate(raw_output_path, header, raw_parts)
+    finally:
+        shutil.rmtree(part_directory, ignore_errors=True)
+
+    return sum(counts)
@@ -0,0 +1,283 @@
+'''
+rules is a small declarative rule engine for building lists. A rule spec (JSON, or YAML when PyYAML is
+installed) lists the allowed states, the address exclusions, the industry keywords, the valid email
+statuses and the output column mapping; it is compiled once into vectorized pandas/NumPy masks, so a
+new list variant is a new spec file instead of another hand-written row loop.
+
+Spec example (see the files in 'rule_specs/', which reproduce main.py, main2.py and main_email.py):
+{
+    "name": "liveramp_us_territories",
+    "states": {"column": "PERSONAL_STATE", "allowed": ["AL", "AK", ...]},
+    "addresses": {"columns": ["PERSONAL_ADDRESS", "PERSONAL_ADDRESS_2"], "exclude_substrings": ["PO Box"]},
+    "industries": {"column": "PRIMARY_INDUSTRY", "keywords": ["marketing"], "match": "contains"},
+    "email_status": {"column": "BUSINESS_EMAIL_VALIDATION_STATUS", "valid": ["Valid (Digital)", "Valid (Esp)"]},
+    "columns": {"Client Customer ID": "@row_number", "Street Address 1": "@address", "Email1": "PERSONAL_EMAIL",
+                "Business Email": ["BUSINESS_EMAIL", "PERSONAL_EMAIL"]}
+}
+
+Column mapping values are a source column, a list of source columns (the first non-empty value is used,
+like "row.get(a) or row.get(b)"), '@address' (the first valid address) or '@row_number' (1 to N).
+
+Usage:
+    python rules.py rule_specs/email_valid_business.json docs/Adpromoter_FirstPriority.csv output/email_list.csv
+
+'''
+#>>>>>>>>>>>>> Import required Packages >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+SPEC_SECTIONS = ("name", "description", "states", "addresses", "industries", "email_status", "columns")
+
+# Address values that are never valid, as in functions.is_valid_address
+MISSING_ADDRESS_VALUES = ("", "-")
+
+
+#>>>>>>>>>> - Define spec loading - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+def load_rules(spec_path):
+    """
+    Loads and compiles a rule spec file.
+
+    Parameters:
+    spec_path (str): Path to a '.json', '.yaml' or '.yml' rule spec.
+
+    Returns:
+    CompiledRules: The compiled rules.
+
+    Raises:
+    FileNotFoundError: If the spec file does not exist.
+    ImportError: If a YAML spec is given and PyYAML is not installed.
+    ValueError: If the spec is invalid.
+    """
+    if not os.path.exists(spec_path):
+        raise FileNotFoundError(f"Rule spec '{spec_path}' not found.")
+
+    with open(spec_path, "r", encoding="utf-8") as spec_file:
+        if spec_path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("YAML rule specs require the 'PyYAML' package, or use a JSON spec")
+            spec = yaml.safe_load(spec_file)
+        else:
+            spec = json.load(spec_file)
+
+    return compile_rules(spec)
+
+
+def compile_rules(spec):
+    """
+    Compiles a rule spec dict into vectorized masks and a projection.
+
+    Raises:
+    ValueError: If the spec has unknown sections or a section is malformed.
+    """
+    if not isinstance(spec, dict):
+        raise ValueError("A rule spec must be a mapping")
+    unknown = [section for section in spec if section not in SPEC_SECTIONS]
+    if unknown:
+        raise ValueError(f"Unknown rule spec sections {unknown}, expected some of {SPEC_SECTIONS}")
+    if not spec.get("columns"):
+        raise ValueError("A rule spec needs a 'columns' mapping")
+    return CompiledRules(spec)
+
+
+#>>>>>>>>>> - Define vectorized helpers - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+def _column(df, column):
+    # Missing columns behave like the csv scripts' row.get(column, ''): an empty column
+    if column in df.columns:
+        return df[column]
+    return pd.Series("", index=df.index, dtype="object")
+
+
+def _per_distinct(values, predicate):
+    # Evaluate a vectorized predicate on the distinct values of a column only, then broadcast back
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    unique_result = np.asarray(predicate(pd.Series(uniques, dtype="object").astype("string")), dtype=bool)
+    result = np.zeros(len(codes), dtype=bool)
+    present = codes >= 0
+    result[present] = unique_result[codes[present]]
+    return result
+
+
+def _non_empty(values):
+    # Same truthiness as the scripts' "row.get(a, '') or row.get(b, '')"
+    return (values.notna() & (values.astype("string") != "")).to_numpy(dtype=bool, na_value=False)
+
+
+#>>>>>>>>>> - Define compiled rules - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+class CompiledRules:
+    """
+    A rule spec compiled into vectorized masks.
+
+    Use Case:
+    >>> rules = load_rules('rule_specs/liveramp_us_territories.json')
+    >>> df = get_data('docs/Adpromoter_FirstPriority.csv', dtype=str, keep_default_na=False)
+    >>> mask = rules.mask(df)                  # combined boolean mask
+    >>> output_df = rules.apply(df)            # filtered rows in the output format
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.name = spec.get("name", "rules")
+
+        states = spec.get("states")
+        self.state_column = states["column"] if states else None
+        self.allowed_states = frozenset(states["allowed"]) if states else None
+
+        addresses = spec.get("addresses")
+        self.address_columns = list(addresses["columns"]) if addresses else []
+        self.address_pattern = None
+        if addresses:
+            patterns = [re.escape(substring) for substring in addresses.get("exclude_substrings", [])]
+            if addresses.get("exclude_pattern"):
+                patterns.append(addresses["exclude_pattern"])
+            self.address_pattern = "|".join(f"(?:{pattern})" for pattern in patterns) or None
+
+        industries = spec.get("industries")
+        self.industry_column = industries["column"] if industries else None
+        self.industry_keywords = [keyword.lower() for keyword in industries["keywords"]] if industries else []
+        self.industry_match = industries.get("match", "contains") if industries else None
+        if self.industry_match not in (None, "contains", "exact"):
+            raise ValueError(f"Unknown industry match '{self.industry_match}', expected 'contains' or 'exact'")
+
+        email_status = spec.get("email_status")
+        self.email_status_column = email_status["column"] if email_status else None
+        self.valid_email_statuses = frozenset(email_status["valid"]) if email_status else None
+
+        self.columns = dict(spec["columns"])
+
+    #>>>>>>>>>> - masks - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+    def state_mask(self, df):
+        if self.state_column is None:
+            return np.ones(len(df), dtype=bool)
+        return _column(df, self.state_column).isin(self.allowed_states).to_numpy(dtype=bool)
+
+    def address_validity(self, df):
+        """
+        Returns an (n_rows, n_address_columns) boolean array of valid addresses, one distinct value at a time.
+        """
+        if not self.address_columns:
+            return np.ones((len(df), 0), dtype=bool)
+
+        pattern = self.address_pattern
+
+        def is_valid(values):
+            valid = ~values.isin(MISSING_ADDRESS_VALUES)
+            if pattern:
+                valid &= ~values.str.contains(pattern, regex=True, na=False)
+            return valid.to_numpy(dtype=bool, na_value=False)
+
+        stacked = pd.concat([_column(df, column).astype("object") for column in self.address_columns], ignore_index=True)
+        return _per_distinct(stacked, is_valid).reshape(len(self.address_columns), len(df)).T
+
+    def address_mask(self, df):
+        if not self.address_columns:
+            return np.ones(len(df), dtype=bool)
+        return self.address_validity(df).any(axis=1)
+
+    def industry_mask(self, df):
+        if self.industry_column is None:
+            return np.ones(len(df), dtype=bool)
+
+        keywords = self.industry_keywords
+        if self.industry_match == "exact":
+            return _per_distinct(_column(df, self.industry_column), lambda values: values.str.lower().isin(keywords).fillna(False))
+
+        pattern = "|".join(re.escape(keyword) for keyword in keywords)
+        return _per_distinct(_column(df, self.industry_column), lambda values: values.str.lower().str.contains(pattern, regex=True, na=False))
+
+    def email_status_mask(self, df):
+        if self.email_status_column is None:
+            return np.ones(len(df), dtype=bool)
+        return _column(df, self.email_status_column).isin(self.valid_email_statuses).to_numpy(dtype=bool)
+
+    def masks(self, df):
+        """
+        Returns every rule mask by name, e.g. to report how many rows each rule removes.
+        """
+        return {
+            "states": self.state_mask(df),
+            "addresses": self.address_mask(df),
+            "industries": self.industry_mask(df),
+            "email_status": self.email_status_mask(df),
+        }
+
+    def mask(self, df):
+        """
+        Returns the combined mask of all rules.
+        """
+        return np.logical_and.reduce(list(self.masks(df).values()))
+
+    #>>>>>>>>>> - projection - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+    def project(self, df, address_validity=None):
+        """
+        Maps the rows of 'df' to the output columns of the spec.
+        """
+        output = {}
+        for output_column, source in self.columns.items():
+            if source == "@row_number":
+                output[output_column] = np.arange(1, len(df) + 1)
+            elif source == "@address":
+                validity = self.address_validity(df) if address_validity is None else address_validity
+                values = np.column_stack([_column(df, column).to_numpy(dtype=object) for column in self.address_columns])
+                first_valid = validity.argmax(axis=1)
+                output[output_column] = np.where(validity.any(axis=1), values[np.arange(len(df)), first_valid], "")
+            elif isinstance(source, list):
+                values = _column(df, source[0]).astype("object")
+                for fallback in source[1:]:
+                    values = values.where(_non_empty(values), _column(df, fallback))
+                output[output_column] = values.to_numpy(dtype=object)
+            else:
+                output[output_column] = _column(df, source).to_numpy(dtype=object)
+        return pd.DataFrame(output, columns=list(self.columns))
+
+    def apply(self, df):
+        """
+        Filters 'df' with every rule and returns the kept rows in the output format.
+        """
+        keep = self.mask(df)
+        kept = df[keep]
+        return self.project(kept)
+
+
+def run_rules(input_path, output_path, rules):
+    """
+    Builds a list from a raw export with a rule spec, reading every value as text like the csv scripts do.
+
+    Parameters:
+    input_path (str): Path to the raw CSV export.
+    output_path (str): Path of the list to write.
+    rules (CompiledRules or str): Compiled rules or the path to a rule spec.
+
+    Returns:
+    pd.DataFrame: The written list.
+
+    Use Case:
+    >>> run_rules('docs/Adpromoter_FirstPriority.csv', 'output/output_filtered_states.csv', 'rule_specs/liveramp_us_territories.json')
+    """
+    if isinstance(rules, str):
+        rules = load_rules(rules)
+
+    df = pd.read_csv(input_path, dtype=str, keep_default_na=False, low_memory=False)
+    print(f'Number of rows before processing: {len(df)}')
+
+    output_df = rules.apply(df)
+    output_df.to_csv(output_path, index=False)
+    print(f'Number of rows after processing: {len(output_df)}')
+    return output_df
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build a list from a raw CSV export with a rule spec.")
+    parser.add_argument("spec", help="Path to the JSON or YAML rule spec")
+    parser.add_argument("input", help="Path to the raw CSV export")
+    parser.add_argument("output", help="Path of the list to write")
+    args = parser.parse_args()
+
+    run_rules(args.input, args.output, args.spec)
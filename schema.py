@@ -0,0 +1,182 @@
+'''
+schema is the registry of the columns the list builders read. It describes the vendor export and, for
+each list type and row script, the export columns it needs and the columns it writes, so that:
+
+- an input is checked from its header alone, before any row is parsed, and a file missing a column fails
+  at once with every missing column named, instead of after the whole pipeline ran;
+- only the columns a list type needs are parsed (pandas 'usecols'), which cuts parse time and memory.
+
+Use Case:
+>>> usecols = projection('./raw_data/Adpromoter_FirstPriority.csv', 'liveramp')
+>>> df = get_data('./raw_data/Adpromoter_FirstPriority.csv', usecols=usecols)
+>>> require_columns(reader.fieldnames, 'rows_email', csv_file_path)
+
+'''
+#>>>>>>>>>>>>> Import required Packages >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+import csv
+import gzip
+import os
+
+# Columns of the vendor export, in file order
+VENDOR_EXPORT_COLUMNS = (
+    'FIRST_NAME', 'LAST_NAME', 'BUSINESS_EMAIL', 'PROGRAMMATIC_BUSINESS_EMAILS', 'PERSONAL_EMAIL', 'JOB_TITLE',
+    'SENIORITY_LEVEL', 'DEPARTMENT', 'MOBILE_PHONE', 'DIRECT_NUMBER', 'LINKEDIN_URL', 'PERSONAL_ADDRESS',
+    'PERSONAL_ADDRESS_2', 'PERSONAL_CITY', 'PERSONAL_STATE', 'PERSONAL_ZIP', 'PERSONAL_ZIP4', 'PROFESSIONAL_ADDRESS',
+    'PROFESSIONAL_ADDRESS_2', 'PROFESSIONAL_CITY', 'PROFESSIONAL_STATE', 'PROFESSIONAL_ZIP', 'PROFESSIONAL_ZIP4',
+    'COMPANY_NAME', 'COMPANY_DOMAIN', 'PRIMARY_INDUSTRY', 'COMPANY_SIC', 'COMPANY_NAICS', 'COMPANY_ADDRESS',
+    'COMPANY_ADDRESS_2', 'COMPANY_CITY', 'COMPANY_STATE', 'COMPANY_ZIP', 'COMPANY_ZIP4', 'COMPANY_LINKEDIN_URL',
+    'COMPANY_REVENUE', 'COMPANY_EMPLOYEE_COUNT', 'BUSINESS_EMAIL_VALIDATION_STATUS', 'BUSINESS_EMAIL_LAST_SEEN',
+    'COMPANY_LAST_UPDATED', 'JOB_TITLE_LAST_UPDATED', 'LAST_UPDATED',
+)
+
+# Headers are read with the csv module; other compressions are left to pandas
+_PANDAS_HEADER_SUFFIXES = ('.zst', '.bz2', '.xz', '.zip')
+
+
+#>>>>>>>>>> - Define the registry - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+class Schema:
+    """
+    Columns one list type or script reads from the vendor export and the columns it writes.
+
+    Parameters:
+    name (str): Name of the schema in the registry.
+    input_columns (tuple of str): Export columns that must be present, and the only ones parsed.
+    output_columns (tuple of str): Columns of the written list.
+    optional_columns (tuple of str): Export columns parsed when present and read as '' otherwise.
+    """
+
+    def __init__(self, name, input_columns, output_columns=(), optional_columns=()):
+        unknown = [column for column in tuple(input_columns) + tuple(optional_columns) if column not in VENDOR_EXPORT_COLUMNS]
+        if unknown:
+            raise ValueError(f"Schema '{name}' reads columns {unknown} that are not in the vendor export")
+        self.name = name
+        self.input_columns = tuple(input_columns)
+        self.output_columns = tuple(output_columns)
+        self.optional_columns = tuple(optional_columns)
+
+    def missing(self, columns):
+        present = set(columns)
+        return [column for column in self.input_columns if column not in present]
+
+    def __repr__(self):
+        return f"Schema({self.name!r}, {len(self.input_columns)} input columns)"
+
+
+SCHEMAS = {}
+
+
+def register_schema(name, input_columns, output_columns=(), optional_columns=()):
+    """
+    Adds (or replaces) schema 'name' in the registry and returns it.
+    """
+    SCHEMAS[name] = Schema(name, tuple(input_columns), output_columns, optional_columns)
+    return SCHEMAS[name]
+
+
+def get_schema(name):
+    """
+    Returns schema 'name'.
+
+    Raises:
+    KeyError: If no schema has that name.
+    """
+    if name not in SCHEMAS:
+        raise KeyError(f"Unknown schema '{name}', expected one of {sorted(SCHEMAS)}")
+    return SCHEMAS[name]
+
+
+_ADDRESS_COLUMNS = ('PERSONAL_ADDRESS', 'PERSONAL_ADDRESS_2', 'PROFESSIONAL_ADDRESS', 'PROFESSIONAL_ADDRESS_2',
+                    'COMPANY_ADDRESS', 'COMPANY_ADDRESS_2')
+_EMAIL_COLUMNS = ('BUSINESS_EMAIL', 'BUSINESS_EMAIL_VALIDATION_STATUS', 'PERSONAL_EMAIL', 'PROGRAMMATIC_BUSINESS_EMAILS')
+# The row scripts read the second address lines with row.get(column, ''), so a file without them is still valid
+_ROW_ADDRESS_COLUMNS = ('PERSONAL_ADDRESS', 'PROFESSIONAL_ADDRESS', 'COMPANY_ADDRESS')
+ROW_OPTIONAL_ADDRESS_COLUMNS = ('PERSONAL_ADDRESS_2', 'PROFESSIONAL_ADDRESS_2', 'COMPANY_ADDRESS_2')
+_ROW_LIVERAMP_COLUMNS = ('FIRST_NAME', 'LAST_NAME', 'PERSONAL_CITY', 'PERSONAL_STATE', 'PERSONAL_ZIP', 'PERSONAL_ZIP4',
+                         'PERSONAL_EMAIL', 'BUSINESS_EMAIL', 'DIRECT_NUMBER', 'MOBILE_PHONE') + _ROW_ADDRESS_COLUMNS
+
+LIVERAMP_OUTPUT_COLUMNS = ('Client Customer ID', 'First Name', 'Last Name', 'Street Address 1', 'Street Address 2', 'City',
+                           'State', 'Zip Code', 'Zip Code Plus 4', 'Email1', 'Email2', 'Email3', 'PhoneNumber1',
+                           'PhoneNumber2')
+EMAIL_OUTPUT_COLUMNS = ('First Name', 'Last Name', 'Email')
+
+register_schema('vendor_export', VENDOR_EXPORT_COLUMNS)
+
+# liveramp_adlist_creator: industry, state, address, phone and email stages, then liveramp_formatter
+register_schema('liveramp', ('FIRST_NAME', 'LAST_NAME', 'PRIMARY_INDUSTRY', 'PERSONAL_STATE', 'PERSONAL_ZIP',
+                             'PERSONAL_ZIP4', 'PERSONAL_CITY', 'MOBILE_PHONE', 'DIRECT_NUMBER')
+                + _ADDRESS_COLUMNS + _EMAIL_COLUMNS, LIVERAMP_OUTPUT_COLUMNS)
+
+# email_list_creator: industry, state and email stages
+register_schema('email', ('FIRST_NAME', 'LAST_NAME', 'PRIMARY_INDUSTRY', 'PERSONAL_STATE', 'PERSONAL_ZIP')
+                + _EMAIL_COLUMNS, EMAIL_OUTPUT_COLUMNS)
+
+# The row scripts: main.py, main2.py, main_email.py and main2_email.py
+register_schema('rows_liveramp', _ROW_LIVERAMP_COLUMNS, LIVERAMP_OUTPUT_COLUMNS, ROW_OPTIONAL_ADDRESS_COLUMNS)
+register_schema('rows_liveramp_industry', _ROW_LIVERAMP_COLUMNS + ('PRIMARY_INDUSTRY',), LIVERAMP_OUTPUT_COLUMNS,
+                ROW_OPTIONAL_ADDRESS_COLUMNS)
+register_schema('rows_email', ('FIRST_NAME', 'LAST_NAME', 'PERSONAL_STATE', 'MOBILE_PHONE', 'PERSONAL_EMAIL',
+                               'BUSINESS_EMAIL', 'BUSINESS_EMAIL_VALIDATION_STATUS', 'PROGRAMMATIC_BUSINESS_EMAILS')
+                + _ROW_ADDRESS_COLUMNS, optional_columns=ROW_OPTIONAL_ADDRESS_COLUMNS)
+register_schema('rows_email_industry', _ROW_LIVERAMP_COLUMNS + ('PRIMARY_INDUSTRY', 'PROGRAMMATIC_BUSINESS_EMAILS'),
+                optional_columns=ROW_OPTIONAL_ADDRESS_COLUMNS)
+
+
+#>>>>>>>>>> - Define header checks - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+def read_header(file_path):
+    """
+    Returns the column names of a CSV file, reading its first record only.
+
+    Raises:
+    FileNotFoundError: If the file does not exist.
+    ValueError: If the file is empty.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File '{file_path}' not found.")
+
+    if file_path.endswith(_PANDAS_HEADER_SUFFIXES):
+        import pandas as pd
+        return list(pd.read_csv(file_path, nrows=0).columns)
+
+    opener = gzip.open if file_path.endswith('.gz') else open
+    with opener(file_path, 'rt', newline='', encoding='utf-8-sig') as csv_file:
+        header = next(csv.reader(csv_file), None)
+    if not header:
+        raise ValueError(f"File '{file_path}' is empty, expected a header row.")
+    return header
+
+
+def require_columns(columns, schema_name, source="DataFrame"):
+    """
+    Checks that 'columns' (a header or DataFrame columns) has every input column of schema 'schema_name'.
+
+    Raises:
+    ValueError: If columns are missing, all of them named.
+    """
+    missing = get_schema(schema_name).missing(columns)
+    if missing:
+        raise ValueError(f"{source} is missing the columns {missing} needed by '{schema_name}'")
+
+
+def require_schemas(columns, schema_names, source="DataFrame"):
+    """
+    Checks 'columns' against several schemas at once, naming the missing columns of all of them.
+    """
+    missing = list(dict.fromkeys(column for name in schema_names for column in get_schema(name).missing(columns)))
+    if missing:
+        raise ValueError(f"{source} is missing the columns {missing} needed by {list(schema_names)}")
+
+
+def projection(file_path, *schema_names):
+    """
+    Checks the header of 'file_path' against the schemas and returns the columns they read (their optional
+    columns too, when present), in file order, to be passed as 'usecols' to get_data.
+
+    Raises:
+    FileNotFoundError: If the file does not exist.
+    ValueError: If the header misses columns of one of the schemas.
+    """
+    header = read_header(file_path)
+    require_schemas(header, schema_names, f"File '{file_path}'")
+    needed = {column for name in schema_names
+              for column in get_schema(name).input_columns + get_schema(name).optional_columns}
+    return [column for column in header if column in needed]
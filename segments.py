@@ -0,0 +1,293 @@
+'''
+segments builds many campaign audiences from one frame. Each named predicate (seniority, valid business
+email, job title keywords, ...) is evaluated once on the whole frame as a shared boolean column, each
+segment combines the predicates it requires or excludes into an array of row positions, and the segments
+are written from those positions, so the frame is never copied per segment and ten segments cost little
+more than one.
+
+Use Case (the campaign lists of the playground notebook):
+>>> predicates = {
+...     'targeted': targeting(["7311", "8721", "8748", "7319", "8742"], ["Advertising", "Media", "Marketing"]),
+...     'senior': seniority(exclude_levels=["staff"]),
+...     'valid_business_email': valid_business_email(),
+...     'valid_personal_email': valid_personal_email(),
+...     'excluded_jobs': job_title_contains(["intern", "professor", "scientist", "engineer", "mechanical", "mechanics"]),
+...     'has_phone': has_phone(),
+... }
+>>> segments = [
+...     Segment('Email_Funnel_Campaign_List', require=['targeted', 'senior', 'valid_business_email'], columns=columns_needed),
+...     Segment('Conversation_AI_List', require=['targeted', 'has_phone'], exclude=['excluded_jobs'], sort_by='JOB_TITLE',
+...             columns=["FIRST_NAME", "LAST_NAME", "MOBILE_PHONE", "DIRECT_NUMBER"]),
+...     Segment('Social_Media_Campaign_List', require=['targeted', 'valid_personal_email'], columns=columns_needed),
+... ]
+>>> result = segment_frame(df, predicates, segments)
+>>> result.counts()
+>>> write_segments_excel(result, "Traffic-Convert_Campaign_data.xlsx")
+
+'''
+#>>>>>>>>>>>>> Import required Packages >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from Adfunctions import LIVERAMP_PHONE_SOURCE_COLUMNS, sic_target_industry_mask
+
+DEFAULT_CHUNK_ROWS = 100_000
+
+
+#>>>>>>>>>> - Define predicates - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+# Each factory returns a function of a DataFrame returning a boolean NumPy row mask, with the same rows as
+# the matching filter of Adfunctions.
+
+def _require_columns(df, columns):
+    missing = [column for column in columns if column not in df.columns]
+    if missing:
+        raise ValueError(f"DataFrame must contain the columns {missing}")
+
+
+def targeting(target_sic_codes, target_industries, how="and"):
+    """
+    Rows matching the target SIC codes and/or industries, as sic_target_industry_filter.
+    """
+    return lambda df: sic_target_industry_mask(df, target_sic_codes, target_industries, how)
+
+
+def seniority(exclude_levels=None):
+    """
+    Rows with a standard seniority level not in 'exclude_levels', as filter_by_seniority.
+    """
+    exclude_levels = [level.lower() for level in (exclude_levels or [])]
+
+    def mask(df):
+        _require_columns(df, ['SENIORITY_LEVEL'])
+        levels = df['SENIORITY_LEVEL']
+        return (levels.notna()
+                & ~levels.str.lower().isin(exclude_levels)
+                & ~levels.str.contains(r"[^\w\s]+", na=False)).to_numpy(dtype=bool, na_value=False)
+    return mask
+
+
+def valid_business_email(column_name="BUSINESS_EMAIL_VALIDATION_STATUS"):
+    """
+    Rows whose validation status contains 'Valid', as filter_by_valid_business_email.
+    """
+    def mask(df):
+        _require_columns(df, [column_name])
+        return df[column_name].str.contains("Valid", case=False, na=False).to_numpy(dtype=bool, na_value=False)
+    return mask
+
+
+def valid_personal_email():
+    """
+    Rows with an '@' in 'PERSONAL_EMAIL', as filter_valid_personal_emails.
+    """
+    def mask(df):
+        _require_columns(df, ['PERSONAL_EMAIL'])
+        return df['PERSONAL_EMAIL'].str.contains('@', na=False).to_numpy(dtype=bool, na_value=False)
+    return mask
+
+
+def job_title_contains(keywords):
+    """
+    Rows whose 'JOB_TITLE' contains one of the keywords (case-insensitive). Excluding this predicate
+    keeps the rows of sort_and_filter_jobs.
+    """
+    pattern = '|'.join(re.escape(keyword) for keyword in keywords)
+
+    def mask(df):
+        _require_columns(df, ['JOB_TITLE'])
+        return df['JOB_TITLE'].str.lower().str.contains(pattern, na=False).to_numpy(dtype=bool, na_value=False)
+    return mask
+
+
+def has_phone(columns=LIVERAMP_PHONE_SOURCE_COLUMNS):
+    """
+    Rows with at least one phone number ('-' counts as missing), as enrich_phone_numbers.
+    """
+    def mask(df):
+        _require_columns(df, columns)
+        return df[list(columns)].replace('-', np.nan).notna().any(axis=1).to_numpy(dtype=bool)
+    return mask
+
+
+def column_isin(column, values):
+    """
+    Rows whose 'column' is one of 'values'.
+    """
+    def mask(df):
+        _require_columns(df, [column])
+        return df[column].isin(values).to_numpy(dtype=bool)
+    return mask
+
+
+#>>>>>>>>>> - Define segments - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+class Segment:
+    """
+    One audience slice.
+
+    Parameters:
+    name (str): Name of the segment, used as sheet or file name.
+    require (list of str): Predicates every row of the segment satisfies.
+    exclude (list of str): Predicates no row of the segment satisfies.
+    columns (list or dict, optional): Output columns, or a mapping {output name: source column}.
+                                      Defaults to all columns.
+    sort_by (str, optional): Column the rows are sorted by (stable, missing values last).
+    """
+
+    def __init__(self, name, require=(), exclude=(), columns=None, sort_by=None):
+        self.name = name
+        self.require = list(require)
+        self.exclude = list(exclude)
+        self.columns = columns
+        self.sort_by = sort_by
+
+    @property
+    def predicates(self):
+        return self.require + self.exclude
+
+    def __repr__(self):
+        return f"Segment({self.name!r}, require={self.require}, exclude={self.exclude})"
+
+
+class SegmentResult:
+    """
+    Row positions of each segment of a frame. The frame itself is shared, not copied.
+    """
+
+    def __init__(self, df, segments, masks, rows):
+        self.df = df
+        self.segments = {segment.name: segment for segment in segments}
+        self.masks = masks
+        self.rows = rows
+
+    def counts(self):
+        return {name: len(rows) for name, rows in self.rows.items()}
+
+    def _source_columns(self, segment):
+        columns = segment.columns if segment.columns is not None else list(self.df.columns)
+        if isinstance(columns, dict):
+            return list(columns.values()), list(columns.keys())
+        return list(columns), list(columns)
+
+    def chunks(self, name, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """
+        Yields the rows of segment 'name' as DataFrames of at most 'chunk_rows' rows, with its output columns.
+        """
+        segment = self.segments[name]
+        source, output = self._source_columns(segment)
+        _require_columns(self.df, source)
+        rows = self.rows[name]
+        for start in range(0, max(len(rows), 1), chunk_rows):
+            chunk = self.df[source].iloc[rows[start:start + chunk_rows]]
+            chunk.columns = output
+            yield chunk.reset_index(drop=True)
+
+    def frame(self, name):
+        """
+        Returns segment 'name' as a DataFrame (a copy of its rows only).
+        """
+        return pd.concat(list(self.chunks(name)), ignore_index=True)
+
+
+def segment_frame(df, predicates, segments):
+    """
+    Evaluates each predicate used by the segments once on the whole frame and combines them into the
+    row positions of every segment.
+
+    Parameters:
+    df (pd.DataFrame): The frame to segment.
+    predicates (dict): {predicate name: function of the frame returning a boolean row mask}.
+    segments (list of Segment): The segments.
+
+    Returns:
+    SegmentResult: The shared predicate masks and the row positions of each segment.
+
+    Raises:
+    KeyError: If a segment uses a predicate that is not defined.
+    ValueError: If two segments have the same name or a predicate mask does not match the frame.
+    """
+    names = [segment.name for segment in segments]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Segment names must be unique, got {names}")
+
+    used = list(dict.fromkeys(predicate for segment in segments for predicate in segment.predicates))
+    undefined = [predicate for predicate in used if predicate not in predicates]
+    if undefined:
+        raise KeyError(f"Predicates {undefined} are used by a segment but not defined")
+
+    masks = {}
+    for predicate in used:
+        mask = np.asarray(predicates[predicate](df), dtype=bool)
+        if mask.shape != (len(df),):
+            raise ValueError(f"Predicate '{predicate}' returned a mask of shape {mask.shape} for {len(df)} rows")
+        masks[predicate] = mask
+
+    # Sort orders are shared too: one stable argsort per sort column, then each segment reorders its rows by rank
+    ranks = {}
+    for column in dict.fromkeys(segment.sort_by for segment in segments if segment.sort_by):
+        _require_columns(df, [column])
+        order = np.argsort(pd.factorize(df[column], sort=True, use_na_sentinel=False)[0], kind="stable")
+        ranks[column] = np.empty(len(df), dtype=np.intp)
+        ranks[column][order] = np.arange(len(df))
+
+    rows = {}
+    for segment in segments:
+        keep = np.ones(len(df), dtype=bool)
+        for predicate in segment.require:
+            keep &= masks[predicate]
+        for predicate in segment.exclude:
+            keep &= ~masks[predicate]
+        positions = np.flatnonzero(keep)
+        if segment.sort_by:
+            positions = positions[np.argsort(ranks[segment.sort_by][positions], kind="stable")]
+        rows[segment.name] = positions
+
+    return SegmentResult(df, segments, masks, rows)
+
+
+#>>>>>>>>>> - Define segment writers - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+def write_segments_csv(result, directory, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Writes each segment to '<directory>/<segment name>.csv', chunk by chunk.
+
+    Returns:
+    dict: {segment name: path of its file}.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = {}
+    for name in result.rows:
+        path = os.path.join(directory, f"{name}.csv")
+        for number, chunk in enumerate(result.chunks(name, chunk_rows)):
+            chunk.to_csv(path, index=False, header=number == 0, mode="w" if number == 0 else "a")
+        paths[name] = path
+    return paths
+
+
+def write_segments_excel(result, file_path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Writes every segment to its own sheet of one Excel workbook, named '<segment name>_<row count>' like
+    df_to_excel_openpyxl does. Rows are streamed to a write-only workbook chunk by chunk.
+
+    Raises:
+    ValueError: If a segment has more rows than an Excel sheet can hold.
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    for name, rows in result.rows.items():
+        if len(rows) >= 1_048_576:
+            raise ValueError(f"Segment '{name}' has {len(rows)} rows, more than an Excel sheet can hold")
+
+        ws = wb.create_sheet(f"{name}_{len(rows)}"[:31])
+        for number, chunk in enumerate(result.chunks(name, chunk_rows)):
+            if number == 0:
+                ws.append(chunk.columns.tolist())
+            # Missing values are written as empty cells
+            values = chunk.astype(object).where(chunk.notna(), None)
+            for row in values.itertuples(index=False, name=None):
+                ws.append(row)
+
+    wb.save(file_path)
+    return file_path
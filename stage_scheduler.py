@@ -0,0 +1,155 @@
+'''
+stage_scheduler runs the column computations of a list build as stages that declare the columns they
+read and the columns they write. Stages that do not depend on each other's outputs run concurrently in a
+thread pool, each on its own input columns only, and all outputs are assembled onto the frame with a
+single join at the end instead of copying the whole frame between stages.
+
+Threads only pay off when the stage kernels release the GIL for most of their run. The LiveRamp
+enrichment stages do not: on 108k rows the sequential run takes 0.50s and the threaded one 0.51-0.53s
+(0.25-0.28s against 0.31s on 51k rows of a single core machine), as their factorize, mask and Python level
+steps hold the GIL. Stages therefore run one after the other unless run_stages is called with
+parallel=True.
+
+'''
+#>>>>>>>>>>>>> Import required Packages >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import metrics
+
+
+class Stage:
+    """
+    One column computation of a list build.
+
+    Parameters:
+    name (str): Name of the stage, used in error messages.
+    func (callable): Takes a DataFrame holding only the 'inputs' columns and returns a dict (or DataFrame)
+                     of the 'outputs' columns, aligned with its rows.
+    inputs (list of str): Columns the stage reads. They may be outputs of other stages.
+    outputs (list of str): Columns the stage writes.
+    keep (str, optional): One of 'outputs' holding a boolean row mask. Rows where it is False are dropped
+                          from the result and the column itself is not added to the frame.
+
+    Use Case:
+    >>> has_phone = Stage('phone', lambda df: {'HAS_PHONE': df.ne('-').any(axis=1).to_numpy()},
+    ...                   inputs=['MOBILE_PHONE', 'DIRECT_NUMBER'], outputs=['HAS_PHONE'], keep='HAS_PHONE')
+    """
+
+    def __init__(self, name, func, inputs, outputs, keep=None):
+        if keep is not None and keep not in outputs:
+            raise ValueError(f"Stage '{name}' keeps rows on '{keep}', which is not one of its outputs {outputs}")
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.keep = keep
+
+    def __repr__(self):
+        return f"Stage({self.name!r}, inputs={self.inputs}, outputs={self.outputs})"
+
+
+def schedule(stages, columns=()):
+    """
+    Orders stages into waves: every stage of a wave only reads columns of the frame ('columns') or
+    outputs of earlier waves, so the stages of a wave can run concurrently.
+
+    Returns:
+    list of list of Stage: The waves, in execution order.
+
+    Raises:
+    ValueError: If two stages write the same column, or a stage reads a column nobody provides.
+    """
+    producer = {}
+    for stage in stages:
+        for column in stage.outputs:
+            if column in producer:
+                raise ValueError(f"Column '{column}' is written by both stage '{producer[column].name}' and stage '{stage.name}'")
+            producer[column] = stage
+
+    available = set(columns)
+    remaining = list(stages)
+    waves = []
+    while remaining:
+        wave = [stage for stage in remaining if all(column in available or column not in producer for column in stage.inputs)]
+        if not wave:
+            raise ValueError(f"Stages {[stage.name for stage in remaining]} depend on each other's outputs")
+        for stage in wave:
+            missing = [column for column in stage.inputs if column not in available and column not in producer]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' reads missing columns {missing}")
+        waves.append(wave)
+        available.update(column for stage in wave for column in stage.outputs)
+        remaining = [stage for stage in remaining if stage not in wave]
+
+    return waves
+
+
+def _values(values):
+    # Positional values of a column, keeping extension dtypes such as Arrow strings
+    return values.array if isinstance(values, pd.Series) else values
+
+
+def _run_stage(stage, df, produced):
+    # Hand the stage its input columns only: columns of the frame (no copy) plus earlier outputs
+    inputs = {column: produced[column] if column in produced else _values(df[column]) for column in stage.inputs}
+    start = time.perf_counter()
+    result = stage.func(pd.DataFrame(inputs, index=df.index, copy=False))
+    if metrics.enabled():
+        rows_out = int(np.count_nonzero(result[stage.keep])) if stage.keep is not None else len(df)
+        metrics.record_stage(f"stage:{stage.name}", time.perf_counter() - start, len(df), rows_out)
+
+    missing = [column for column in stage.outputs if column not in result]
+    if missing:
+        raise ValueError(f"Stage '{stage.name}' did not return its outputs {missing}")
+
+    outputs = {}
+    for column in stage.outputs:
+        if column == stage.keep:
+            outputs[column] = np.asarray(result[column], dtype=bool)
+        else:
+            outputs[column] = _values(result[column])
+    return outputs
+
+
+def run_stages(df, stages, parallel=False, max_workers=None):
+    """
+    Runs stages on a DataFrame and returns it with the stage outputs joined and the rows dropped by the
+    stage masks removed.
+
+    Parameters:
+    df (pd.DataFrame): The input frame. It is not modified.
+    stages (list of Stage): The stages to run.
+    parallel (bool): If True, independent stages run concurrently in a thread pool, which only helps if
+                     their kernels release the GIL (see the module docstring). If False (the default) they
+                     run one after the other, which gives the same result.
+    max_workers (int, optional): Maximum number of threads. Defaults to the number of stages in a wave.
+
+    Returns:
+    pd.DataFrame: 'df' with the stage output columns (replacing columns of the same name) and only the
+                  rows kept by every stage mask.
+
+    Use Case:
+    >>> enriched_df = run_stages(state_df, liveramp_enrichment_stages(address_cache))
+    """
+    produced = {}
+    for wave in schedule(stages, df.columns):
+        if parallel and len(wave) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers or len(wave)) as executor:
+                results = list(executor.map(lambda stage: _run_stage(stage, df, produced), wave))
+        else:
+            results = [_run_stage(stage, df, produced) for stage in wave]
+
+        for result in results:
+            produced.update(result)
+
+    masks = [produced.pop(stage.keep) for stage in stages if stage.keep is not None]
+    keep = np.logical_and.reduce(masks) if masks else np.ones(len(df), dtype=bool)
+
+    # One join of every output onto the input columns
+    outputs = pd.DataFrame(produced, index=df.index)
+    joined = pd.concat([df.drop(columns=[column for column in outputs.columns if column in df.columns]), outputs], axis=1)
+    return joined[keep]
@@ -0,0 +1,427 @@
+'''
+suppression is a module that builds persistent suppression lists (unsubscribes, bounces, competitor
+domains, ...) and uses them to drop opted-out contacts from the Advert lists.
+
+A list holds three kinds of keys: canonical emails, canonical phone numbers and email domains (a domain
+key suppresses every address at that domain). Email cells holding several comma separated addresses,
+such as 'PROGRAMMATIC_BUSINESS_EMAILS', are checked address by address.
+
+Keys are held in a Bloom filter that costs a few bits per suppressed key, positive hits are confirmed
+against a sorted on-disk array of 64-bit key hashes that is memory mapped, so the suppression files are
+never loaded into memory as a whole.
+
+'''
+#>>>>>>>>>>>>> Import required Packages >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+import hashlib
+import json
+import math
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from canonical import canonical_domain, canonical_email, canonical_phone
+
+# Fixed BLAKE2b key so that key hashes are stable between the build and the lookup runs. BLAKE2b hashes one
+# key in about a microsecond, so the row scripts hash their few keys per row without a vectorized call.
+# Bump it whenever the key canonicalization or hashing changes so that stale lists are rejected on load.
+HASH_KEY = "adlistsuppress03"
+_KEY_HASHER = hashlib.blake2b(digest_size=8, key=HASH_KEY.encode("utf-8"))
+_MASK_64 = (1 << 64) - 1
+
+# Separator of email cells holding several addresses
+EMAIL_SEPARATOR = ","
+KEY_KINDS = ("email", "phone", "domain")
+
+# Default column names used when a suppression file does not say which columns to read
+DEFAULT_EMAIL_COLUMNS = ["Email", "EMAIL", "Email1", "Email2", "Email3", "BUSINESS_EMAIL", "PERSONAL_EMAIL"]
+DEFAULT_PHONE_COLUMNS = ["Phone", "PHONE", "Phone Number", "PhoneNumber1", "PhoneNumber2", "MOBILE_PHONE", "DIRECT_NUMBER"]
+DEFAULT_DOMAIN_COLUMNS = ["Domain", "DOMAIN", "Email Domain", "EMAIL_DOMAIN"]
+
+
+#>>>>>>>>>> - Define key hashing - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+def hash_key(key):
+    """
+    Hashes one normalized key to an unsigned 64-bit integer.
+    """
+    # Copying the keyed hasher skips the key setup of a new one
+    hasher = _KEY_HASHER.copy()
+    hasher.update(key.encode("utf-8"))
+    return int.from_bytes(hasher.digest(), "little")
+
+
+def hash_keys(keys):
+    """
+    Hashes normalized keys to unsigned 64-bit integers.
+
+    Parameters:
+    keys (array-like of str): Normalized, non-null keys.
+
+    Returns:
+    np.ndarray: uint64 key hashes.
+    """
+    keys = list(keys)
+    return np.fromiter(map(hash_key, keys), dtype=np.uint64, count=len(keys))
+
+
+def value_keys(value, kind="email", with_domains=False):
+    """
+    Normalized keys of one raw value: the canonical addresses of an email cell (split on ','), the canonical
+    digits of a phone number or the '@<domain>' key of a domain. Missing and invalid values have no key.
+
+    Parameters:
+    value (str): The raw value.
+    kind (str): 'email', 'phone' or 'domain'.
+    with_domains (bool): If True, the domain key of each email address is added, so that lookups also
+                         match suppressed domains.
+
+    Returns:
+    list of str: The keys of the value.
+
+    Raises:
+    ValueError: If 'kind' is unknown.
+    """
+    if kind not in KEY_KINDS:
+        raise ValueError(f"Unknown key kind '{kind}', expected one of {list(KEY_KINDS)}")
+    if not isinstance(value, str):
+        return []
+
+    if kind == "email":
+        keys = []
+        for address in value.split(EMAIL_SEPARATOR):
+            email = canonical_email(address)
+            if email:
+                keys.append(email)
+                # The domain part repeats across addresses, so its canonical form is mostly a cache hit
+                domain = canonical_domain(email.rsplit("@", 1)[1]) if with_domains else None
+                if domain:
+                    keys.append("@" + domain)
+        return keys
+    if kind == "phone":
+        phone = canonical_phone(value)
+        return [phone] if phone else []
+    domain = canonical_domain(value)
+    return ["@" + domain] if domain else []
+
+
+#>>>>>>>>>> - Define Bloom filter - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+class BloomFilter:
+    """
+    A Bloom filter over uint64 key hashes backed by a packed NumPy bit array.
+
+    The k bit positions of a key are derived from its 64-bit hash by double hashing, so adding and
+    testing a whole column of hashes is a handful of NumPy operations.
+
+    Use Case:
+    >>> bloom = BloomFilter.for_capacity(1_000_000, false_positive_rate=0.001)
+    >>> bloom.add(hash_keys(['john@example.com']))
+    >>> bloom.contains(hash_keys(['john@example.com', 'jane@example.com']))
+    array([ True, False])
+    """
+
+    def __init__(self, num_bits, num_hashes, bits=None):
+        self.num_bits = int(num_bits)
+        self.num_hashes = int(num_hashes)
+        self.bits = bits if bits is not None else np.zeros((self.num_bits + 7) // 8, dtype=np.uint8)
+        # The bits as bytes for contains_hash, where indexing bytes is much cheaper than indexing the array
+        self._bytes = None
+
+    @classmethod
+    def for_capacity(cls, capacity, false_positive_rate=0.001):
+        """
+        Creates an empty Bloom filter sized for 'capacity' keys at the given false positive rate.
+        """
+        capacity = max(int(capacity), 1)
+        num_bits = math.ceil(-capacity * math.log(false_positive_rate) / (math.log(2) ** 2))
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        return cls(num_bits, num_hashes)
+
+    def _positions(self, hashes):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        h2 = ((hashes >> np.uint64(32)) | (hashes << np.uint64(32))) * np.uint64(0x9E3779B97F4A7C15) | np.uint64(1)
+        steps = np.arange(self.num_hashes, dtype=np.uint64)
+        return (hashes[:, None] + steps[None, :] * h2[:, None]) % np.uint64(self.num_bits)
+
+    def add(self, hashes):
+        """
+        Adds an array of key hashes to the filter.
+        """
+        positions = self._positions(hashes).ravel()
+        np.bitwise_or.at(self.bits, (positions >> np.uint64(3)).astype(np.intp),
+                         (np.uint8(1) << (positions & np.uint64(7)).astype(np.uint8)))
+        self._bytes = None
+
+    def contains(self, hashes):
+        """
+        Tests an array of key hashes, returning a boolean array that is True where the key may be present.
+        """
+        positions = self._positions(hashes)
+        found = (self.bits[(positions >> np.uint64(3)).astype(np.intp)] >> (positions & np.uint64(7)).astype(np.uint8)) & 1
+        return found.all(axis=1)
+
+    def contains_hash(self, key_hash):
+        """
+        Scalar counterpart of 'contains' for one key hash (a Python int), with the same bit positions.
+        """
+        if self._bytes is None:
+            self._bytes = self.bits.tobytes()
+        bits = self._bytes
+        h2 = ((((key_hash >> 32) | (key_hash << 32)) & _MASK_64) * 0x9E3779B97F4A7C15 & _MASK_64) | 1
+        for step in range(self.num_hashes):
+            position = ((key_hash + step * h2) & _MASK_64) % self.num_bits
+            if not (bits[position >> 3] >> (position & 7)) & 1:
+                return False
+        return True
+
+
+#>>>>>>>>>> - Define suppression list - >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+class SuppressionList:
+    """
+    A persistent suppression list made of a Bloom filter and an exact, memory mapped key store.
+
+    A suppression list is saved as three files sharing a prefix: '<path>.bloom.npy' holds the packed
+    Bloom bits, '<path>.keys.npy' the sorted unique key hashes used to confirm Bloom hits, and
+    '<path>.json' the filter parameters and the source files it was built from.
+
+    Use Case:
+    >>> suppression = SuppressionList.build(['./suppression/unsubscribes.csv', './suppression/bounces.csv'])
+    >>> suppression.save('./suppression/optout')
+    >>> suppression = SuppressionList.load('./suppression/optout')
+    >>> clean_df = suppression.filter_frame(df, email_columns=['Email1', 'Email2'], phone_columns=['PhoneNumber1'])
+    """
+
+    def __init__(self, bloom, keys, sources=None, has_domains=False):
+        self.bloom = bloom
+        self.keys = keys
+        self.sources = list(sources or [])
+        # Email lookups also test the domain of each address, only when the list holds domain keys
+        self.has_domains = has_domains
+
+    def __len__(self):
+        return len(self.keys)
+
+    @classmethod
+    def build(cls, source_files, email_columns=None, phone_columns=None, false_positive_rate=0.001, chunk_size=500_000,
+              domain_columns=None):
+        """
+        Builds a suppression list from one or more CSV files, streaming them in chunks.
+
+        Parameters:
+        source_files (str or list of str): CSV files with the suppressed emails, phone numbers and/or domains.
+        email_columns (list of str, optional): Email columns to read. Defaults to any known email column present.
+        phone_columns (list of str, optional): Phone columns to read. Defaults to any known phone column present.
+        false_positive_rate (float): Target Bloom filter false positive rate before exact confirmation.
+        chunk_size (int): Number of rows read per chunk.
+        domain_columns (list of str, optional): Columns of suppressed email domains (e.g. competitors).
+                                                Defaults to any known domain column present.
+
+        Returns:
+        SuppressionList: The built suppression list.
+
+        Raises:
+        FileNotFoundError: If a source file does not exist.
+        ValueError: If a source file has none of the email, phone or domain columns.
+        """
+        if isinstance(source_files, str):
+            source_files = [source_files]
+
+        key_chunks = []
+        domain_keys = set()
+        for source in source_files:
+            if not os.path.exists(source):
+                raise FileNotFoundError(f"Suppression file '{source}' not found.")
+
+            header = pd.read_csv(source, nrows=0).columns
+            emails = [c for c in (email_columns or DEFAULT_EMAIL_COLUMNS) if c in header]
+            phones = [c for c in (phone_columns or DEFAULT_PHONE_COLUMNS) if c in header]
+            domains = [c for c in (domain_columns or DEFAULT_DOMAIN_COLUMNS) if c in header]
+            if not emails and not phones and not domains:
+                raise ValueError(f"No email, phone or domain columns found in suppression file '{source}'")
+
+            for chunk in pd.read_csv(source, usecols=emails + phones + domains, dtype=str, chunksize=chunk_size):
+                chunk_keys = _frame_keys(chunk, emails, phones, domains)
+                domain_keys.update(key for key in chunk_keys if key.startswith("@"))
+                key_chunks.append(hash_keys(chunk_keys))
+
+        keys = np.unique(np.concatenate(key_chunks)) if key_chunks else np.empty(0, dtype=np.uint64)
+
+        bloom = BloomFilter.for_capacity(len(keys), false_positive_rate)
+        for start in range(0, len(keys), chunk_size):
+            bloom.add(keys[start:start + chunk_size])
+
+        return cls(bloom, keys, sources=[os.path.abspath(source) for source in source_files], has_domains=bool(domain_keys))
+
+    def save(self, path):
+        """
+        Saves the suppression list next to 'path' as '<path>.bloom.npy', '<path>.keys.npy' and '<path>.json'.
+        """
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        np.save(f"{path}.bloom.npy", self.bloom.bits)
+        np.save(f"{path}.keys.npy", np.asarray(self.keys, dtype=np.uint64))
+        with open(f"{path}.json", "w", encoding="utf-8") as meta_file:
+            json.dump({
+                "num_bits": self.bloom.num_bits,
+                "num_hashes": self.bloom.num_hashes,
+                "num_keys": len(self.keys),
+                "hash_key": HASH_KEY,
+                "has_domains": self.has_domains,
+                "sources": self.sources,
+            }, meta_file, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads a suppression list saved with 'save'. The exact key store is memory mapped, not read.
+
+        Raises:
+        FileNotFoundError: If the suppression list files do not exist.
+        ValueError: If the list was built with a different hash key.
+        """
+        if not os.path.exists(f"{path}.json"):
+            raise FileNotFoundError(f"Suppression list '{path}' not found.")
+
+        with open(f"{path}.json", "r", encoding="utf-8") as meta_file:
+            meta = json.load(meta_file)
+        if meta.get("hash_key") != HASH_KEY:
+            raise ValueError(f"Suppression list '{path}' was built with an incompatible hash key")
+
+        bloom = BloomFilter(meta["num_bits"], meta["num_hashes"], bits=np.load(f"{path}.bloom.npy"))
+        keys = np.load(f"{path}.keys.npy", mmap_mode="r")
+        return cls(bloom, keys, sources=meta.get("sources"), has_domains=meta.get("has_domains", False))
+
+    def contains_hashes(self, hashes):
+        """
+        Tests key hashes against the list. Bloom hits are confirmed against the exact key store.
+
+        Returns:
+        np.ndarray: Boolean array, True where the key is suppressed.
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        result = np.zeros(len(hashes), dtype=bool)
+        if len(hashes) == 0 or len(self.keys) == 0:
+            return result
+
+        candidates = np.flatnonzero(self.bloom.contains(hashes))
+        if len(candidates):
+            positions = np.searchsorted(self.keys, hashes[candidates])
+            positions[positions == len(self.keys)] = len(self.keys) - 1
+            result[candidates] = np.asarray(self.keys[positions]) == hashes[candidates]
+        return result
+
+    def contains_hash(self, key_hash):
+        """
+        Scalar counterpart of 'contains_hashes' for one key hash (a Python int), for the row scripts.
+        """
+        if len(self.keys) == 0 or not self.bloom.contains_hash(key_hash):
+            return False
+        position = int(np.searchsorted(self.keys, np.uint64(key_hash)))
+        return position < len(self.keys) and int(self.keys[position]) == key_hash
+
+    def is_suppressed(self, values, kind="email"):
+        """
+        Vectorized lookup of a whole column. Each distinct value is normalized and hashed once; an email
+        value is suppressed when one of its addresses or their domains is.
+
+        Parameters:
+        values (pd.Series): The column to test.
+        kind (str): 'email', 'phone' or 'domain', selects the normalization.
+
+        Returns:
+        np.ndarray: Boolean array aligned with 'values', True where the value is suppressed.
+        """
+        codes, uniques = pd.factorize(pd.Series(values), use_na_sentinel=True)
+        keys = [value_keys(value, kind, with_domains=self.has_domains) for value in uniques]
+        owners = np.repeat(np.arange(len(uniques)), [len(unique_keys) for unique_keys in keys])
+
+        unique_hit = np.zeros(len(uniques), dtype=bool)
+        hits = self.contains_hashes(hash_keys(key for unique_keys in keys for key in unique_keys))
+        unique_hit[owners[hits]] = True
+
+        result = np.zeros(len(codes), dtype=bool)
+        result[codes >= 0] = unique_hit[codes[codes >= 0]]
+        return result
+
+    def suppressed_mask(self, df, email_columns=(), phone_columns=()):
+        """
+        Returns a boolean mask that is True for rows where any email or phone column is suppressed.
+        Columns that are not present in the DataFrame are skipped.
+        """
+        mask = np.zeros(len(df), dtype=bool)
+        for column in email_columns:
+            if column in df.columns:
+                mask |= self.is_suppressed(df[column], kind="email")
+        for column in phone_columns:
+            if column in df.columns:
+                mask |= self.is_suppressed(df[column], kind="phone")
+        return mask
+
+    def filter_frame(self, df, email_columns=(), phone_columns=()):
+        """
+        Drops rows of a DataFrame whose emails or phone numbers are on the suppression list.
+
+        Use Case:
+        >>> clean_df = suppression.filter_frame(formatted_df, ['Email1', 'Email2', 'Email3'], ['PhoneNumber1', 'PhoneNumber2'])
+        """
+        mask = self.suppressed_mask(df, email_columns, phone_columns)
+        if mask.any():
+            print(f"Suppression list removed {int(mask.sum())} rows.")
+        return df[~mask]
+
+    def row_predicate(self, email_fields=(), phone_fields=(), header=None):
+        """
+        Builds a row predicate for the csv.DictReader scripts, or for csv.reader rows when 'header' is given.
+        Keys are hashed and looked up one at a time, without a vectorized call per row.
+
+        Parameters:
+        email_fields (list of str): Row keys holding emails, possibly several comma separated ones.
+        phone_fields (list of str): Row keys holding phone numbers.
+        header (list of str, optional): Column names of csv.reader rows. The fields are then looked up by
+                                        their position in the header instead of by key.
+
+        Returns:
+        callable: A function taking a row dict (or row list) and returning True if the row should be kept.
+
+        Use Case:
+        >>> keep_row = suppression.row_predicate(['PERSONAL_EMAIL', 'BUSINESS_EMAIL'], ['MOBILE_PHONE'])
+        >>> rows = [row for row in reader if keep_row(row)]
+        """
+        if header is not None:
+            email_positions = [header.index(field) for field in email_fields if field in header]
+            phone_positions = [header.index(field) for field in phone_fields if field in header]
+            email_values = lambda row: [row[position] for position in email_positions]
+            phone_values = lambda row: [row[position] for position in phone_positions]
+        else:
+            email_values = lambda row: [row.get(field, '') for field in email_fields]
+            phone_values = lambda row: [row.get(field, '') for field in phone_fields]
+
+        # Domains repeat across rows (every employee of a company), their lookups are cached
+        @lru_cache(maxsize=100_000)
+        def domain_suppressed(domain_key):
+            return self.contains_hash(hash_key(domain_key))
+
+        def keep_row(row):
+            for value in email_values(row):
+                for key in value_keys(value, "email", with_domains=self.has_domains):
+                    if domain_suppressed(key) if key[0] == "@" else self.contains_hash(hash_key(key)):
+                        return False
+            for value in phone_values(row):
+                for key in value_keys(value, "phone"):
+                    if self.contains_hash(hash_key(key)):
+                        return False
+            return True
+
+        return keep_row
+
+
+def _frame_keys(df, email_columns, phone_columns, domain_columns=()):
+    # Keys of every distinct email, phone and domain value of a chunk
+    keys = set()
+    for kind, columns in (("email", email_columns), ("phone", phone_columns), ("domain", domain_columns)):
+        for column in columns:
+            for value in df[column].dropna().unique():
+                keys.update(value_keys(value, kind))
+    return sorted(keys)
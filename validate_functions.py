@@ -20,4 +20,270 @@ def validate_filter_by_target_industries_output(df, target_industries):
         print("Some rows do not belong to the target industries.")
         return False
 
-    return True
\ No newline at end of file
+    return True
+
+def _comparable(df):
+    # Same values whatever the dtype backend: object columns, None for missing values, a fresh index
+    df = df.reset_index(drop=True).astype(object)
+    return df.where(df.notna(), None)
+
+
+def validate_arrow_string_outputs(file_path, target_industries):
+    """
+    Validates that reading the data with Arrow backed strings gives the same lists as reading it with
+    Python object columns, stage by stage.
+
+    Parameters:
+    file_path (str): Path to a raw export.
+    target_industries (list): List of target industries used for filtering.
+
+    Returns:
+    bool: True if validation is successful, False otherwise.
+
+    Use Case:
+    >>> validate_arrow_string_outputs('./raw_data/Adpromoter_FirstPriority.csv', ['Marketing'])
+    """
+    import random
+
+    import Adfunctions as af
+
+    def build_outputs(df):
+        state_df = af.filter_usa_states(af.filter_by_target_industries(df, target_industries))
+        enriched_df = af.enrich_phone_numbers(af.run_stages(state_df, af.liveramp_enrichment_stages()))
+        split_df = af.split_columns_by_separator(enriched_df, 'PROGRAMMATIC_BUSINESS_EMAILS', separator=',')
+
+        # The LiveRamp IDs are random, draw the same ones for both runs
+        random.seed(0)
+        return {
+            'filter_by_valid_business_email': af.filter_by_valid_business_email(df),
+            'filter_by_seniority': af.filter_by_seniority(df, ['Staff']),
+            'sort_and_filter_jobs': af.sort_and_filter_jobs(df, ['intern']),
+            'filter_valid_personal_emails': af.filter_valid_personal_emails(df),
+            'liveramp_list': af.liveramp_formatter(split_df),
+            'email_list': af.drop_rows_with_hyphen(af.enrich_email(state_df), ['Valid_Business_Email']),
+        }
+
+    object_outputs = build_outputs(af.get_data(file_path, arrow_strings=False))
+    arrow_outputs = build_outputs(af.get_data(file_path, arrow_strings=True))
+
+    valid = True
+    for name, object_df in object_outputs.items():
+        if not _comparable(object_df).equals(_comparable(arrow_outputs[name])):
+            print(f"Output of {name} differs between object and Arrow string columns.")
+            valid = False
+
+    return valid
+
+
+
+def validate_projected_outputs(file_path, target_industries):
+    """
+    Validates that the LiveRamp and email lists built from the columns projected by their schema (see
+    schema.py) are the same files as the lists built from the fully parsed export.
+
+    Parameters:
+    file_path (str): Path to a raw export.
+    target_industries (list): List of target industries used for filtering.
+
+    Returns:
+    bool: True if validation is successful, False otherwise.
+
+    Use Case:
+    >>> validate_projected_outputs('./raw_data/Adpromoter_FirstPriority.csv', ['Marketing'])
+    """
+    import filecmp
+    import os
+    import random
+    import tempfile
+
+    import Adfunctions as af
+
+    full_df = af.get_data(file_path)
+    creators = {'liveramp': af.liveramp_adlist_creator, 'email': af.email_list_creator}
+
+    valid = True
+    with tempfile.TemporaryDirectory() as directory:
+        for list_type, creator in creators.items():
+            # The LiveRamp IDs are random, draw the same ones for both runs
+            random.seed(0)
+            creator(file_path, target_industries, f"{list_type}_projected", directory=directory)
+            random.seed(0)
+            creator(file_path, target_industries, f"{list_type}_full", data=full_df.copy(), directory=directory)
+
+            projected = os.path.join(directory, f"{list_type}_projected.csv")
+            full = os.path.join(directory, f"{list_type}_full.csv")
+            if not (os.path.exists(projected) and filecmp.cmp(projected, full, shallow=False)):
+                print(f"The {list_type} list differs when only the columns of its schema are parsed.")
+                valid = False
+
+    return valid
+
+
+def validate_address_cache_parallel(file_path, target_industries):
+    """
+    Validates that a LiveRamp list built with an address cache and the enrichment stages running on
+    pool threads (parallel=True), once with a cold and once with a warm cache, is the same file as the
+    list built without a cache on the calling thread.
+
+    Parameters:
+    file_path (str): Path to a raw export.
+    target_industries (list): List of target industries used for filtering.
+
+    Returns:
+    bool: True if validation is successful, False otherwise.
+
+    Use Case:
+    >>> validate_address_cache_parallel('./raw_data/Adpromoter_FirstPriority.csv', ['Marketing'])
+    """
+    import filecmp
+    import os
+    import random
+    import tempfile
+
+    import Adfunctions as af
+    from address_cache import AddressValidationCache
+
+    valid = True
+    with tempfile.TemporaryDirectory() as directory:
+        # The LiveRamp IDs are random, draw the same ones for every run
+        random.seed(0)
+        af.liveramp_adlist_creator(file_path, target_industries, "reference", parallel=False, directory=directory)
+        reference = os.path.join(directory, "reference.csv")
+
+        with AddressValidationCache(os.path.join(directory, "address_validity.sqlite")) as cache:
+            for run in ("cold", "warm"):
+                random.seed(0)
+                message = af.liveramp_adlist_creator(file_path, target_industries, run, address_cache=cache,
+                                                     parallel=True, directory=directory)
+                output = os.path.join(directory, f"{run}.csv")
+                if isinstance(message, str) and message.startswith("An error occurred"):
+                    print(f"The {run} cache run failed: {message}")
+                    valid = False
+                elif not filecmp.cmp(reference, output, shallow=False):
+                    print(f"The list built with a {run} address cache on pool threads differs.")
+                    valid = False
+
+    return valid
+
+
+def validate_schemas_on_export_header(header=None):
+    """
+    Validates that every schema accepts the header of a real vendor export and projects the second
+    address lines of the row scripts, and that a header without those lines is still accepted.
+
+    Parameters:
+    header (list of str, optional): Column names of an export. Defaults to the 42 columns of the vendor
+                                    export, as read in the playground notebook.
+
+    Returns:
+    bool: True if validation is successful, False otherwise.
+
+    Use Case:
+    >>> validate_schemas_on_export_header(read_header('./raw_data/Adpromoter_FirstPriority.csv'))
+    """
+    from schema import ROW_OPTIONAL_ADDRESS_COLUMNS, SCHEMAS, VENDOR_EXPORT_COLUMNS
+
+    header = list(header if header is not None else VENDOR_EXPORT_COLUMNS)
+    without_second_lines = [column for column in header if column not in ROW_OPTIONAL_ADDRESS_COLUMNS]
+
+    valid = True
+    for name, schema in SCHEMAS.items():
+        if schema.missing(header):
+            print(f"Schema '{name}' rejects the export header, missing {schema.missing(header)}.")
+            valid = False
+        if name.startswith('rows_'):
+            if not set(ROW_OPTIONAL_ADDRESS_COLUMNS) <= set(schema.optional_columns):
+                print(f"Schema '{name}' does not read the second address lines {list(ROW_OPTIONAL_ADDRESS_COLUMNS)}.")
+                valid = False
+            if schema.missing(without_second_lines):
+                print(f"Schema '{name}' rejects a header without the second address lines.")
+                valid = False
+
+    return valid
+
+# Pairs of (first name, last name, street address) that are the same contact, and pairs that are not
+FUZZY_DUPLICATE_PAIRS = [
+    (('Jon', 'Smith', '12 Main St'), ('John', 'Smith', '12 Main Street')),
+    (('Bob', 'Jones', '5 Oak Avenue'), ('Robert', 'Jones', '5 Oak Ave.')),
+]
+FUZZY_DISTINCT_PAIRS = [
+    (('John', 'Smith', '12 Main St'), ('John', 'Smith', '14 Main Street')),
+    (('John', 'Smith', '12 Main St'), ('Jane', 'Smith', '12 Main St')),
+]
+
+
+def validate_fuzzy_duplicate_pairs(duplicate_pairs=FUZZY_DUPLICATE_PAIRS, distinct_pairs=FUZZY_DISTINCT_PAIRS):
+    """
+    Validates that find_fuzzy_duplicates puts each duplicate pair, such as the 'Jon Smith, 12 Main St' /
+    'John Smith, 12 Main Street' example of fuzzy_dedup, in one cluster, and keeps each distinct pair apart.
+
+    Parameters:
+    duplicate_pairs (list): Pairs of (first name, last name, street address) rows of the same contact.
+    distinct_pairs (list): Pairs of rows of different contacts.
+
+    Returns:
+    bool: True if validation is successful, False otherwise.
+
+    Use Case:
+    >>> validate_fuzzy_duplicate_pairs()
+    """
+    from fuzzy_dedup import find_fuzzy_duplicates
+
+    valid = True
+    for expected, pairs in ((True, duplicate_pairs), (False, distinct_pairs)):
+        for pair in pairs:
+            df = pd.DataFrame(list(pair), columns=['First Name', 'Last Name', 'Street Address 1'])
+            df['Zip Code'] = '10001'
+            df['Email1'] = 'contact@example.com'
+            labels = find_fuzzy_duplicates(df)
+            if (labels[0] == labels[1]) != expected:
+                print(f"{pair[0]} and {pair[1]} are {'not ' if expected else ''}found to be duplicates.")
+                valid = False
+
+    return valid
+
+# Modules the CLI and the cron scripts import before doing any work, and the heavy modules they must not load
+STARTUP_MODULES = ("adlist", "Adfunctions", "functions", "metrics", "csv_index")
+LAZY_MODULES = ("pandas", "openpyxl", "pyarrow")
+
+
+def validate_import_time(budget_seconds=0.25, modules=STARTUP_MODULES):
+    """
+    Validates that importing the startup modules in a fresh interpreter stays within a time budget and
+    does not load pandas, openpyxl or pyarrow.
+
+    Parameters:
+    budget_seconds (float): Maximum import time of the modules, interpreter startup excluded.
+    modules (tuple of str): Modules imported, as a CLI or cron invocation does.
+
+    Returns:
+    bool: True if validation is successful, False otherwise.
+
+    Use Case:
+    >>> validate_import_time()
+    """
+    import json
+    import os
+    import subprocess
+    import sys
+
+    code = (
+        "import importlib, json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"for module in {list(modules)!r}: importlib.import_module(module)\n"
+        "seconds = time.perf_counter() - start\n"
+        f"print(json.dumps({{'seconds': seconds, 'loaded': [m for m in {list(LAZY_MODULES)!r} if m in sys.modules]}}))\n"
+    )
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    output = subprocess.run([sys.executable, "-c", code], cwd=package_dir, capture_output=True, text=True, check=True).stdout
+    result = json.loads(output)
+
+    valid = True
+    if result['loaded']:
+        print(f"Importing {list(modules)} loads {result['loaded']}.")
+        valid = False
+    if result['seconds'] > budget_seconds:
+        print(f"Importing {list(modules)} took {result['seconds']:.3f}s, over the {budget_seconds}s budget.")
+        valid = False
+
+    return valid